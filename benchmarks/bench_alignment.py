@@ -0,0 +1,85 @@
+"""Check the sort-based alignment detector against the old per-element scan and time it.
+
+    python -m benchmarks.bench_alignment --shapes 100 300 1000
+
+No reported group may spread wider than the threshold; pairs the old O(n^2) scan
+reported that now straddle two groups (a run of small steps wider than the
+threshold is split) are counted. tests/test_alignment.py checks small fixed inputs.
+"""
+import argparse
+import random
+import time
+import numpy as np
+from src.models import SlideNode, TextElement, TextStyle, BoundingBox
+from src.detectors.alignment import detect_alignment_violations
+
+
+def reference_pairs(slide: SlideNode, threshold: float) -> set[tuple[str, str, str]]:
+    """(edge, id, id) pairs flagged by the previous nearest-neighbour scan."""
+    elements = slide.text_elements + slide.image_elements
+    pairs = set()
+    edges = {
+        "left": [e.bbox.x for e in elements],
+        "top": [e.bbox.y for e in elements],
+        "right": [e.bbox.x2 for e in elements],
+        "center": [e.bbox.x + e.bbox.width / 2 for e in elements],
+    }
+    for edge_name, coords in edges.items():
+        values = np.array(coords)
+        for i, val in enumerate(coords):
+            diffs = np.abs(values - val)
+            diffs[i] = np.inf
+            min_diff = np.min(diffs)
+            if 0 < min_diff <= threshold:
+                j = int(np.argmin(diffs))
+                pairs.add((edge_name, elements[i].id, elements[j].id))
+    return pairs
+
+
+def synthetic_slide(shapes: int, seed: int = 0) -> SlideNode:
+    rng = random.Random(seed)
+    grid = [rng.randrange(0, 900, 40) for _ in range(12)]
+    elements = []
+    for i in range(shapes):
+        x = rng.choice(grid) + rng.choice([0, 0, 0, rng.uniform(-4, 4)])
+        y = rng.choice(grid) + rng.choice([0, 0, rng.uniform(-4, 4)])
+        bbox = BoundingBox(x=x, y=y, width=rng.uniform(20, 200), height=rng.uniform(10, 80))
+        elements.append(TextElement(id=str(i), slide_index=0, text="", style=TextStyle(), bbox=bbox))
+    return SlideNode(index=0, width=960, height=720, text_elements=elements)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shapes", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--threshold", type=float, default=5.0)
+    args = parser.parse_args()
+
+    split = total = 0
+    for seed in range(20):
+        slide = synthetic_slide(12, seed)
+        errors = detect_alignment_violations([slide], args.threshold)
+        grouped = set()
+        for error in errors:
+            spread = float(error.message.split("off by ")[1].split("px")[0])
+            if spread > args.threshold:
+                raise SystemExit(f"seed {seed}: group wider than the threshold: {error.message}")
+            edge = error.message.split(" on ")[1].split(" ")[0]
+            grouped.update((edge, a, b) for a in error.elements for b in error.elements)
+        pairs = reference_pairs(slide, args.threshold)
+        split += len(pairs - grouped)
+        total += len(pairs)
+    print(f"small slides: every group within the threshold; {split} of {total} previously reported pairs split across groups")
+
+    for shapes in args.shapes:
+        slide = synthetic_slide(shapes)
+        start = time.perf_counter()
+        errors = detect_alignment_violations([slide], args.threshold)
+        new_time = time.perf_counter() - start
+        start = time.perf_counter()
+        reference_pairs(slide, args.threshold)
+        old_time = time.perf_counter() - start
+        print(f"{shapes:>6} shapes: {len(errors):>4} groups in {new_time * 1000:7.1f} ms (old scan {old_time * 1000:7.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Time the columnar geometry build and each geometry detector on a large deck.
+
+    python -m benchmarks.bench_detectors --slides 1000 --shapes 30 --workers 1 4
+
+Contrast is timed again without building findings, for the ratio lookup alone.
+Then runs the same detectors through the registry engine with each number of
+`detector_workers` threads.
+"""
+import argparse
+import time
+from benchmarks.deckgen import generate_slides
+from src.geometry import build_geometry
+from src.detectors.registry import iter_slide_findings
+from src.detectors.hierarchy import detect_hierarchy_violations
+from src.detectors.margin import detect_margin_violations
+from src.detectors.contrast import contrast_ratios, detect_contrast_violations
+from src.detectors.alignment import detect_alignment_violations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slides", type=int, default=1000)
+    parser.add_argument("--shapes", type=int, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    slides = generate_slides(args.slides, args.shapes)
+
+    start = time.perf_counter()
+    geometry = build_geometry(slides)
+    print(f"build_geometry: {(time.perf_counter() - start) * 1000:8.1f} ms ({len(geometry)} elements)")
+
+    for name, detector in [
+        ("hierarchy", detect_hierarchy_violations),
+        ("margin", detect_margin_violations),
+        ("contrast", detect_contrast_violations),
+        ("alignment", detect_alignment_violations),
+    ]:
+        start = time.perf_counter()
+        errors = detector(slides, geometry=geometry)
+        print(f"{name:>14}: {(time.perf_counter() - start) * 1000:8.1f} ms ({len(errors)} findings)")
+
+    start = time.perf_counter()
+    checked, _ = contrast_ratios(slides, geometry)
+    print(f"contrast ratios: {(time.perf_counter() - start) * 1000:7.1f} ms ({len(checked)} elements, {len(geometry.colors)} colors)")
+
+    # aspect_ratio reads picture sizes from a deck file, which generated slides lack
+    detectors = ["margin", "contrast", "alignment", "overlap"]
+    for workers in args.workers:
+        config = {"detectors": detectors, "detector_workers": workers}
+        start = time.perf_counter()
+        findings = sum(len(batch) for batch in iter_slide_findings(slides, None, config, geometry))
+        print(f"engine, {workers} workers: {(time.perf_counter() - start) * 1000:8.1f} ms ({findings} findings)")
+
+
+if __name__ == "__main__":
+    main()
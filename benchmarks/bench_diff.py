@@ -0,0 +1,68 @@
+"""Diffing two revisions of a deck vs analysing both in full.
+
+    python -m benchmarks.bench_diff --slides 500 --edits 5
+
+The new revision moves one text box on each of `--edits` slides. Also checks
+that added + unchanged findings equal a full analysis of the new deck.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from pptx import Presentation
+from pptx.util import Emu
+from benchmarks.deckgen import generate_deck
+from src.diff import diff_decks
+from src.main import analyze
+
+
+def _revise(path: str, out: str, edits: int) -> str:
+    prs = Presentation(path)
+    step = max(len(prs.slides) // max(edits, 1), 1)
+    for idx in range(0, min(edits * step, len(prs.slides)), step):
+        shape = [s for s in prs.slides[idx].shapes if s.has_text_frame][-1]
+        shape.left, shape.top = Emu(0), Emu(0)
+    prs.save(out)
+    return out
+
+
+def _count(report_json: str) -> int:
+    return sum(len(slide["errors"]) for slide in json.loads(report_json).values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slides", type=int, default=500)
+    parser.add_argument("--shapes", type=int, default=20)
+    parser.add_argument("--edits", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old = generate_deck(os.path.join(tmp, "old.pptx"), slides=args.slides, shapes_per_slide=args.shapes)
+        new = _revise(old, os.path.join(tmp, "new.pptx"), args.edits)
+
+        start = time.perf_counter()
+        _count(analyze(old, "lxml"))
+        new_total = _count(analyze(new, "lxml"))
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = diff_decks(old, new)
+        with_unchanged = time.perf_counter() - start
+
+        start = time.perf_counter()
+        diff_decks(old, new, include_unchanged=False)
+        without_unchanged = time.perf_counter() - start
+
+    if len(result["added"]) + len(result["unchanged"]) != new_total:
+        raise SystemExit("Diff disagrees with a full analysis of the new deck")
+    print(f"slides: {result['slides']}")
+    print(f"findings: {result['findings']}")
+    print(f"two full analyze() runs:      {full:.2f}s")
+    print(f"diff_decks:                   {with_unchanged:.2f}s ({full / with_unchanged:.1f}x faster)")
+    print(f"diff_decks, no unchanged:     {without_unchanged:.2f}s ({full / without_unchanged:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
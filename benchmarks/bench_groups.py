@@ -0,0 +1,52 @@
+"""Parse time of grouped and tabular decks as element count and nesting depth grow.
+
+    python -m benchmarks.bench_groups --slides 25 50 100 --depths 1 4 16
+
+Both parsers must agree on every deck. Time per element should stay flat across
+rows: group traversal visits each shape once, whatever the nesting depth.
+"""
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.deckgen import generate_grouped_deck
+from src.context import DeckContext
+from src.parsers.lxml_parser import parse_presentation_lxml
+from src.parsers.xml_parser import parse_presentation
+
+
+def _timed(fn, path: str):
+    with DeckContext(path) as deck:
+        start = time.perf_counter()
+        result = fn(deck)
+        return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slides", type=int, nargs="+", default=[25, 50, 100])
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--shapes-per-element-budget", type=int, default=48, dest="budget",
+                        help="shapes per group chain, split across its levels")
+    args = parser.parse_args()
+
+    print(f"{'slides':>6} {'depth':>5} {'elements':>9} {'pptx s':>8} {'lxml s':>8} {'pptx us/el':>10} {'lxml us/el':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for slides in args.slides:
+            for depth in args.depths:
+                path = generate_grouped_deck(
+                    os.path.join(tmp, f"deck-{slides}-{depth}.pptx"),
+                    slides=slides, depth=depth, shapes_per_group=max(args.budget // depth - 1, 1),
+                )
+                pptx_time, pptx_slides = _timed(parse_presentation, path)
+                lxml_time, lxml_slides = _timed(parse_presentation_lxml, path)
+                if pptx_slides != lxml_slides:
+                    mismatched = [a.index for a, b in zip(pptx_slides, lxml_slides) if a != b]
+                    raise SystemExit(f"Parsers disagree on slides {mismatched} ({slides} slides, depth {depth})")
+                elements = sum(len(s.text_elements) + len(s.image_elements) for s in lxml_slides)
+                print(f"{slides:>6} {depth:>5} {elements:>9} {pptx_time:>8.3f} {lxml_time:>8.3f} "
+                      f"{pptx_time / elements * 1e6:>10.1f} {lxml_time / elements * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
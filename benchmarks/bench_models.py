@@ -0,0 +1,74 @@
+"""Construction time and memory of 100k text elements as pydantic models vs slotted records.
+
+    python -m benchmarks.bench_models --elements 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from src.models import BoundingBox, TextElement, TextStyle
+from src.records import Box, Style, TextRecord, SlideRecord, to_slide_node
+
+
+def build_models(n: int) -> list[TextElement]:
+    return [
+        TextElement(
+            id=str(i),
+            slide_index=i // 50,
+            text="Body text",
+            style=TextStyle(font_size=18.0, font_name="Calibri", color="#333333"),
+            bbox=BoundingBox(x=float(i % 900), y=40.0, width=200.0, height=30.0),
+            z_order=i % 50,
+        )
+        for i in range(n)
+    ]
+
+
+def build_records(n: int) -> list[TextRecord]:
+    return [
+        TextRecord(
+            str(i),
+            i // 50,
+            "Body text",
+            Style(18.0, "Calibri", False, "#333333"),
+            Box(float(i % 900), 40.0, 200.0, 30.0),
+            i % 50,
+        )
+        for i in range(n)
+    ]
+
+
+def convert(records: list[TextRecord]):
+    return to_slide_node(SlideRecord(index=0, width=960.0, height=540.0, text_elements=records))
+
+
+def _measure(fn, *args):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--elements", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Timings below include tracemalloc overhead; compare them relative to each other
+    _, model_time, model_bytes = _measure(build_models, args.elements)
+    records, record_time, record_bytes = _measure(build_records, args.elements)
+    _, convert_time, _ = _measure(convert, records)
+
+    print(f"{args.elements} text elements")
+    print(f"  pydantic models : {model_time:6.3f}s, {model_bytes / 2**20:7.1f} MiB")
+    print(f"  slotted records : {record_time:6.3f}s, {record_bytes / 2**20:7.1f} MiB "
+          f"({model_time / record_time:.1f}x faster, {model_bytes / record_bytes:.1f}x smaller)")
+    print(f"  records -> models at the boundary: {convert_time:6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Time the overlap detector on dense slides, including a worst case for a plain x sweep.
+
+    python -m benchmarks.bench_overlap --shapes 100 300 1000
+"""
+import argparse
+import time
+import numpy as np
+from src.detectors.overlap import find_overlaps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shapes", type=int, nargs="+", default=[100, 300, 1000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for shapes in args.shapes:
+        layouts = {
+            "scattered": (rng.uniform(0, 900, shapes), rng.uniform(0, 680, shapes),
+                          rng.uniform(10, 120, shapes), rng.uniform(10, 60, shapes)),
+            # Full-width rows: every pair overlaps on x, none on y
+            "stacked rows": (np.zeros(shapes), np.arange(shapes) * 10.0,
+                             np.full(shapes, 900.0), np.full(shapes, 9.0)),
+        }
+        for name, (x, y, w, h) in layouts.items():
+            start = time.perf_counter()
+            i, _, _ = find_overlaps(x, y, w, h)
+            elapsed = time.perf_counter() - start
+            print(f"{shapes:>6} shapes, {name:<12}: {len(i):>6} overlaps in {elapsed * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
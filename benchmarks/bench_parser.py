@@ -0,0 +1,50 @@
+"""Compare the python-pptx and lxml slide parsers.
+
+    python -m benchmarks.bench_parser --slides 300 --shapes 30
+
+Fails if the two parsers disagree on any slide.
+"""
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.deckgen import generate_deck
+from src.context import DeckContext
+from src.parsers.xml_parser import parse_presentation
+from src.parsers.lxml_parser import parse_presentation_lxml
+
+
+def _best_of(fn, path: str, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with DeckContext(path) as deck:
+            result = fn(deck)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--shapes", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = generate_deck(os.path.join(tmp, "deck.pptx"), slides=args.slides, shapes_per_slide=args.shapes)
+        pptx_time, pptx_slides = _best_of(parse_presentation, path, args.repeat)
+        lxml_time, lxml_slides = _best_of(parse_presentation_lxml, path, args.repeat)
+
+    mismatched = [a.index for a, b in zip(pptx_slides, lxml_slides) if a != b]
+    if len(pptx_slides) != len(lxml_slides) or mismatched:
+        raise SystemExit(f"Parsers disagree on slides {mismatched}")
+
+    elements = sum(len(s.text_elements) + len(s.image_elements) for s in lxml_slides)
+    print(f"{len(lxml_slides)} slides, {elements} elements: outputs identical")
+    print(f"python-pptx: {pptx_time:.3f}s")
+    print(f"lxml:        {lxml_time:.3f}s ({pptx_time / lxml_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
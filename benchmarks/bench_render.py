@@ -0,0 +1,62 @@
+"""Rasterization and pixel-sampled contrast costs.
+
+    python -m benchmarks.bench_render --slides 100 --workers 1 4
+
+Times `render_deck` into an empty bitmap cache for each worker count, then again
+warm (every slide cached), and the contrast detector with flat backgrounds vs
+sampling the rendered pixels.
+"""
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.deckgen import generate_deck
+from src.context import DeckContext
+from src.detectors.contrast import detect_contrast_violations
+from src.geometry import build_geometry
+from src.parsers.lxml_parser import iter_slides_lxml
+from src.render import render_deck, slide_bitmaps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slides", type=int, default=100)
+    parser.add_argument("--shapes", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--scale", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = generate_deck(os.path.join(tmp, "deck.pptx"), slides=args.slides, shapes_per_slide=args.shapes)
+
+        for workers in args.workers:
+            cache_dir = os.path.join(tmp, f"cache-{workers}")
+            start = time.perf_counter()
+            render_deck(path, cache_dir, args.scale, workers, backend="pil")
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            render_deck(path, cache_dir, args.scale, workers, backend="pil")
+            warm = time.perf_counter() - start
+            print(f"render_deck, {workers} workers: cold {cold:.2f}s ({args.slides / cold:.0f} slides/s), warm {warm:.3f}s")
+
+        with DeckContext(path) as deck:
+            slides = list(iter_slides_lxml(deck))
+            start = time.perf_counter()
+            bitmaps = slide_bitmaps(deck, slides, args.scale)
+            composite = time.perf_counter() - start
+        geometry = build_geometry(slides)
+
+        start = time.perf_counter()
+        flat = detect_contrast_violations(slides, geometry=geometry)
+        flat_time = time.perf_counter() - start
+        start = time.perf_counter()
+        sampled = detect_contrast_violations(slides, geometry=geometry, bitmaps=bitmaps)
+        sampled_time = time.perf_counter() - start
+
+    print(f"in-process composite: {composite:.2f}s ({args.slides / composite:.0f} slides/s)")
+    print(f"contrast, flat background: {flat_time * 1000:.1f} ms, {len(flat)} findings")
+    print(f"contrast, sampled pixels:  {sampled_time * 1000:.1f} ms, {len(sampled)} findings")
+
+
+if __name__ == "__main__":
+    main()
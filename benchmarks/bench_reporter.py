@@ -0,0 +1,59 @@
+"""Time `generate_report` on synthetic findings to check it scales linearly.
+
+    python -m benchmarks.bench_reporter --errors 10000 20000 40000
+"""
+import argparse
+import random
+import time
+from src.models import (
+    SlideNode, TextElement, TextStyle, BoundingBox, LayoutError, ErrorType, Severity,
+)
+from src.reporter import generate_report
+
+
+def synthetic_deck(slides: int, elements_per_slide: int) -> list[SlideNode]:
+    bbox = BoundingBox(x=0, y=0, width=10, height=10)
+    return [
+        SlideNode(index=s, width=960, height=720, text_elements=[
+            TextElement(id=str(e), slide_index=s, text="", style=TextStyle(), bbox=bbox)
+            for e in range(elements_per_slide)
+        ])
+        for s in range(slides)
+    ]
+
+
+def synthetic_errors(count: int, slides: int, elements_per_slide: int, seed: int = 0) -> list[LayoutError]:
+    rng = random.Random(seed)
+    errors = []
+    for _ in range(count):
+        slide = rng.randrange(slides)
+        a, b = rng.randrange(elements_per_slide), rng.randrange(elements_per_slide)
+        errors.append(LayoutError(
+            type=ErrorType.ALIGNMENT,
+            severity=Severity.INFO,
+            elements=[str(a), str(b)],
+            message=f"Elements nearly aligned on left (off by {rng.randrange(1, 5)}.0px)",
+            slide_index=slide,
+        ))
+    return errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--errors", type=int, nargs="+", default=[10000, 20000, 40000])
+    parser.add_argument("--slides", type=int, default=300)
+    parser.add_argument("--elements", type=int, default=50)
+    args = parser.parse_args()
+
+    slides = synthetic_deck(args.slides, args.elements)
+    for count in args.errors:
+        errors = synthetic_errors(count, args.slides, args.elements)
+        start = time.perf_counter()
+        report = generate_report(slides, errors)
+        elapsed = time.perf_counter() - start
+        kept = sum(len(r.errors) for r in report.slides.values())
+        print(f"{count:>8} errors -> {kept:>8} kept: {elapsed * 1000:8.1f} ms ({elapsed / count * 1e6:.2f} us/error)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Cold CLI latency vs a warm `src.daemon` server for one small deck.
+
+    python -m benchmarks.bench_startup --runs 10
+
+Each run is a fresh `python -m src.daemon check` process, as a pre-commit hook
+would start it: first with no server (analysed in-process, paying every import),
+then with a server running.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.deckgen import generate_deck
+
+
+def _time_check(path: str, parser: str, socket_path: str, runs: int) -> list[float]:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "src.daemon", "--socket", socket_path, "check", "--parser", parser, path],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--parser", choices=["pptx", "lxml"], default="lxml")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = generate_deck(os.path.join(tmp, "deck.pptx"), slides=args.slides, shapes_per_slide=15)
+        socket_path = os.path.join(tmp, "bench.sock")
+
+        cold = _time_check(path, args.parser, socket_path, args.runs)
+
+        server = subprocess.Popen([sys.executable, "-m", "src.daemon", "--socket", socket_path, "serve"])
+        try:
+            while not os.path.exists(socket_path):
+                time.sleep(0.05)
+            warm = _time_check(path, args.parser, socket_path, args.runs)
+        finally:
+            subprocess.run([sys.executable, "-m", "src.daemon", "--socket", socket_path, "stop"], check=False)
+            server.wait()
+
+    for name, times in (("cold (in-process)", cold), ("warm (daemon)", warm)):
+        print(f"{name:>18}: median {statistics.median(times) * 1000:7.1f} ms, "
+              f"min {min(times) * 1000:7.1f} ms over {len(times)} runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compare peak traced memory of the full report against the lazy per-slide stream.
+
+    python -m benchmarks.bench_streaming --slides 100 400 1000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from benchmarks.deckgen import generate_deck
+from src.main import analyze_report, analyze_stream
+
+
+def _measure(fn) -> tuple[float, int, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slides", type=int, nargs="+", default=[100, 400, 1000])
+    parser.add_argument("--shapes", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for slides in args.slides:
+            path = generate_deck(os.path.join(tmp, f"{slides}.pptx"), slides=slides, shapes_per_slide=args.shapes)
+            modes = {
+                "report": lambda: sum(len(r.errors) for r in analyze_report(path, "lxml")[1].slides.values()),
+                "stream": lambda: sum(1 for _ in analyze_stream(path, "lxml")),
+            }
+            for name, fn in modes.items():
+                elapsed, peak, findings = _measure(fn)
+                print(f"{slides:>5} slides, {name}: {findings:>6} findings in {elapsed:6.2f}s, "
+                      f"peak {peak / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
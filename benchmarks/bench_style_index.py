@@ -0,0 +1,65 @@
+"""Style index build, incremental update, load and check costs.
+
+    python -m benchmarks.bench_style_index --decks 20 --slides 20
+
+Builds an index from `--decks` generated decks, then times adding one more deck
+(which must not depend on the corpus size), opening the index and checking a
+deck against it.
+"""
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.deckgen import generate_deck
+from src.context import DeckContext
+from src.parsers.lxml_parser import iter_slides_lxml
+from src.style_index import StyleIndex, check_slides
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--decks", type=int, default=20)
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--shapes", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [
+            generate_deck(os.path.join(tmp, f"deck{i}.pptx"), slides=args.slides, shapes_per_slide=args.shapes, seed=i)
+            for i in range(args.decks + 1)
+        ]
+        directory = os.path.join(tmp, "index")
+
+        start = time.perf_counter()
+        StyleIndex(directory).add_decks(paths[:-1])
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        StyleIndex(directory).add_decks(paths[-1:])
+        update = time.perf_counter() - start
+
+        start = time.perf_counter()
+        StyleIndex(directory).add_decks(paths)
+        rescan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = StyleIndex(directory)
+        load = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        with DeckContext(paths[0]) as deck:
+            slides = list(iter_slides_lxml(deck))
+            elements = sum(len(s.text_elements) for s in slides)
+            start = time.perf_counter()
+            errors = check_slides(slides, deck, index)
+            check = time.perf_counter() - start
+
+    print(f"build from {args.decks} decks: {build:.2f}s; index {size} bytes")
+    print(f"add one deck:        {update * 1000:.1f} ms")
+    print(f"re-add every deck:   {rescan * 1000:.1f} ms (no-op, digests only)")
+    print(f"open index:          {load * 1000:.2f} ms")
+    print(f"check {elements} text elements: {check * 1000:.1f} ms ({len(errors)} findings)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Threshold sweep vs one analyze() run per threshold setting.
+
+    python -m benchmarks.bench_sweep --slides 100 --values 5
+
+Sweeps every thresholded detector over `--values` settings each, and checks the
+sweep's counts against the findings of a full analysis at each setting.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+import numpy as np
+from benchmarks.deckgen import generate_deck
+from src.main import analyze
+from src.sweep import sweep_deck
+
+DETECTOR_TYPES = {"margin_pct": "MARGIN", "min_ratio": "CONTRAST", "tolerance": "ASPECT_RATIO", "threshold": "ALIGNMENT", "min_overlap": "OVERLAP"}
+RANGES = {"margin_pct": (0.01, 0.1), "min_ratio": (2.0, 7.0), "tolerance": (0.01, 0.2), "threshold": (1.0, 20.0), "min_overlap": (0.01, 0.5)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slides", type=int, default=100)
+    parser.add_argument("--shapes", type=int, default=20)
+    parser.add_argument("--values", type=int, default=5)
+    args = parser.parse_args()
+
+    grid = {param: [round(v, 4) for v in np.linspace(lo, hi, args.values)] for param, (lo, hi) in RANGES.items()}
+    settings = sum(len(values) for values in grid.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = generate_deck(os.path.join(tmp, "deck.pptx"), slides=args.slides, shapes_per_slide=args.shapes)
+
+        start = time.perf_counter()
+        expected = {}
+        for param, values in grid.items():
+            for value in values:
+                report = json.loads(analyze(path, "lxml", config={param: value}))
+                types = Counter(e["type"] for slide in report.values() for e in slide["errors"])
+                expected[param, value] = types[DETECTOR_TYPES[param]]
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        counts = sweep_deck(path, grid, "lxml")["counts"]
+        swept = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sweep_deck(path, grid, "lxml", findings=True)
+        with_findings = time.perf_counter() - start
+
+    mismatches = [(param, value) for (param, value), count in expected.items() if counts[param][value] != count]
+    if mismatches:
+        raise SystemExit(f"Sweep counts disagree with full analyses at {mismatches}")
+    print(f"{settings} settings on {args.slides} slides")
+    print(f"analyze() per setting:  {full:.2f}s")
+    print(f"sweep_deck, counts:     {swept:.2f}s ({full / swept:.0f}x faster)")
+    print(f"sweep_deck, findings:   {with_findings:.2f}s ({full / with_findings:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
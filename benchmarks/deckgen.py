@@ -0,0 +1,174 @@
+"""Synthetic .pptx decks for benchmarks."""
+import random
+from io import BytesIO
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.util import Emu, Pt
+from PIL import Image
+from src.models import SlideNode, TextElement, ImageElement, TextStyle, BoundingBox
+
+
+def _png(width: int, height: int, color: tuple[int, int, int]) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+DEFAULT_FONT_SIZES = [12, 18, 18, 24, 24, 31, 32]
+
+
+def generate_deck(
+    path: str,
+    slides: int = 50,
+    shapes_per_slide: int = 20,
+    images_per_slide: int = 2,
+    seed: int = 0,
+    font_sizes: int | None = None,
+    distinct_images: int = 2,
+    image_px: int = 400,
+) -> str:
+    """Write a deck with placeholders, styled text boxes, pictures and backgrounds.
+
+    `font_sizes` sets how many distinct run sizes are used (default: a small set with
+    near-duplicates such as 31/32pt). Pictures cycle through `distinct_images` media
+    parts, so lowering it increases media reuse across slides.
+    """
+    rng = random.Random(seed)
+    prs = Presentation()
+    slide_w, slide_h = prs.slide_width, prs.slide_height
+    sizes = DEFAULT_FONT_SIZES if font_sizes is None else [8 + 1.5 * i for i in range(font_sizes)]
+    media = [
+        _png(image_px, image_px // (1 + i % 2), ((i * 37) % 256, (i * 91) % 256, 120))
+        for i in range(max(distinct_images, 1))
+    ]
+
+    for s in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[s % 6])
+        for placeholder in slide.placeholders:
+            if placeholder.has_text_frame:
+                placeholder.text_frame.text = f"Slide {s} placeholder {placeholder.placeholder_format.idx}"
+
+        if s % 3 == 1:
+            slide.background.fill.solid()
+            slide.background.fill.fore_color.rgb = RGBColor(0xf0, 0xf0, 0xf0)
+        elif s % 3 == 2:
+            slide.background.fill.solid()
+            slide.background.fill.fore_color.theme_color = MSO_THEME_COLOR.DARK_2
+
+        for j in range(shapes_per_slide):
+            box = slide.shapes.add_textbox(
+                Emu(rng.randrange(0, slide_w - 100000)), Emu(rng.randrange(0, slide_h - 100000)),
+                Emu(rng.randrange(100000, 3000000)), Emu(rng.randrange(100000, 1000000)),
+            )
+            paragraph = box.text_frame.paragraphs[0]
+            run = paragraph.add_run()
+            run.text = f"Text {s}.{j}"
+            run.font.size = Pt(rng.choice(sizes))
+            run.font.bold = j % 3 == 0
+            run.font.name = rng.choice(["Arial", "Calibri"])
+            if j % 4 == 0:
+                run.font.color.theme_color = MSO_THEME_COLOR.ACCENT_1
+            else:
+                run.font.color.rgb = RGBColor(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+            paragraph.add_line_break()
+            paragraph.add_run().text = "second line"
+            box.text_frame.add_paragraph().text = "second paragraph"
+
+        for k in range(images_per_slide):
+            slide.shapes.add_picture(
+                BytesIO(media[(s * images_per_slide + k) % len(media)]),
+                Emu(rng.randrange(0, slide_w // 2)), Emu(rng.randrange(0, slide_h // 2)),
+                Emu(rng.randrange(500000, 2500000)), Emu(rng.randrange(500000, 2500000)),
+            )
+
+    prs.save(path)
+    return path
+
+
+def generate_slides(slides: int = 1000, shapes_per_slide: int = 30, images_per_slide: int = 2, seed: int = 0) -> list[SlideNode]:
+    """In-memory `SlideNode`s with the same mix of elements, for detector-only timings."""
+    rng = random.Random(seed)
+    nodes = []
+    for s in range(slides):
+        node = SlideNode(index=s, width=960, height=720, background_color=rng.choice([None, "#ffffff", "#f0f0f0"]))
+        for j in range(shapes_per_slide):
+            node.text_elements.append(TextElement(
+                id=str(j + 2),
+                slide_index=s,
+                text=f"Text {s}.{j}",
+                style=TextStyle(
+                    font_size=rng.choice([12, 18, 18, 24, 24, 31, 32]),
+                    color=f"#{rng.randrange(1 << 24):06x}",
+                ),
+                bbox=BoundingBox(x=rng.uniform(0, 900), y=rng.uniform(0, 680), width=rng.uniform(20, 300), height=rng.uniform(10, 100)),
+            ))
+        for k in range(images_per_slide):
+            bbox = BoundingBox(x=rng.uniform(0, 700), y=rng.uniform(0, 500), width=rng.uniform(50, 250), height=rng.uniform(50, 250))
+            node.image_elements.append(ImageElement(
+                id=str(shapes_per_slide + k + 2), slide_index=s, bbox=bbox,
+                rendered_width=bbox.width, rendered_height=bbox.height,
+            ))
+        nodes.append(node)
+    return nodes
+
+
+def generate_grouped_deck(
+    path: str,
+    slides: int = 20,
+    groups_per_slide: int = 4,
+    depth: int = 3,
+    shapes_per_group: int = 5,
+    table_rows: int = 4,
+    table_cols: int = 4,
+    seed: int = 0,
+) -> str:
+    """Write a deck of nested groups and tables, like a design-tool export.
+
+    Each slide holds `groups_per_slide` chains of groups nested `depth` deep, each
+    level with `shapes_per_group` text boxes and a picture, and a table whose first
+    row spans two columns. Every group is shrunk after filling, so its children are
+    scaled through `a:chOff`/`a:chExt`.
+    """
+    rng = random.Random(seed)
+    prs = Presentation()
+    slide_w, slide_h = prs.slide_width, prs.slide_height
+    image = _png(200, 100, (30, 90, 160))
+
+    for s in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        for g in range(groups_per_slide):
+            # Built innermost first: grouping existing shapes computes each group's
+            # extents once, where adding to a group recomputes them on every shape
+            inner = None
+            for level in reversed(range(depth)):
+                members = [] if inner is None else [inner]
+                for j in range(shapes_per_group):
+                    box = slide.shapes.add_textbox(
+                        Emu(rng.randrange(0, slide_w - 1000000)), Emu(rng.randrange(0, slide_h - 500000)),
+                        Emu(rng.randrange(200000, 1000000)), Emu(rng.randrange(100000, 500000)),
+                    )
+                    run = box.text_frame.paragraphs[0].add_run()
+                    run.text = f"Group {s}.{g}.{level}.{j}"
+                    run.font.size = Pt(rng.choice(DEFAULT_FONT_SIZES))
+                    members.append(box)
+                members.append(slide.shapes.add_picture(
+                    BytesIO(image),
+                    Emu(rng.randrange(0, slide_w // 2)), Emu(rng.randrange(0, slide_h // 2)),
+                    Emu(1000000), Emu(500000),
+                ))
+                inner = slide.shapes.add_group_shape(members)
+                inner.width = Emu(inner.width * 3 // 4)
+                inner.height = Emu(inner.height * 3 // 4)
+
+        table = slide.shapes.add_table(
+            table_rows, table_cols, Emu(500000), Emu(4000000), Emu(6000000), Emu(300000 * table_rows),
+        ).table
+        for r in range(table_rows):
+            for c in range(table_cols):
+                table.cell(r, c).text = f"Cell {s}.{r}.{c}"
+        if table_cols > 1:
+            table.cell(0, 0).merge(table.cell(0, 1))
+
+    prs.save(path)
+    return path
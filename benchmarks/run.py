@@ -0,0 +1,171 @@
+"""Stage-by-stage benchmark of `analyze()` on synthetic decks.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --output new.json --baseline results.json --threshold 0.15
+
+Each scenario runs in a fresh process so its peak RSS is its own. Stage times are
+the best of `--repeat` runs. With `--baseline`, any stage slower than the baseline
+by more than `--threshold` (and by at least `--min-delta` seconds) is reported
+and the exit status is 1.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+SCENARIOS = {
+    "small": dict(slides=20, shapes_per_slide=10, images_per_slide=1),
+    "medium": dict(slides=200, shapes_per_slide=25, images_per_slide=2),
+    "large": dict(slides=400, shapes_per_slide=40, images_per_slide=3, distinct_images=3),
+    "many-fonts": dict(slides=100, shapes_per_slide=30, images_per_slide=0, font_sizes=40),
+    "media-heavy": dict(slides=100, shapes_per_slide=5, images_per_slide=8, distinct_images=50, image_px=1200),
+}
+
+
+def _time_stages(path: str, parser: str) -> tuple[dict[str, float], int, int]:
+    from src.context import DeckContext
+    from src.geometry import build_geometry
+    from src.main import DEFAULT_CONFIG, slide_iterator
+    from src.detectors.hierarchy import detect_hierarchy_violations
+    from src.detectors.margin import detect_margin_violations
+    from src.detectors.contrast import detect_contrast_violations
+    from src.detectors.aspect_ratio import detect_aspect_ratio_violations
+    from src.detectors.alignment import detect_alignment_violations
+    from src.detectors.overlap import detect_overlap_violations
+    from src.reporter import generate_report, report_to_json
+
+    stages = {}
+
+    def timed(name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        stages[name] = time.perf_counter() - start
+        return result
+
+    config = DEFAULT_CONFIG
+    deck = timed("open", DeckContext, path)
+    with deck:
+        slides = timed("parse", lambda: list(slide_iterator(parser)(deck)))
+        geometry = timed("geometry", build_geometry, slides)
+        errors = timed("hierarchy", detect_hierarchy_violations, slides, geometry=geometry)
+        errors += timed("margin", detect_margin_violations, slides, config["margin_pct"], geometry=geometry)
+        errors += timed("contrast", detect_contrast_violations, slides, config["min_ratio"], geometry=geometry)
+        errors += timed("aspect_ratio", detect_aspect_ratio_violations, slides, deck, config["tolerance"])
+        errors += timed("alignment", detect_alignment_violations, slides, config["threshold"], geometry=geometry)
+        errors += timed("overlap", detect_overlap_violations, slides, config["min_overlap"], geometry=geometry)
+    report = timed("report", generate_report, slides, errors)
+    timed("json", report_to_json, report)
+    stages["total"] = sum(stages.values())
+    elements = sum(len(s.text_elements) + len(s.image_elements) for s in slides)
+    return stages, elements, len(errors)
+
+
+def _run_scenario(path: str, parser: str, repeat: int, queue) -> None:
+    best: dict[str, float] = {}
+    for _ in range(repeat):
+        stages, elements, findings = _time_stages(path, parser)
+        for stage, seconds in stages.items():
+            best[stage] = min(best.get(stage, float("inf")), seconds)
+    # ru_maxrss is in KiB on Linux
+    queue.put((best, elements, findings, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def run(scenarios: list[str], parser: str, repeat: int) -> dict:
+    from benchmarks.deckgen import generate_deck
+
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in scenarios:
+            path = generate_deck(os.path.join(tmp, f"{name}.pptx"), **SCENARIOS[name])
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run_scenario, args=(path, parser, repeat, queue))
+            proc.start()
+            stages, elements, findings, peak_rss = queue.get()
+            proc.join()
+            result = {
+                "scenario": name,
+                "parser": parser,
+                "params": SCENARIOS[name],
+                "deck_bytes": os.path.getsize(path),
+                "elements": elements,
+                "findings": findings,
+                "stages": stages,
+                "peak_rss_kb": peak_rss,
+            }
+            results.append(result)
+            print(f"{name:>12}: {stages['total']:.3f}s total, parse {stages['parse']:.3f}s, "
+                  f"peak RSS {peak_rss / 1024:.0f} MiB", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    """Stages that regressed by more than `threshold` (relative) and `min_delta` seconds."""
+    previous = {(r["scenario"], r["parser"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = previous.get((result["scenario"], result["parser"]))
+        if base is None:
+            continue
+        for stage, seconds in result["stages"].items():
+            before = base["stages"].get(stage)
+            if before is None:
+                continue
+            if seconds - before > min_delta and seconds > before * (1 + threshold):
+                regressions.append(
+                    f"{result['scenario']}/{result['parser']}/{stage}: {before:.4f}s -> {seconds:.4f}s "
+                    f"(+{(seconds / before - 1) * 100:.0f}%)"
+                )
+        if result["peak_rss_kb"] > base["peak_rss_kb"] * (1 + threshold):
+            regressions.append(
+                f"{result['scenario']}/{result['parser']}/peak_rss: "
+                f"{base['peak_rss_kb']} KiB -> {result['peak_rss_kb']} KiB"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark analyze() stages on synthetic decks.")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=["small", "medium"])
+    parser.add_argument("--parser", choices=["pptx", "lxml"], default="lxml")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="-", help="JSON results file (default: stdout)")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="ignore slowdowns below this many seconds")
+    args = parser.parse_args()
+
+    results = run(args.scenarios, args.parser, args.repeat)
+    text = json.dumps(results, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_delta)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
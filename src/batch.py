@@ -0,0 +1,237 @@
+"""Analyse many decks in parallel.
+
+    python -m src.batch decks/ "archive/**/*.pptx" extra.pptx --workers 8 --output results.ndjson
+
+Each deck becomes one JSON line, written as soon as its analysis finishes. A deck
+that cannot be analysed (corrupt zip, password-protected file, ...) produces an
+error line instead of stopping the batch. So does a deck that kills its worker
+process (out of memory, a crash in native code) or runs past `--timeout`; the
+other decks are rerun in a fresh pool, so only the culprit is recorded as failed.
+
+With `--findings`, each finding is its own line instead (see `analyze_stream`).
+Workers stream them to a spool file that is copied to the output once the deck
+is done, so neither side holds a deck's findings in memory.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import IO, Callable, Iterable, Iterator
+from src.context import DeckContext
+from src.main import analyze_report, stream_ndjson
+from src.reporter import report_to_dict
+
+
+def collect_paths(inputs: Iterable[str]) -> list[str]:
+    """Expand directories (recursively), glob patterns and plain paths into .pptx files."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "**", "*.pptx"), recursive=True)
+        elif glob.has_magic(item):
+            matches = glob.glob(item, recursive=True)
+        else:
+            matches = [item]
+        paths.extend(sorted(matches))
+    return list(dict.fromkeys(paths))
+
+
+def analyze_deck(path: str, parser: str = "pptx") -> dict:
+    """Analyse one deck, returning a result record rather than raising."""
+    start = time.perf_counter()
+    try:
+        slides, report = analyze_report(path, parser)
+    except Exception as exc:
+        return {
+            "deck": path,
+            "ok": False,
+            "error": f"{type(exc).__name__}: {exc}",
+            "seconds": time.perf_counter() - start,
+        }
+    return {
+        "deck": path,
+        "ok": True,
+        "slides": len(slides),
+        "seconds": time.perf_counter() - start,
+        "report": report_to_dict(report),
+    }
+
+
+def spool_findings(path: str, parser: str, spool_dir: str) -> dict:
+    """Stream one deck's findings into a file under `spool_dir`, returning a result record."""
+    start = time.perf_counter()
+    fd, spool = tempfile.mkstemp(dir=spool_dir, suffix=".ndjson")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            findings = stream_ndjson(path, f, parser)
+        with DeckContext(path) as deck:
+            slides = len(deck.slide_parts)
+    except Exception as exc:
+        os.remove(spool)
+        return {
+            "deck": path,
+            "ok": False,
+            "error": f"{type(exc).__name__}: {exc}",
+            "seconds": time.perf_counter() - start,
+        }
+    return {
+        "deck": path,
+        "ok": True,
+        "slides": slides,
+        "findings": findings,
+        "seconds": time.perf_counter() - start,
+        "spool": spool,
+    }
+
+
+def _failure(path: str, exc: BaseException) -> dict:
+    return {"deck": path, "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def _kill(pool: ProcessPoolExecutor) -> None:
+    # A running task cannot be cancelled, so its worker processes are killed
+    for process in list((pool._processes or {}).values()):
+        process.kill()
+    pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_results(paths: list[str], task: Callable[..., dict], args: tuple = (), workers: int | None = None, timeout: float | None = None) -> Iterator[dict]:
+    """`task(path, *args)` for each path in a process pool, yielding result records as they finish.
+
+    At most `workers` decks are in flight, so each one's `timeout` (seconds) runs
+    from when a worker picks it up. When a worker dies, the pool breaks for every
+    deck in flight; those decks are rerun one at a time, and only a deck that
+    breaks a pool on its own gets a failure record. A deck past its timeout gets
+    one too, and the others in flight are requeued.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending, suspects = deque(paths), deque()
+    while pending or suspects:
+        queue, width = (suspects, 1) if suspects else (pending, workers)
+        pool = ProcessPoolExecutor(max_workers=width)
+        running: dict = {}
+        finished = False
+        try:
+            while queue or running:
+                while queue and len(running) < width:
+                    path = queue.popleft()
+                    running[pool.submit(task, path, *args)] = (path, time.monotonic() + timeout if timeout else None)
+                deadline = min((d for _, d in running.values() if d is not None), default=None)
+                done, _ = wait(running, None if deadline is None else max(deadline - time.monotonic(), 0), FIRST_COMPLETED)
+
+                broken = []
+                for future in done:
+                    path, _ = running.pop(future)
+                    try:
+                        yield future.result()
+                    except BrokenProcessPool:
+                        broken.append(path)
+                    except Exception as exc:
+                        yield _failure(path, exc)
+                if broken:
+                    in_flight = broken + [path for path, _ in running.values()]
+                    running.clear()
+                    if width == 1:
+                        yield _failure(in_flight[0], BrokenProcessPool("the worker process died while analysing this deck"))
+                    else:
+                        suspects.extend(in_flight)
+                    break
+
+                now = time.monotonic()
+                expired = [f for f, (_, d) in running.items() if d is not None and d <= now]
+                if expired:
+                    for future in expired:
+                        path, _ = running.pop(future)
+                        yield _failure(path, TimeoutError(f"analysis took longer than {timeout}s"))
+                    queue.extendleft(reversed([path for path, _ in running.values()]))
+                    running.clear()
+                    break
+            else:
+                finished = True
+        finally:
+            if finished:
+                pool.shutdown()
+            else:
+                _kill(pool)
+
+
+def run_batch(paths: list[str], out: IO[str], workers: int | None = None, parser: str = "pptx", findings: bool = False, timeout: float | None = None) -> dict:
+    """Fan `paths` out over a process pool and write JSON lines to `out`.
+
+    One line per deck, or with `findings` one line per finding plus an error line
+    for each deck that failed. `timeout` bounds each deck's analysis in seconds.
+    """
+    start = time.perf_counter()
+    ok = failed = slides = 0
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        if findings:
+            results = iter_results(paths, spool_findings, (parser, spool_dir), workers, timeout)
+        else:
+            results = iter_results(paths, analyze_deck, (parser,), workers, timeout)
+        for result in results:
+            if result["ok"]:
+                ok += 1
+                slides += result["slides"]
+            else:
+                failed += 1
+            if findings and result["ok"]:
+                with open(result["spool"], encoding="utf-8") as f:
+                    shutil.copyfileobj(f, out)
+                os.remove(result["spool"])
+            else:
+                out.write(json.dumps(result) + "\n")
+            out.flush()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "decks": ok + failed,
+        "ok": ok,
+        "failed": failed,
+        "slides": slides,
+        "seconds": elapsed,
+        "decks_per_sec": (ok + failed) / elapsed if elapsed > 0 else 0.0,
+        "slides_per_sec": slides / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyse a batch of .pptx decks in parallel.")
+    parser.add_argument("inputs", nargs="+", help="directories, glob patterns or .pptx files")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--output", default="-", help="NDJSON output file (default: stdout)")
+    parser.add_argument("--parser", choices=["pptx", "lxml"], default="pptx")
+    parser.add_argument("--findings", action="store_true", help="write one line per finding instead of per deck")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds before a deck is given up as failed")
+    args = parser.parse_args(argv)
+
+    paths = collect_paths(args.inputs)
+    if not paths:
+        print("No .pptx files found", file=sys.stderr)
+        return 1
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        summary = run_batch(paths, out, args.workers, args.parser, args.findings, args.timeout)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(
+        f"{summary['decks']} decks ({summary['failed']} failed), {summary['slides']} slides "
+        f"in {summary['seconds']:.1f}s: {summary['decks_per_sec']:.2f} decks/s, "
+        f"{summary['slides_per_sec']:.1f} slides/s",
+        file=sys.stderr,
+    )
+    return 0 if summary["failed"] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
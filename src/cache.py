@@ -0,0 +1,225 @@
+"""On-disk cache of per-slide parse results and findings.
+
+Entries are keyed by a hash of everything a slide's result depends on: its own XML
+and relationships, the layout/master/theme parts and default text style it
+inherits from, the media it embeds, the slide size and the detector
+configuration, but not the slide's position. Editing one slide therefore only
+invalidates that slide's entry, and inserting, deleting or reordering slides
+invalidates none.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Optional
+from lxml import etree
+from src.context import DEFAULT_TEXT_STYLE, DeckContext, PRESENTATION_PART, RT_SLIDE_LAYOUT, RT_SLIDE_MASTER, RT_THEME, rels_part_name
+
+# Bump whenever parser or detector output changes so stale entries are discarded
+CACHE_VERSION = 7
+
+_VERSION_FILE = "VERSION"
+# Entries live in subdirectories named after the first two hex digits of their key
+_KEY_DIR = re.compile(r"[0-9a-f]{2}")
+_IMAGE_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+def _default_text_style_digest(deck: DeckContext) -> str:
+    # Hashed on its own: the rest of presentation.xml changes whenever slides are added
+    found = DEFAULT_TEXT_STYLE(deck.xml(PRESENTATION_PART))
+    return hashlib.sha256(etree.tostring(found[0])).hexdigest() if found else ""
+
+
+def config_digest(config: dict) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+def slide_digest(deck: DeckContext, idx: int) -> str:
+    """Hash of slide `idx`'s content and everything it inherits, but not its position.
+
+    Equal digests mean the slide parses and checks the same wherever it sits in
+    whichever deck.
+    """
+    part = deck.slide_parts[idx]
+    layout = deck.related(part, RT_SLIDE_LAYOUT)
+    master = deck.related(layout, RT_SLIDE_MASTER) if layout else None
+    theme = deck.related(master, RT_THEME) if master else None
+    h = hashlib.sha256()
+    for value in (
+        str(deck.slide_size),
+        deck.part_digest(part),
+        deck.part_digest(rels_part_name(part)),
+        deck.part_digest(layout) if layout else "",
+        deck.part_digest(master) if master else "",
+        deck.part_digest(theme) if theme else "",
+        _default_text_style_digest(deck),
+    ):
+        h.update(value.encode())
+        h.update(b"\0")
+    for rtype, target in sorted(deck.rels(part).values()):
+        if rtype == _IMAGE_REL:
+            h.update(f"{target}:{deck.member_checksum(target)}".encode())
+    return h.hexdigest()
+
+
+def slide_key(deck: DeckContext, idx: int, config: dict) -> str:
+    """Cache key for slide `idx` of `deck` analysed with `config`; equal for the same slide at any position."""
+    h = hashlib.sha256()
+    for value in (str(CACHE_VERSION), config_digest(config), slide_digest(deck, idx)):
+        h.update(value.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU store of JSON entries in `directory`.
+
+    Recency is tracked through file modification times, so it survives across runs
+    and processes. A directory written by another `CACHE_VERSION` is cleared on open;
+    a non-empty directory that is not a cache is refused rather than cleared.
+
+    The recency index is only built on the first `put`, so runs that only hit never
+    walk the directory. Once over `max_bytes`, the oldest entries are evicted down to
+    `LOW_WATER` of it, so a full cache doesn't evict on every write.
+    """
+
+    SUFFIX = ".json"
+    LOW_WATER = 0.9
+    # Interrupted writes older than this are removed; younger ones may still be in flight
+    STALE_TMP_SECONDS = 3600
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        stored = self._stored_version()
+        if stored is None and os.listdir(directory):
+            raise ValueError(f"{directory!r} is not empty and has no {_VERSION_FILE} file; not using it as a cache")
+        self._entries: Optional[OrderedDict[str, int]] = None
+        self._total = 0
+        if stored != str(CACHE_VERSION):
+            self.clear()
+
+    def _stored_version(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.directory, _VERSION_FILE), encoding="utf-8") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + self.SUFFIX)
+
+    def _index(self) -> OrderedDict[str, int]:
+        """Entry sizes by key, least recently used first, loaded on first use."""
+        if self._entries is not None:
+            return self._entries
+        found = []
+        stale = time.time() - self.STALE_TMP_SECONDS
+        for name in os.listdir(self.directory):
+            subdir = os.path.join(self.directory, name)
+            if not (_KEY_DIR.fullmatch(name) and os.path.isdir(subdir)):
+                continue
+            for entry in os.scandir(subdir):
+                try:
+                    stat = entry.stat()
+                    if entry.name.endswith(".tmp"):
+                        if stat.st_mtime < stale:
+                            os.remove(entry.path)
+                    elif entry.name.endswith(self.SUFFIX):
+                        found.append((stat.st_mtime, entry.name[:-len(self.SUFFIX)], stat.st_size))
+                except OSError:
+                    # Removed by another process meanwhile
+                    continue
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self._total = sum(self._entries.values())
+        return self._entries
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self._hit(key)
+        return value
+
+    def _hit(self, key: str) -> None:
+        self.hits += 1
+        if self._entries is not None and key in self._entries:
+            self._entries.move_to_end(key)
+
+    def put(self, key: str, value: dict) -> None:
+        self._write(key, json.dumps(value, separators=(",", ":")).encode())
+
+    def _write(self, key: str, data: bytes) -> str:
+        entries = self._index()
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        self._total += len(data) - entries.pop(key, 0)
+        entries[key] = len(data)
+        if self._total > self.max_bytes:
+            self._evict(self.max_bytes * self.LOW_WATER)
+        return path
+
+    def _evict(self, target: float) -> None:
+        entries = self._index()
+        while entries and self._total > target:
+            key, size = entries.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self._total -= size
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after upgrading the parser or detectors.
+
+        Only entries (and interrupted writes) in the key subdirectories are removed;
+        anything else in the directory is left alone.
+        """
+        for name in os.listdir(self.directory):
+            subdir = os.path.join(self.directory, name)
+            if not (_KEY_DIR.fullmatch(name) and os.path.isdir(subdir)):
+                continue
+            for entry in os.listdir(subdir):
+                if entry.endswith((self.SUFFIX, ".tmp")):
+                    os.remove(os.path.join(subdir, entry))
+            if not os.listdir(subdir):
+                os.rmdir(subdir)
+        with open(os.path.join(self.directory, _VERSION_FILE), "w", encoding="utf-8") as f:
+            f.write(str(CACHE_VERSION))
+        self._entries = OrderedDict()
+        self._total = 0
+
+
+class BitmapCache(ResultCache):
+    """Rendered slides as PNG files, with the same keys, LRU bound and versioning."""
+
+    SUFFIX = ".png"
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of the cached PNG, or None."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self._hit(key)
+        return path
+
+    def put(self, key: str, png: bytes) -> str:
+        return self._write(key, png)
@@ -0,0 +1,237 @@
+import hashlib
+import posixpath
+import zipfile
+from io import BytesIO
+from typing import IO, Optional
+from lxml import etree
+
+
+NS = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'pr': 'http://schemas.openxmlformats.org/package/2006/relationships',
+}
+
+RT_SLIDE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide'
+RT_SLIDE_LAYOUT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout'
+RT_SLIDE_MASTER = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideMaster'
+RT_THEME = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme'
+
+PRESENTATION_PART = 'ppt/presentation.xml'
+
+
+def emu_to_px(emu: int) -> float:
+    return emu / 914400 * 96
+
+
+def xpath(expr: str) -> etree.XPath:
+    """`expr` compiled with the prefixes in `NS`."""
+    return etree.XPath(expr, namespaces=NS)
+
+
+# Namespace prefixes in Clark notation, for comparing element tags
+A = '{%s}' % NS['a']
+P = '{%s}' % NS['p']
+
+TAG_R = A + 'r'
+TAG_FLD = A + 'fld'
+TAG_T = A + 't'
+
+# Queries shared by the parsers, the style resolver and the cache keys
+SHAPES = xpath('./p:cSld/p:spTree/*')
+PLACEHOLDER = xpath('./*[1]/p:nvPr/p:ph')
+# Shapes hold text in p:txBody, table cells (a:tc) in a:txBody
+PARAGRAPHS = xpath('./p:txBody/a:p | ./a:txBody/a:p')
+DEFAULT_TEXT_STYLE = xpath('./p:defaultTextStyle')
+
+_SLIDE_IDS = xpath('./p:sldIdLst/p:sldId/@r:id')
+_SLIDE_SIZE = xpath('./p:sldSz')
+_RELATIONSHIPS = xpath('./pr:Relationship')
+
+
+def rels_part_name(part_name: str) -> str:
+    directory, filename = posixpath.split(part_name)
+    return posixpath.join(directory, '_rels', filename + '.rels')
+
+
+class DeckContext:
+    """Read-once view of a .pptx package shared by the parser and every detector.
+
+    The zip is opened a single time; each part is read and parsed lazily on first
+    use and memoized for the rest of the analysis. When the python-pptx object model
+    is needed, its already-loaded parts are reused instead of reading the zip again.
+    Use as a context manager so the zip handle is closed once the analysis is done.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._zip = zipfile.ZipFile(path, 'r')
+        self._presentation = None
+        self._package_parts: dict[str, object] = {}
+        self._blobs: dict[str, bytes] = {}
+        self._xml: dict[str, etree._Element] = {}
+        self._rels: dict[str, dict[str, tuple[str, str]]] = {}
+        self._digests: dict[str, str] = {}
+        self._media_dims: dict[object, Optional[tuple[float, float]]] = {}
+        self._slide_parts: Optional[list[str]] = None
+
+    def __enter__(self) -> "DeckContext":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def presentation(self):
+        """python-pptx `Presentation`, loaded on first access only."""
+        if self._presentation is None:
+            from pptx import Presentation
+            # Read through the zip already open, so the file is opened once
+            self._presentation = Presentation(self._zip.fp)
+            self._package_parts = {
+                str(part.partname).lstrip('/'): part
+                for part in self._presentation.part.package.iter_parts()
+            }
+            # Everything python-pptx loaded is now served from memory.
+            self._blobs.clear()
+        return self._presentation
+
+    def has_part(self, part_name: str) -> bool:
+        if part_name in self._package_parts:
+            return True
+        try:
+            self._zip.getinfo(part_name)
+            return True
+        except KeyError:
+            return False
+
+    def blob(self, part_name: str) -> bytes:
+        part = self._package_parts.get(part_name)
+        if part is not None and not hasattr(part, '_element'):
+            return part.blob
+        if part_name not in self._blobs:
+            self._blobs[part_name] = self._zip.read(part_name)
+        return self._blobs[part_name]
+
+    def open_part(self, part_name: str) -> IO[bytes]:
+        """Binary stream over a part, without buffering it in the context."""
+        part = self._package_parts.get(part_name)
+        if part is not None and not hasattr(part, '_element'):
+            return BytesIO(part.blob)
+        return self._zip.open(part_name)
+
+    def xml(self, part_name: str) -> etree._Element:
+        """Parsed XML root of a part. Query it with compiled `etree.XPath` objects."""
+        if part_name not in self._xml:
+            part = self._package_parts.get(part_name)
+            if part is not None and hasattr(part, '_element'):
+                self._xml[part_name] = part._element
+            else:
+                self._xml[part_name] = etree.fromstring(self.blob(part_name))
+                self._blobs.pop(part_name, None)
+        return self._xml[part_name]
+
+    def part_digest(self, part_name: str) -> str:
+        """SHA-256 of a part's bytes ('' if absent). The bytes stay buffered for `xml`."""
+        if part_name not in self._digests:
+            if self.has_part(part_name):
+                self._digests[part_name] = hashlib.sha256(self.blob(part_name)).hexdigest()
+            else:
+                self._digests[part_name] = ''
+        return self._digests[part_name]
+
+    def release(self, part_name: str) -> None:
+        """Forget a part's memoized bytes, XML, rels and digest, e.g. once its slide is done."""
+        for cache in (self._blobs, self._xml, self._rels, self._digests):
+            cache.pop(part_name, None)
+
+    def member_checksum(self, part_name: str) -> tuple[int, int]:
+        """(CRC-32, size) of a zip member from the central directory, without reading it."""
+        try:
+            info = self._zip.getinfo(part_name)
+        except KeyError:
+            return 0, 0
+        return info.CRC, info.file_size
+
+    def rels(self, part_name: str) -> dict[str, tuple[str, str]]:
+        """Map of rId -> (relationship type, target part name) for a part."""
+        if part_name not in self._rels:
+            rels = {}
+            rels_name = rels_part_name(part_name)
+            part = self._package_parts.get(part_name)
+            if part is not None:
+                # python-pptx has already parsed them
+                for r_id, rel in part.rels.items():
+                    if not rel.is_external:
+                        rels[r_id] = (rel.reltype, str(rel.target_partname).lstrip('/'))
+            elif self.has_part(rels_name):
+                base = posixpath.dirname(part_name)
+                for rel in _RELATIONSHIPS(etree.fromstring(self._zip.read(rels_name))):
+                    if rel.get('TargetMode') == 'External':
+                        continue
+                    target = posixpath.normpath(posixpath.join(base, rel.get('Target')))
+                    rels[rel.get('Id')] = (rel.get('Type'), target.lstrip('/'))
+            self._rels[part_name] = rels
+        return self._rels[part_name]
+
+    def related(self, part_name: str, reltype: str) -> Optional[str]:
+        for rtype, target in self.rels(part_name).values():
+            if rtype == reltype:
+                return target
+        return None
+
+    def target(self, part_name: str, r_id: str) -> Optional[str]:
+        rel = self.rels(part_name).get(r_id)
+        return rel[1] if rel else None
+
+    @property
+    def slide_parts(self) -> list[str]:
+        """Slide part names in presentation order."""
+        if self._slide_parts is None:
+            prs = self.xml(PRESENTATION_PART)
+            self._slide_parts = [
+                self.target(PRESENTATION_PART, r_id) for r_id in _SLIDE_IDS(prs)
+            ]
+        return self._slide_parts
+
+    @property
+    def slide_size(self) -> tuple[int, int]:
+        """Slide (width, height) in EMU."""
+        sld_sz = _SLIDE_SIZE(self.xml(PRESENTATION_PART))
+        if not sld_sz:
+            return 9144000, 6858000
+        return int(sld_sz[0].get('cx')), int(sld_sz[0].get('cy'))
+
+    def media_dimensions(self, part_name: str) -> Optional[tuple[float, float]]:
+        """Native pixel size of an image part, or None if it cannot be decoded.
+
+        Only the image header is read, streamed from the zip member. Sizes are
+        cached by content (CRC-32 and length from the zip directory), so a picture
+        reused across slides or duplicated under several names is decoded once.
+        """
+        if part_name not in self._media_dims:
+            content_key = self.member_checksum(part_name)
+            if content_key == (0, 0):
+                content_key = part_name
+            if content_key not in self._media_dims:
+                self._media_dims[content_key] = self._read_image_size(part_name)
+            self._media_dims[part_name] = self._media_dims[content_key]
+        return self._media_dims[part_name]
+
+    def _read_image_size(self, part_name: str) -> Optional[tuple[float, float]]:
+        from PIL import Image
+        try:
+            with self.open_part(part_name) as stream:
+                # PIL only parses the header until pixel data is requested
+                with Image.open(stream) as img:
+                    return img.size
+        except Exception:
+            return None
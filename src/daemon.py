@@ -0,0 +1,180 @@
+"""Long-lived analysis server on a Unix socket, for low-latency checks of single decks.
+
+    python -m src.daemon serve &                 # imports and warms everything once
+    python -m src.daemon check deck.pptx         # prints the JSON report
+    python -m src.daemon check --ndjson a.pptx b.pptx
+    python -m src.daemon stop
+
+`check` falls back to analysing in-process when no server is listening. The
+client side only needs the standard library, so it starts in a few milliseconds;
+keep heavy imports inside `serve()`.
+
+Requests and responses are single JSON lines:
+{"path": ..., "parser": ..., "format": "json"|"ndjson"} -> {"ok": true, "output": ...}
+"""
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+
+_BUFFER = 1 << 16
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        # Anyone can create files in the shared temp dir, so the socket goes in a private one
+        runtime_dir = os.path.join(tempfile.gettempdir(), f"layout-error-{os.getuid()}")
+        os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+        info = os.lstat(runtime_dir)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            raise PermissionError(f"{runtime_dir} must be a directory only the current user can access")
+    return os.path.join(runtime_dir, f"layout-error-{os.getuid()}.sock")
+
+
+def _analyze(request: dict) -> str:
+    from src.main import analyze, stream_ndjson
+
+    parser = request.get("parser", "pptx")
+    if request.get("format") == "ndjson":
+        out = io.StringIO()
+        stream_ndjson(request["path"], out, parser)
+        return out.getvalue()
+    return analyze(request["path"], parser)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError as exc:
+            self._reply({"ok": False, "error": f"Bad request: {exc}"})
+            return
+        if request.get("command") == "shutdown":
+            self._reply({"ok": True})
+            # Handlers run in their own thread, so this can wait for serve_forever() to exit
+            self.server.shutdown()
+            return
+        try:
+            self._reply({"ok": True, "output": _analyze(request)})
+        except Exception as exc:
+            self._reply({"ok": False, "error": f"{type(exc).__name__}: {exc}"})
+
+    def _reply(self, response: dict) -> None:
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(socket_path: str | None = None) -> None:
+    """Warm up every import, then answer requests until a shutdown request arrives."""
+    import src.main  # noqa: F401  (parsers, detectors, numpy, pydantic)
+    import src.parsers.lxml_parser  # noqa: F401
+    import src.parsers.xml_parser  # noqa: F401  (python-pptx)
+    import PIL.Image  # noqa: F401
+
+    socket_path = socket_path or default_socket_path()
+    if os.path.exists(socket_path):
+        existing = _connect(socket_path)
+        if existing is not None:
+            existing.close()
+            raise RuntimeError(f"A server is already listening on {socket_path}")
+        os.remove(socket_path)
+
+    # Only the owner may connect: requests name arbitrary files to read
+    umask = os.umask(0o177)
+    try:
+        server = _Server(socket_path, _Handler)
+    finally:
+        os.umask(umask)
+    try:
+        server.serve_forever(poll_interval=0.2)
+    finally:
+        server.server_close()
+        os.remove(socket_path)
+
+
+def _connect(socket_path: str) -> socket.socket | None:
+    try:
+        owner = os.stat(socket_path).st_uid
+    except OSError:
+        return None
+    # Another user's socket could answer with forged reports
+    if owner != os.getuid():
+        raise PermissionError(f"{socket_path} belongs to another user; not connecting")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request(message: dict, socket_path: str | None = None) -> dict | None:
+    """Send one request to the server; None when no server is listening."""
+    sock = _connect(socket_path or default_socket_path())
+    if sock is None:
+        return None
+    with sock, sock.makefile("rb", buffering=_BUFFER) as reader:
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        line = reader.readline()
+    if not line:
+        raise ConnectionError("Server closed the connection without replying")
+    return json.loads(line)
+
+
+def check(path: str, parser: str = "pptx", fmt: str = "json", socket_path: str | None = None) -> dict:
+    """Analyse `path` on the server if one is running, otherwise in this process."""
+    message = {"path": os.path.abspath(path), "parser": parser, "format": fmt}
+    response = request(message, socket_path)
+    if response is None:
+        try:
+            response = {"ok": True, "output": _analyze(message)}
+        except Exception as exc:
+            response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+    return response
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Warm analysis server for single-deck checks.")
+    parser.add_argument("--socket", default=None, help="socket path (default: per-user runtime dir)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="run the server in the foreground")
+    commands.add_parser("stop", help="ask a running server to exit")
+    check_parser = commands.add_parser("check", help="analyse decks, via the server when running")
+    check_parser.add_argument("paths", nargs="+")
+    check_parser.add_argument("--parser", choices=["pptx", "lxml"], default="pptx")
+    check_parser.add_argument("--ndjson", action="store_true", help="one JSON line per finding")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.socket)
+        return 0
+    if args.command == "stop":
+        if request({"command": "shutdown"}, args.socket) is None:
+            print("No server running", file=sys.stderr)
+            return 1
+        return 0
+
+    failed = False
+    for path in args.paths:
+        response = check(path, args.parser, "ndjson" if args.ndjson else "json", args.socket)
+        if response["ok"]:
+            output = response["output"]
+            sys.stdout.write(output if args.ndjson else output + "\n")
+        else:
+            failed = True
+            print(f"{path}: {response['error']}", file=sys.stderr)
+    return 2 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,97 @@
+from typing import NamedTuple
 import numpy as np
+from src.geometry import DeckGeometry, build_geometry
 from src.models import SlideNode, LayoutError, ErrorType, Severity
 
 
-def detect_alignment_violations(slides: list[SlideNode], threshold: float = 5.0) -> list[LayoutError]:
+class SortedEdge(NamedTuple):
+    """One edge's values sorted by slide then value, with the gaps between neighbours."""
+    order: np.ndarray
+    values: np.ndarray
+    gaps: np.ndarray
+    slide_breaks: np.ndarray
+
+
+def sort_edge(values: np.ndarray, slide: np.ndarray | None = None) -> SortedEdge:
+    if slide is None:
+        slide = np.zeros(len(values), dtype=np.int64)
+    order = np.lexsort((values, slide))
+    sorted_values = values[order]
+    return SortedEdge(order, sorted_values, np.diff(sorted_values), np.diff(slide[order]) != 0)
+
+
+def group_bounds(edge: SortedEdge, threshold: float) -> tuple[np.ndarray, np.ndarray]:
+    """(start, end) positions in `edge.order` of the near-aligned groups at `threshold`.
+
+    A group starts at the first value not yet grouped and takes every later value
+    of its slide within `threshold` of it, so a group never spreads wider than
+    `threshold` however many small steps it holds.
+    """
+    breaks = np.flatnonzero((edge.gaps > threshold) | edge.slide_breaks) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(edge.order)]))
+    if len(edge.order) == 0:
+        return starts[:0], ends[:0]
+    # Runs of small gaps wider than the threshold are split, each piece anchored on its first value
+    wide = np.flatnonzero(edge.values[ends - 1] - edge.values[starts] > threshold)
+    if len(wide):
+        pieces = [starts]
+        for lo, hi in zip(starts[wide].tolist(), ends[wide].tolist()):
+            values = edge.values[lo:hi]
+            start = 0
+            while (start := int(np.searchsorted(values, values[start] + threshold, side="right"))) < hi - lo:
+                pieces.append(np.array([lo + start]))
+        starts = np.sort(np.concatenate(pieces))
+        ends = np.append(starts[1:], len(edge.order))
+    keep = (ends - starts >= 2) & (edge.values[ends - 1] > edge.values[starts])
+    return starts[keep], ends[keep]
+
+
+def near_aligned_groups(values: np.ndarray, threshold: float, slide: np.ndarray | None = None) -> list[np.ndarray]:
+    """Indices of values that sit within `threshold` of each other but are not all equal.
+
+    Sorting once puts every value next to its nearest neighbours, so groups are
+    runs of sorted values no wider than `threshold` (see `group_bounds`). When `slide` is
+    given, values are grouped per slide in the same sort. Each group is returned once,
+    ordered by slide then value (ties keep input order).
+    """
+    edge = sort_edge(values, slide)
+    return [edge.order[start:end] for start, end in zip(*group_bounds(edge, threshold))]
+
+
+def sorted_edges(geo: DeckGeometry) -> list[tuple[str, np.ndarray, SortedEdge]]:
+    """Each edge's name, per-element values and `SortedEdge`, independent of the threshold."""
+    x, y, w, h = geo.x, geo.y, geo.w, geo.h
+    edges = [
+        (x, "left"), (y, "top"), (x + w, "right"), (y + h, "bottom"),
+        (x + w / 2, "center"), (y + h / 2, "middle"),
+    ]
+    return [(edge_name, values, sort_edge(values, geo.slide)) for values, edge_name in edges]
+
+
+def alignment_errors(geo: DeckGeometry, edges: list[tuple[str, np.ndarray, SortedEdge]], threshold: float) -> list[LayoutError]:
     errors = []
+    if len(geo) < 2:
+        return errors
 
-    for slide in slides:
-        elements = slide.text_elements + slide.image_elements
-        if len(elements) < 2:
-            continue
-
-        lefts = [(e.id, e.bbox.x) for e in elements]
-        tops = [(e.id, e.bbox.y) for e in elements]
-        rights = [(e.id, e.bbox.x2) for e in elements]
-        centers_x = [(e.id, e.bbox.x + e.bbox.width / 2) for e in elements]
-
-        for coords, edge_name in [(lefts, "left"), (tops, "top"), (rights, "right"), (centers_x, "center")]:
-            if len(coords) < 2:
-                continue
-
-            values = np.array([c[1] for c in coords])
-            
-            for i, (elem_id, val) in enumerate(coords):
-                diffs = np.abs(values - val)
-                diffs[i] = np.inf
-                min_diff = np.min(diffs)
-                
-                if 0 < min_diff <= threshold:
-                    closest_idx = np.argmin(diffs)
-                    errors.append(LayoutError(
-                        type=ErrorType.ALIGNMENT,
-                        severity=Severity.INFO,
-                        elements=[elem_id, coords[closest_idx][0]],
-                        message=f"Elements nearly aligned on {edge_name} (off by {min_diff:.1f}px)"
-                    ))
+    element_slide = geo.element_slide_index
+    for edge_name, values, edge in edges:
+        for start, end in zip(*group_bounds(edge, threshold)):
+            group = edge.order[start:end]
+            spread = values[group[-1]] - values[group[0]]
+            errors.append(LayoutError(
+                type=ErrorType.ALIGNMENT,
+                severity=Severity.INFO,
+                elements=[geo.ids[i] for i in group],
+                message=f"Elements nearly aligned on {edge_name} (off by {spread:.1f}px)",
+                slide_index=int(element_slide[group[0]]),
+            ))
 
     return errors
+
+
+def detect_alignment_violations(slides: list[SlideNode], threshold: float = 5.0, geometry: DeckGeometry | None = None) -> list[LayoutError]:
+    geo = geometry if geometry is not None else build_geometry(slides)
+    if len(geo) < 2:
+        return []
+    return alignment_errors(geo, sorted_edges(geo), threshold)
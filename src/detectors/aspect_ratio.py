@@ -1,61 +1,100 @@
-import zipfile
-from io import BytesIO
-from PIL import Image
-from pptx import Presentation
+from typing import Iterable, Iterator
+import numpy as np
+from lxml import etree
+from src.context import DeckContext, xpath
 from src.models import SlideNode, LayoutError, ErrorType, Severity
 
 
-def get_native_dimensions(pptx_path: str) -> dict[str, tuple[float, float]]:
+# Includes pictures nested in groups
+_PICTURES = xpath('./p:cSld/p:spTree//p:pic')
+_PIC_ID = xpath('./p:nvPicPr/p:cNvPr/@id')
+_PIC_EMBED = xpath('./p:blipFill/a:blip/@r:embed')
+_PIC_SRC_RECT = xpath('./p:blipFill/a:srcRect')
+
+
+def crop_dimensions(native: tuple[float, float], src_rect: etree._Element | None) -> tuple[float, float]:
+    """Size of the visible part of an image after `a:srcRect` cropping.
+
+    Edges are in 1/1000ths of a percent; negative values pad rather than crop.
+    """
+    width, height = native
+    if src_rect is None:
+        return width, height
+    left, right = int(src_rect.get('l', 0)), int(src_rect.get('r', 0))
+    top, bottom = int(src_rect.get('t', 0)), int(src_rect.get('b', 0))
+    return width * (1 - (left + right) / 100000), height * (1 - (top + bottom) / 100000)
+
+
+def picture_media(deck: DeckContext, idx: int) -> Iterator[tuple[str, str, etree._Element | None]]:
+    """(shape id, media part, `a:srcRect` or None) of each picture on slide `idx`."""
+    part_name = deck.slide_parts[idx]
+    for pic in _PICTURES(deck.xml(part_name)):
+        shape_id, embed = _PIC_ID(pic), _PIC_EMBED(pic)
+        if not shape_id or not embed:
+            continue
+        target = deck.target(part_name, embed[0])
+        if target is None:
+            continue
+        src_rect = _PIC_SRC_RECT(pic)
+        yield str(int(shape_id[0])), target, src_rect[0] if src_rect else None
+
+
+def get_native_dimensions(deck: DeckContext, slide_indices: Iterable[int] | None = None) -> dict[tuple[int, str], tuple[float, float]]:
+    """Map (slide index, picture shape id) to the visible native size of its image.
+
+    Pictures are resolved through their `r:embed` relationship, so each shape gets
+    the dimensions of the image it actually shows. Only `slide_indices` are
+    scanned when given.
+    """
     dims = {}
-    with zipfile.ZipFile(pptx_path, 'r') as z:
-        for name in z.namelist():
-            if name.startswith("ppt/media/"):
-                try:
-                    data = z.read(name)
-                    img = Image.open(BytesIO(data))
-                    dims[name] = (img.width, img.height)
-                except:
-                    pass
+    if slide_indices is None:
+        slide_indices = range(len(deck.slide_parts))
+    for idx in slide_indices:
+        for shape_id, target, src_rect in picture_media(deck, idx):
+            native = deck.media_dimensions(target)
+            if native is None:
+                continue
+            dims[(idx, shape_id)] = crop_dimensions(native, src_rect)
     return dims
 
 
-def detect_aspect_ratio_violations(slides: list[SlideNode], pptx_path: str, tolerance: float = 0.05) -> list[LayoutError]:
-    errors = []
-    native_dims = get_native_dimensions(pptx_path)
-
-    prs = Presentation(pptx_path)
-    media_map = {}
-
-    for idx, slide in enumerate(prs.slides):
-        for shape in slide.shapes:
-            if hasattr(shape, "image"):
-                try:
-                    blob = shape.image.blob
-                    for name, dims in native_dims.items():
-                        media_map[str(shape.shape_id)] = dims
-                        break
-                except:
-                    pass
-
+def aspect_deltas(slides: list[SlideNode], deck: DeckContext) -> tuple[list[tuple[int, str]], np.ndarray]:
+    """(slide index, image id) of each picture with a known native size, and how far its shown ratio is off."""
+    media_map = get_native_dimensions(deck, [slide.index for slide in slides])
+    images, deltas = [], []
     for slide in slides:
         for img in slide.image_elements:
-            if img.id not in media_map:
+            key = (slide.index, img.id)
+            if key not in media_map:
                 continue
 
-            native_w, native_h = media_map[img.id]
+            native_w, native_h = media_map[key]
             if native_h == 0 or img.rendered_height == 0:
                 continue
 
             native_ratio = native_w / native_h
             rendered_ratio = img.rendered_width / img.rendered_height
-            delta = abs(native_ratio - rendered_ratio)
+            images.append(key)
+            deltas.append(abs(native_ratio - rendered_ratio))
+    return images, np.array(deltas, dtype=np.float64)
 
-            if delta > tolerance:
-                errors.append(LayoutError(
-                    type=ErrorType.ASPECT_RATIO,
-                    severity=Severity.WARNING,
-                    elements=[img.id],
-                    message=f"Image distorted (ratio diff: {delta:.2f})"
-                ))
 
+def aspect_ratio_errors(images: list[tuple[int, str]], deltas: np.ndarray, tolerance: float) -> list[LayoutError]:
+    errors = []
+    for i in np.flatnonzero(deltas > tolerance):
+        slide_index, image_id = images[i]
+        errors.append(LayoutError(
+            type=ErrorType.ASPECT_RATIO,
+            severity=Severity.WARNING,
+            elements=[image_id],
+            slide_index=slide_index,
+            message=f"Image distorted (ratio diff: {deltas[i]:.2f})"
+        ))
     return errors
+
+
+def detect_aspect_ratio_violations(slides: list[SlideNode], deck: str | DeckContext, tolerance: float = 0.05) -> list[LayoutError]:
+    if not isinstance(deck, DeckContext):
+        with DeckContext(deck) as ctx:
+            return detect_aspect_ratio_violations(slides, ctx, tolerance)
+    return aspect_ratio_errors(*aspect_deltas(slides, deck), tolerance)
@@ -1,32 +1,89 @@
-from collections import Counter
+import numpy as np
+from src.geometry import DeckGeometry, build_geometry
 from src.models import SlideNode, LayoutError, ErrorType, Severity
 
 
-def detect_hierarchy_violations(slides: list[SlideNode]) -> list[LayoutError]:
-    errors = []
-    all_styles = []
+def font_size_stats(geo: DeckGeometry) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """(ids, slide indices, font sizes) of every text element with a font size."""
+    styled = np.flatnonzero(np.nan_to_num(geo.font_size) != 0)
+    return [geo.ids[i] for i in styled], geo.element_slide_index[styled], geo.font_size[styled]
+
+
+def hierarchy_violations_from_stats(ids: list[str], slide_indices: np.ndarray, sizes: np.ndarray) -> list[LayoutError]:
+    if len(sizes) < 5:
+        return []
+
+    unique_sizes, counts = np.unique(sizes, return_counts=True)
+    common_sizes = unique_sizes[counts >= 2]
+    if len(common_sizes) == 0:
+        return []
+    return _near_miss_errors(ids, slide_indices, sizes, common_sizes)
 
-    for slide in slides:
-        for elem in slide.text_elements:
-            if elem.style.font_size:
-                all_styles.append((elem.id, elem.slide_index, elem.style.font_size))
 
-    if len(all_styles) < 5:
+def _near_miss_errors(ids: list[str], slide_indices: np.ndarray, sizes: np.ndarray, common_sizes: np.ndarray) -> list[LayoutError]:
+    """Errors for elements whose size is not common but within 2pt of a common one."""
+    errors = []
+    if len(sizes) == 0:
         return errors
 
-    sizes = [s[2] for s in all_styles]
-    size_counts = Counter(sizes)
-    common_sizes = {size for size, count in size_counts.items() if count >= 2}
-
-    for elem_id, slide_idx, font_size in all_styles:
-        if font_size not in common_sizes:
-            closest = min(common_sizes, key=lambda x: abs(x - font_size), default=None)
-            if closest and abs(font_size - closest) <= 2:
-                errors.append(LayoutError(
-                    type=ErrorType.HIERARCHY,
-                    severity=Severity.WARNING,
-                    elements=[elem_id],
-                    message=f"Font size {font_size}pt is close but not matching {closest}pt"
-                ))
+    # Nearest common size for every styled element; ties go to the smaller size
+    right = np.clip(np.searchsorted(common_sizes, sizes), 0, len(common_sizes) - 1)
+    left = np.clip(right - 1, 0, len(common_sizes) - 1)
+    use_left = np.abs(sizes - common_sizes[left]) <= np.abs(sizes - common_sizes[right])
+    closest = np.where(use_left, common_sizes[left], common_sizes[right])
+
+    is_common = np.isin(sizes, common_sizes)
+    flagged = ~is_common & (closest != 0) & (np.abs(sizes - closest) <= 2)
+
+    for i in np.flatnonzero(flagged):
+        errors.append(LayoutError(
+            type=ErrorType.HIERARCHY,
+            severity=Severity.WARNING,
+            elements=[ids[i]],
+            slide_index=int(slide_indices[i]),
+            message=f"Font size {float(sizes[i])}pt is close but not matching {float(closest[i])}pt"
+        ))
 
     return errors
+
+
+class FontSizeStats:
+    """Running font-size counts for checking a deck whose slides arrive one at a time.
+
+    Only sizes used once can be flagged, so per size this keeps a count and its
+    first element: memory grows with the number of distinct sizes, not elements.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self._sizes: dict[float, list] = {}
+
+    def add(self, ids: list[str], slide_indices: np.ndarray, sizes: np.ndarray) -> None:
+        for elem_id, slide_index, size in zip(ids, slide_indices.tolist(), sizes.tolist()):
+            entry = self._sizes.get(size)
+            if entry is None:
+                self._sizes[size] = [1, elem_id, slide_index]
+            else:
+                entry[0] += 1
+        self.total += len(sizes)
+
+    def violations(self) -> list[LayoutError]:
+        """Same findings as `hierarchy_violations_from_stats` over every added element."""
+        if self.total < 5:
+            return []
+        common_sizes = np.array(sorted(size for size, (count, _, _) in self._sizes.items() if count >= 2))
+        if len(common_sizes) == 0:
+            return []
+        # Insertion order is first occurrence, i.e. the order of the singletons
+        singles = [(elem_id, slide_index, size) for size, (count, elem_id, slide_index) in self._sizes.items() if count == 1]
+        return _near_miss_errors(
+            [elem_id for elem_id, _, _ in singles],
+            np.array([slide_index for _, slide_index, _ in singles], dtype=np.int64),
+            np.array([size for _, _, size in singles], dtype=np.float64),
+            common_sizes,
+        )
+
+
+def detect_hierarchy_violations(slides: list[SlideNode], geometry: DeckGeometry | None = None) -> list[LayoutError]:
+    geo = geometry if geometry is not None else build_geometry(slides)
+    return hierarchy_violations_from_stats(*font_size_stats(geo))
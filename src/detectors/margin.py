@@ -1,39 +1,51 @@
+import numpy as np
+from src.geometry import DeckGeometry, build_geometry
 from src.models import SlideNode, LayoutError, ErrorType, Severity
 
 
-def detect_margin_violations(slides: list[SlideNode], margin_pct: float = 0.05) -> list[LayoutError]:
-    errors = []
+def outside_safe_zone(geo: DeckGeometry, margin_pct: float) -> np.ndarray:
+    """Elements reaching into the `margin_pct` band along any slide edge."""
+    slide_w, slide_h = geo.slide_width[geo.slide], geo.slide_height[geo.slide]
+    margin_x, margin_y = slide_w * margin_pct, slide_h * margin_pct
+    return (
+        (geo.x < margin_x) | (geo.x2 > slide_w - margin_x)
+        | (geo.y < margin_y) | (geo.y2 > slide_h - margin_y)
+    )
+
 
-    for slide in slides:
-        margin_x = slide.width * margin_pct
-        margin_y = slide.height * margin_pct
-        x_min, x_max = margin_x, slide.width - margin_x
-        y_min, y_max = margin_y, slide.height - margin_y
-
-        all_elements = slide.text_elements + slide.image_elements
-        total_area = 0
-
-        for elem in all_elements:
-            bbox = elem.bbox
-            total_area += bbox.width * bbox.height
-
-            if bbox.x < x_min or bbox.x2 > x_max or bbox.y < y_min or bbox.y2 > y_max:
-                errors.append(LayoutError(
-                    type=ErrorType.MARGIN,
-                    severity=Severity.WARNING,
-                    elements=[elem.id],
-                    message=f"Element outside safe zone (5% margin)"
-                ))
-
-        slide_area = slide.width * slide.height
-        coverage = total_area / slide_area if slide_area > 0 else 0
-
-        if coverage > 0.7:
-            errors.append(LayoutError(
-                type=ErrorType.MARGIN,
-                severity=Severity.INFO,
-                elements=[],
-                message=f"Slide {slide.index} is overcrowded ({coverage:.0%} coverage)"
-            ))
+def overcrowded_slides(geo: DeckGeometry) -> tuple[np.ndarray, np.ndarray]:
+    """Positions of slides whose elements cover more than 70% of them, and every slide's coverage."""
+    total_area = np.bincount(geo.slide, weights=geo.w * geo.h, minlength=len(geo.slide_index))
+    slide_area = geo.slide_width * geo.slide_height
+    coverage = np.divide(total_area, slide_area, out=np.zeros_like(total_area), where=slide_area > 0)
+    return np.flatnonzero(coverage > 0.7), coverage
+
+
+def margin_errors(geo: DeckGeometry, outside: np.ndarray, crowded: tuple[np.ndarray, np.ndarray], margin_pct: float) -> list[LayoutError]:
+    errors = []
+    element_slide = geo.element_slide_index
+    for i in np.flatnonzero(outside):
+        errors.append(LayoutError(
+            type=ErrorType.MARGIN,
+            severity=Severity.WARNING,
+            elements=[geo.ids[i]],
+            slide_index=int(element_slide[i]),
+            message=f"Element outside safe zone ({margin_pct * 100:g}% margin)"
+        ))
+
+    positions, coverage = crowded
+    for pos in positions:
+        errors.append(LayoutError(
+            type=ErrorType.MARGIN,
+            severity=Severity.INFO,
+            elements=[],
+            slide_index=int(geo.slide_index[pos]),
+            message=f"Slide {int(geo.slide_index[pos])} is overcrowded ({coverage[pos]:.0%} coverage)"
+        ))
 
     return errors
+
+
+def detect_margin_violations(slides: list[SlideNode], margin_pct: float = 0.05, geometry: DeckGeometry | None = None) -> list[LayoutError]:
+    geo = geometry if geometry is not None else build_geometry(slides)
+    return margin_errors(geo, outside_safe_zone(geo, margin_pct), overcrowded_slides(geo), margin_pct)
@@ -0,0 +1,103 @@
+import numpy as np
+from src.geometry import DeckGeometry, build_geometry
+from src.models import SlideNode, LayoutError, ErrorType, Severity
+
+
+def _sweep_candidates(start: np.ndarray, end: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Pairs whose [start, end) intervals intersect, via one sort along the sweep axis.
+
+    After sorting by start, the intervals that begin before interval i ends are a
+    contiguous run right after it, so candidates come out in O(n log n + k).
+    """
+    order = np.argsort(start, kind="stable")
+    sorted_start = start[order]
+    first = np.arange(1, len(order) + 1)
+    counts = np.maximum(np.searchsorted(sorted_start, end[order], side="left") - first, 0)
+    run_offsets = np.cumsum(counts) - counts
+    i = np.repeat(np.arange(len(order)), counts)
+    j = np.repeat(first - run_offsets, counts) + np.arange(counts.sum())
+    return order[i], order[j]
+
+
+def _candidate_count(start: np.ndarray, end: np.ndarray) -> int:
+    sorted_start = np.sort(start)
+    stop = np.searchsorted(sorted_start, np.sort(end), side="left")
+    return int(np.maximum(stop - np.arange(1, len(start) + 1), 0).sum())
+
+
+def find_overlaps(x: np.ndarray, y: np.ndarray, w: np.ndarray, h: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Overlapping pairs (i, j) on one slide and their intersection areas.
+
+    Sweeps along whichever axis produces fewer candidate pairs, so rows of
+    full-width text boxes or columns of full-height shapes stay sub-quadratic.
+    """
+    x2, y2 = x + w, y + h
+    if _candidate_count(y, y2) < _candidate_count(x, x2):
+        i, j = _sweep_candidates(y, y2)
+    else:
+        i, j = _sweep_candidates(x, x2)
+    inter_w = np.minimum(x2[i], x2[j]) - np.maximum(x[i], x[j])
+    inter_h = np.minimum(y2[i], y2[j]) - np.maximum(y[i], y[j])
+    hit = (inter_w > 0) & (inter_h > 0)
+    return i[hit], j[hit], inter_w[hit] * inter_h[hit]
+
+
+def overlap_pairs(geo: DeckGeometry) -> list[tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """(slide position, i, j, intersection area, smaller area) of the overlapping pairs on each slide."""
+    area = geo.w * geo.h
+    bounds = np.searchsorted(geo.slide, np.arange(len(geo.slide_index) + 1))
+    pairs = []
+    for pos in range(len(geo.slide_index)):
+        lo, hi = bounds[pos], bounds[pos + 1]
+        if hi - lo < 2:
+            continue
+        i, j, inter = find_overlaps(geo.x[lo:hi], geo.y[lo:hi], geo.w[lo:hi], geo.h[lo:hi])
+        i, j = i + lo, j + lo
+        pairs.append((pos, i, j, inter, np.minimum(area[i], area[j])))
+    return pairs
+
+
+def overlapping(inter: np.ndarray, smaller: np.ndarray, min_overlap: float) -> np.ndarray:
+    return (smaller > 0) & (inter >= min_overlap * np.where(smaller > 0, smaller, 1))
+
+
+def overlap_errors(geo: DeckGeometry, pairs: list[tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]], min_overlap: float) -> list[LayoutError]:
+    errors = []
+    for pos, i, j, inter, smaller in pairs:
+        keep = overlapping(inter, smaller, min_overlap)
+        i, j, fraction = i[keep], j[keep], inter[keep] / smaller[keep]
+
+        # Order each pair as (lower, upper) in z-order
+        swap = geo.z[i] > geo.z[j]
+        lower, upper = np.where(swap, j, i), np.where(swap, i, j)
+        order = np.lexsort((geo.z[upper], geo.z[lower]))
+
+        for k in order:
+            a, b = lower[k], upper[k]
+            # Empty text shapes (cards, filled rectangles) hide no text
+            text_a, text_b = geo.has_text[a], geo.has_text[b]
+            if text_a or (text_b and geo.z[a] == geo.z[b]):
+                severity = Severity.CRITICAL
+            elif text_b:
+                severity = Severity.WARNING
+            else:
+                severity = Severity.INFO
+            errors.append(LayoutError(
+                type=ErrorType.OVERLAP,
+                severity=severity,
+                elements=[geo.ids[a], geo.ids[b]],
+                slide_index=int(geo.slide_index[pos]),
+                message=f"Elements overlap ({fraction[k]:.0%} of the smaller element)"
+            ))
+
+    return errors
+
+
+def detect_overlap_violations(slides: list[SlideNode], min_overlap: float = 0.05, geometry: DeckGeometry | None = None) -> list[LayoutError]:
+    """Flag element pairs whose intersection covers at least `min_overlap` of the smaller one.
+
+    Text lying underneath another shape is CRITICAL; text drawn on top of a picture
+    or shape is a WARNING, and overlaps of pictures and shapes without text are INFO.
+    """
+    geo = geometry if geometry is not None else build_geometry(slides)
+    return overlap_errors(geo, overlap_pairs(geo), min_overlap)
@@ -0,0 +1,293 @@
+"""Detector registry and the engine that runs the registered detectors.
+
+A detector declares its scope and what it reads:
+
+- "slide" detectors report findings that depend on one slide alone, so they can
+  run on any batch of slides (the result cache, streaming and diff rely on it).
+  `run(inputs, **params)` returns their findings for a batch.
+- "deck" detectors need every slide. `start()` makes an accumulator, `add(state,
+  geometry)` folds a batch of slides into it and `finish(state, **params)`
+  returns findings, so slides can arrive one batch at a time.
+
+All detectors of a batch read the same `DeckGeometry`, built in one pass over
+the parsed slides. `kinds` are the element kinds a detector looks at; it is
+skipped for batches without any. `needs` names inputs beyond geometry:
+"bitmaps" are rendered slides, built once per batch when `config["render"]` is
+set and an enabled detector needs them. `params` maps each keyword argument to
+its default; a config entry of the same name overrides it.
+
+A slide detector may split `run` into `measure(inputs)`, the threshold-independent
+work, and `judge(inputs, measurements, **params)`, the findings at given
+thresholds; with `count(inputs, measurements, **params)` giving their number
+without building them, `src.sweep` evaluates a grid of thresholds from one
+measurement.
+
+`stamp(**params)`, if given, is anything else a detector's findings depend on
+(e.g. an index's generation); it goes into result cache keys.
+
+`config["detectors"]` names the detectors to run (None runs every registered
+one) and `config["detector_workers"]` above 1 runs a batch's detectors, and the
+deck detectors' `finish` steps, in a thread pool; numpy releases the GIL inside
+most array operations.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+import numpy as np
+from src.cache import BitmapCache
+from src.context import DeckContext
+from src.detectors.alignment import alignment_errors, group_bounds, sorted_edges
+from src.detectors.aspect_ratio import aspect_deltas, aspect_ratio_errors
+from src.detectors.contrast import contrast_errors, contrast_ratios
+from src.detectors.hierarchy import FontSizeStats, font_size_stats
+from src.detectors.margin import margin_errors, outside_safe_zone, overcrowded_slides
+from src.detectors.overlap import overlap_errors, overlap_pairs, overlapping
+from src.geometry import KIND_IMAGE, KIND_TEXT, DeckGeometry, build_geometry
+from src.metrics import NULL_METRICS
+from src.models import LayoutError, SlideNode
+from src.records import SlideRecord
+
+SCOPES = ("slide", "deck")
+KINDS = {"text": KIND_TEXT, "image": KIND_IMAGE}
+
+
+class DetectorInput(NamedTuple):
+    slides: list[SlideNode | SlideRecord]
+    geometry: DeckGeometry
+    deck: DeckContext
+    bitmaps: Optional[dict[int, np.ndarray]]
+
+
+@dataclass(frozen=True)
+class Detector:
+    name: str
+    scope: str = "slide"
+    kinds: tuple[str, ...] = ("text", "image")
+    needs: tuple[str, ...] = ()
+    params: dict[str, Any] = field(default_factory=dict)
+    run: Optional[Callable[..., list[LayoutError]]] = None
+    measure: Optional[Callable[[DetectorInput], Any]] = None
+    judge: Optional[Callable[..., list[LayoutError]]] = None
+    count: Optional[Callable[..., int]] = None
+    stamp: Optional[Callable[..., Any]] = None
+    start: Optional[Callable[[], Any]] = None
+    add: Optional[Callable[[Any, DeckGeometry], None]] = None
+    finish: Optional[Callable[..., list[LayoutError]]] = None
+
+
+DETECTORS: dict[str, Detector] = {}
+
+
+def register_detector(detector: Detector) -> Detector:
+    """Add (or replace) a detector; findings come out in registration order."""
+    if detector.scope not in SCOPES:
+        raise ValueError(f"Unknown detector scope {detector.scope!r}, expected one of {SCOPES}")
+    if unknown := set(detector.kinds) - set(KINDS):
+        raise ValueError(f"Unknown element kinds {sorted(unknown)}, expected some of {sorted(KINDS)}")
+    if detector.scope == "slide" and detector.run is None and detector.measure and detector.judge:
+        measure, judge = detector.measure, detector.judge
+        detector = replace(detector, run=lambda inputs, **params: judge(inputs, measure(inputs), **params))
+    required = ("run",) if detector.scope == "slide" else ("start", "add", "finish")
+    if missing := [name for name in required if getattr(detector, name) is None]:
+        raise ValueError(f"{detector.scope} detector {detector.name!r} needs {', '.join(missing)}")
+    DETECTORS[detector.name] = detector
+    return detector
+
+
+def enabled_detectors(config: dict, scope: str) -> list[Detector]:
+    names = config.get("detectors")
+    if names is None:
+        return [d for d in DETECTORS.values() if d.scope == scope]
+    if unknown := set(names) - set(DETECTORS):
+        raise ValueError(f"Unknown detectors {sorted(unknown)}, expected some of {sorted(DETECTORS)}")
+    return [d for d in DETECTORS.values() if d.scope == scope and d.name in names]
+
+
+def detector_params(detector: Detector, config: dict) -> dict[str, Any]:
+    return {name: config.get(name, default) for name, default in detector.params.items()}
+
+
+def cache_stamps(config: dict) -> dict[str, Any]:
+    """Stamps of the enabled detectors that have one, for result cache keys."""
+    return {
+        d.name: d.stamp(**detector_params(d, config))
+        for scope in SCOPES for d in enabled_detectors(config, scope) if d.stamp is not None
+    }
+
+
+@lru_cache(maxsize=None)
+def _bitmap_cache(directory: str) -> BitmapCache:
+    return BitmapCache(directory)
+
+
+def _render_bitmaps(slides: list, deck: DeckContext, config: dict, metrics) -> dict[int, np.ndarray]:
+    from src.render import slide_bitmaps
+
+    with metrics.stage("render") as stage:
+        cache = _bitmap_cache(config["render_cache"]) if config.get("render_cache") else None
+        bitmaps = slide_bitmaps(deck, slides, config.get("render_scale", 0.5), cache, config.get("render_backend", "pil"))
+        stage.elements += len(bitmaps)
+    return bitmaps
+
+
+def _reads(detector: Detector, kinds: set[int]) -> bool:
+    return any(KINDS[kind] in kinds for kind in detector.kinds)
+
+
+def readers(detectors: list[Detector], geometry: DeckGeometry) -> list[Detector]:
+    """The detectors reading an element kind present in `geometry`."""
+    kinds = set(np.unique(geometry.kind).tolist())
+    return [d for d in detectors if _reads(d, kinds)]
+
+
+def detector_input(detectors: list[Detector], slides: list, deck: DeckContext, config: dict, geometry: DeckGeometry, metrics=NULL_METRICS) -> DetectorInput:
+    """What `detectors` read for a batch of slides; bitmaps only if one needs them and rendering is on."""
+    render = config.get("render") and any("bitmaps" in d.needs for d in detectors)
+    return DetectorInput(slides, geometry, deck, _render_bitmaps(slides, deck, config, metrics) if render else None)
+
+
+def _timed(step: Callable[..., list[LayoutError]], arg: Any, params: dict) -> tuple[list[LayoutError], float]:
+    start = perf_counter()
+    errors = step(arg, **params)
+    return errors, perf_counter() - start
+
+
+def iter_slide_findings(
+    slides: list[SlideNode | SlideRecord],
+    deck: DeckContext,
+    config: dict,
+    geometry: DeckGeometry | None = None,
+    metrics=NULL_METRICS,
+) -> Iterator[list[LayoutError]]:
+    """Findings of each enabled slide-scope detector for a batch of slides, one list per detector."""
+    if geometry is None:
+        with metrics.stage("geometry") as stage:
+            geometry = build_geometry(slides)
+            stage.elements += len(geometry)
+    detectors = readers(enabled_detectors(config, "slide"), geometry)
+    inputs = detector_input(detectors, slides, deck, config, geometry, metrics)
+
+    workers = min(config.get("detector_workers", 1), len(detectors))
+    if workers <= 1:
+        for detector in detectors:
+            with metrics.stage(f"detector.{detector.name}") as stage:
+                errors = detector.run(inputs, **detector_params(detector, config))
+                stage.elements += len(geometry)
+                stage.findings += len(errors)
+            yield errors
+        return
+
+    # Stages would overlap, so worker threads time themselves
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_timed, d.run, inputs, detector_params(d, config)) for d in detectors]
+        for detector, future in zip(detectors, futures):
+            errors, seconds = future.result()
+            metrics.record(f"detector.{detector.name}", seconds, elements=len(geometry), findings=len(errors))
+            yield errors
+
+
+def deck_accumulators(config: dict) -> list[tuple[Detector, Any]]:
+    """A fresh accumulator for each enabled deck-scope detector."""
+    return [(detector, detector.start()) for detector in enabled_detectors(config, "deck")]
+
+
+def accumulate(accumulators: list[tuple[Detector, Any]], geometry: DeckGeometry) -> None:
+    kinds = set(np.unique(geometry.kind).tolist())
+    for detector, state in accumulators:
+        if _reads(detector, kinds):
+            detector.add(state, geometry)
+
+
+def iter_deck_findings(accumulators: list[tuple[Detector, Any]], config: dict, elements: int = 0, metrics=NULL_METRICS) -> Iterator[list[LayoutError]]:
+    """Findings of each deck-scope detector from what its accumulator has seen, one list per detector."""
+    workers = min(config.get("detector_workers", 1), len(accumulators))
+    if workers <= 1:
+        for detector, state in accumulators:
+            with metrics.stage(f"detector.{detector.name}") as stage:
+                errors = detector.finish(state, **detector_params(detector, config))
+                stage.elements += elements
+                stage.findings += len(errors)
+            yield errors
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_timed, d.finish, state, detector_params(d, config)) for d, state in accumulators]
+        for (detector, _), future in zip(accumulators, futures):
+            errors, seconds = future.result()
+            metrics.record(f"detector.{detector.name}", seconds, elements=elements, findings=len(errors))
+            yield errors
+
+
+register_detector(Detector(
+    name="hierarchy",
+    scope="deck",
+    kinds=("text",),
+    start=FontSizeStats,
+    add=lambda stats, geometry: stats.add(*font_size_stats(geometry)),
+    finish=FontSizeStats.violations,
+))
+register_detector(Detector(
+    name="margin",
+    params={"margin_pct": 0.05},
+    measure=lambda i: overcrowded_slides(i.geometry),
+    judge=lambda i, crowded, margin_pct: margin_errors(i.geometry, outside_safe_zone(i.geometry, margin_pct), crowded, margin_pct),
+    count=lambda i, crowded, margin_pct: int(outside_safe_zone(i.geometry, margin_pct).sum()) + len(crowded[0]),
+))
+register_detector(Detector(
+    name="contrast",
+    kinds=("text",),
+    needs=("bitmaps",),
+    params={"min_ratio": 4.5},
+    measure=lambda i: contrast_ratios(i.slides, i.geometry, i.bitmaps),
+    judge=lambda i, m, min_ratio: contrast_errors(i.geometry, *m, min_ratio),
+    count=lambda i, m, min_ratio: int((m[1] < min_ratio).sum()),
+))
+register_detector(Detector(
+    name="aspect_ratio",
+    kinds=("image",),
+    params={"tolerance": 0.05},
+    measure=lambda i: aspect_deltas(i.slides, i.deck),
+    judge=lambda i, m, tolerance: aspect_ratio_errors(*m, tolerance),
+    count=lambda i, m, tolerance: int((m[1] > tolerance).sum()),
+))
+register_detector(Detector(
+    name="alignment",
+    params={"threshold": 5.0},
+    measure=lambda i: sorted_edges(i.geometry),
+    judge=lambda i, edges, threshold: alignment_errors(i.geometry, edges, threshold),
+    count=lambda i, edges, threshold: 0 if len(i.geometry) < 2 else sum(len(group_bounds(edge, threshold)[0]) for _, _, edge in edges),
+))
+register_detector(Detector(
+    name="overlap",
+    params={"min_overlap": 0.05},
+    measure=lambda i: overlap_pairs(i.geometry),
+    judge=lambda i, pairs, min_overlap: overlap_errors(i.geometry, pairs, min_overlap),
+    count=lambda i, pairs, min_overlap: sum(int(overlapping(inter, smaller, min_overlap).sum()) for _, _, _, inter, smaller in pairs),
+))
+
+
+def _corpus_style(inputs: DetectorInput, style_index: Optional[str], min_share: float, style_template: Optional[str]) -> list[LayoutError]:
+    if not style_index:
+        return []
+    from src.style_index import check_slides, open_index
+
+    return check_slides(inputs.slides, inputs.deck, open_index(style_index), min_share, style_template)
+
+
+def _corpus_style_stamp(style_index: Optional[str], **_) -> Optional[int]:
+    if not style_index:
+        return None
+    from src.style_index import open_index
+
+    return open_index(style_index).generation
+
+
+register_detector(Detector(
+    name="corpus_style",
+    kinds=("text",),
+    params={"style_index": None, "min_share": 0.01, "style_template": None},
+    run=_corpus_style,
+    stamp=_corpus_style_stamp,
+))
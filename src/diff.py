@@ -0,0 +1,230 @@
+"""Findings that changed between two revisions of a deck.
+
+    python -m src.diff old.pptx new.pptx            # JSON summary and findings
+    python -m src.diff old.pptx new.pptx --ndjson   # one line per finding, with "status"
+
+Slides are matched by `slide_digest`, a hash of their content and everything they
+inherit, so matching reads each slide part once and never parses it. A matched
+slide parses and checks identically in both decks, so only unmatched slides are
+re-analysed on the old side. Unmatched slides are paired by part name (PowerPoint
+keeps `slideN.xml` across edits), and shapes on a pair by shape id, then by a
+fingerprint of kind, text and position. Findings are keyed by type, severity,
+slide and shapes in the new deck's terms, and reported as added, resolved or
+unchanged.
+"""
+import argparse
+import json
+import re
+import sys
+from dataclasses import replace
+from typing import Iterator
+import numpy as np
+from src.cache import slide_digest
+from src.context import DeckContext
+from src.detectors.registry import accumulate, deck_accumulators, iter_deck_findings
+from src.geometry import DeckGeometry, build_geometry
+from src.main import DEFAULT_CONFIG, run_slide_detectors
+from src.models import LayoutError
+from src.parsers.lxml_parser import iter_slides_lxml
+from src.records import SlideRecord
+from src.reporter import finding_record, iter_findings, write_ndjson
+
+
+def match_slides(old: DeckContext, new: DeckContext) -> dict[int, int]:
+    """New slide index -> old slide index for slides whose content is unchanged."""
+    by_digest: dict[str, list[int]] = {}
+    for idx in reversed(range(len(old.slide_parts))):
+        by_digest.setdefault(slide_digest(old, idx), []).append(idx)
+    matches = {}
+    for idx in range(len(new.slide_parts)):
+        candidates = by_digest.get(slide_digest(new, idx))
+        if candidates:
+            # Duplicated slides pair up in order
+            matches[idx] = candidates.pop()
+    return matches
+
+
+def pair_changed(old: DeckContext, new: DeckContext, matches: dict[int, int]) -> dict[int, int]:
+    """New slide index -> old slide index for edited slides, paired by part name."""
+    matched_old = set(matches.values())
+    old_by_part = {part: idx for idx, part in enumerate(old.slide_parts) if idx not in matched_old}
+    pairs = {}
+    for idx, part in enumerate(new.slide_parts):
+        if idx not in matches and part in old_by_part:
+            pairs[idx] = old_by_part.pop(part)
+    return pairs
+
+
+def _fingerprint(element, kind: str) -> tuple:
+    bbox = element.bbox
+    return kind, getattr(element, "text", None), round(bbox.x), round(bbox.y), round(bbox.width), round(bbox.height)
+
+
+def match_shapes(old: SlideRecord, new: SlideRecord) -> dict[str, str]:
+    """Old element id -> new element id on a pair of slides: same id and kind, else same fingerprint."""
+    new_kinds = {e.id: "text" for e in new.text_elements}
+    new_kinds.update((e.id, "image") for e in new.image_elements)
+    by_fingerprint = {_fingerprint(e, "text"): e.id for e in new.text_elements}
+    by_fingerprint.update((_fingerprint(e, "image"), e.id) for e in new.image_elements)
+
+    mapping = {}
+    for kind, elements in (("text", old.text_elements), ("image", old.image_elements)):
+        for e in elements:
+            if new_kinds.get(e.id) == kind:
+                mapping[e.id] = e.id
+            else:
+                target = by_fingerprint.get(_fingerprint(e, kind))
+                if target is not None:
+                    mapping[e.id] = target
+    return mapping
+
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _finding_key(error: LayoutError, slide: object, element_ids) -> tuple:
+    # Measured values in the message (ratios, percentages) may drift between
+    # revisions without making it a different finding
+    return error.type, error.severity, slide, tuple(sorted(element_ids, key=str)), _NUMBER.sub("#", error.message)
+
+
+def _slide_findings(slides: list[SlideRecord], deck: DeckContext, config: dict) -> list[tuple[int, LayoutError]]:
+    if not slides:
+        return []
+    return list(iter_findings([run_slide_detectors(slides, deck, config)], slides))
+
+
+def _deck_findings(*geometries: DeckGeometry, config: dict) -> list[tuple[int, LayoutError]]:
+    accumulators = deck_accumulators(config)
+    for geometry in geometries:
+        accumulate(accumulators, geometry)
+    return list(iter_findings(iter_deck_findings(accumulators, config), []))
+
+
+def _revision_findings(old: DeckContext, new: DeckContext, matches: dict[int, int], config: dict, include_unchanged: bool):
+    """Parse the new deck and the old deck's unmatched slides; check only what is needed."""
+    changed_old = sorted(set(range(len(old.slide_parts))) - set(matches.values()))
+    new_slides = list(iter_slides_lxml(new))
+    old_slides = list(iter_slides_lxml(old, changed_old))
+    changed_new = [slide for slide in new_slides if slide.index not in matches]
+    unchanged_new = [slide for slide in new_slides if slide.index in matches]
+
+    old_findings = _slide_findings(old_slides, old, config)
+    new_findings = _slide_findings(changed_new, new, config)
+    if include_unchanged:
+        new_findings.extend(_slide_findings(unchanged_new, new, config))
+    # Deck-scope detectors see the old deck as its changed slides plus the new
+    # side's matched ones, renumbered to their old positions
+    unchanged_geometry = build_geometry(unchanged_new)
+    unchanged_geometry = replace(unchanged_geometry, slide_index=np.array([matches[idx] for idx in unchanged_geometry.slide_index.tolist()], dtype=np.int64))
+    old_deck_findings = _deck_findings(build_geometry(old_slides), unchanged_geometry, config=config)
+    new_deck_findings = _deck_findings(build_geometry(new_slides), config=config)
+    return (
+        {slide.index: slide for slide in old_slides},
+        new_slides,
+        old_findings + old_deck_findings,
+        [(idx, error, False) for idx, error in new_findings] + [(idx, error, True) for idx, error in new_deck_findings],
+    )
+
+
+def iter_diff(
+    old_path: str,
+    new_path: str,
+    config: dict | None = None,
+    include_unchanged: bool = True,
+) -> Iterator[dict]:
+    """Finding records of both revisions with "status": "added", "resolved" or "unchanged".
+
+    Added and unchanged findings carry the new deck's path and slide index,
+    resolved ones the old deck's; a final "summary" record counts slides and
+    findings. The whole new deck is parsed (hierarchy needs every font size)
+    but only unmatched old slides are, and with `include_unchanged=False`
+    unchanged slides are not checked.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    with DeckContext(old_path) as old, DeckContext(new_path) as new:
+        matches = match_slides(old, new)
+        pairs = pair_changed(old, new, matches)
+        old_slides, new_slides, old_errors, new_errors = _revision_findings(old, new, matches, config, include_unchanged)
+
+        shape_maps = {new_idx: match_shapes(old_slides[old_idx], new_slides[new_idx]) for new_idx, old_idx in pairs.items()}
+        paired_new = {old_idx: new_idx for new_idx, old_idx in pairs.items()}
+        matched_new = {old_idx: new_idx for new_idx, old_idx in matches.items()}
+
+        def old_key(error: LayoutError, idx: int) -> tuple:
+            if idx in matched_new:
+                return _finding_key(error, matched_new[idx], error.elements)
+            if idx in paired_new:
+                mapping = shape_maps[paired_new[idx]]
+                return _finding_key(error, paired_new[idx], (mapping.get(e, ("old", e)) for e in error.elements))
+            return _finding_key(error, ("old", idx), error.elements)
+
+        old_findings = {}
+        for idx, error in old_errors:
+            old_findings.setdefault(old_key(error, idx), (idx, error))
+        new_findings = {}
+        for idx, error, deck_scope in new_errors:
+            new_findings.setdefault(_finding_key(error, idx, error.elements), (idx, error, deck_scope))
+
+        counts = {"added": 0, "resolved": 0, "unchanged": 0}
+        for key, (idx, error, deck_scope) in new_findings.items():
+            # Old slide-scope findings on matched slides are never computed: they are the new ones
+            unchanged = key in old_findings or (idx in matches and not deck_scope)
+            status = "unchanged" if unchanged else "added"
+            counts[status] += 1
+            if status == "added" or include_unchanged:
+                yield {"status": status, **finding_record(error, idx, new_path)}
+        for key, (idx, error) in old_findings.items():
+            if key not in new_findings:
+                counts["resolved"] += 1
+                yield {"status": "resolved", **finding_record(error, idx, old_path)}
+
+        yield {
+            "status": "summary",
+            "old": old_path,
+            "new": new_path,
+            "slides": {
+                "unchanged": len(matches),
+                "moved": sum(1 for new_idx, old_idx in matches.items() if new_idx != old_idx),
+                "changed": len(pairs),
+                "added": len(new.slide_parts) - len(matches) - len(pairs),
+                "removed": len(old.slide_parts) - len(matches) - len(pairs),
+            },
+            "findings": counts,
+        }
+
+
+def diff_decks(
+    old_path: str,
+    new_path: str,
+    config: dict | None = None,
+    include_unchanged: bool = True,
+) -> dict:
+    """Summary plus "added", "resolved" and "unchanged" finding lists (see `iter_diff`)."""
+    result = {"added": [], "resolved": [], "unchanged": []}
+    for record in iter_diff(old_path, new_path, config, include_unchanged):
+        status = record.pop("status")
+        if status == "summary":
+            result = {**record, **result}
+        else:
+            result[status].append(record)
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Report findings added, resolved or unchanged between two revisions of a deck.")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--ndjson", action="store_true", help="one JSON line per finding, then a summary line")
+    parser.add_argument("--no-unchanged", dest="unchanged", action="store_false", help="skip unchanged findings (and checking unchanged slides)")
+    args = parser.parse_args(argv)
+
+    if args.ndjson:
+        write_ndjson(iter_diff(args.old, args.new, include_unchanged=args.unchanged), sys.stdout)
+    else:
+        print(json.dumps(diff_decks(args.old, args.new, include_unchanged=args.unchanged), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
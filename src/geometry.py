@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+import numpy as np
+from src.models import SlideNode
+
+
+KIND_TEXT = 0
+KIND_IMAGE = 1
+
+
+@dataclass(frozen=True)
+class DeckGeometry:
+    """Columnar view of every element in a deck, built once from the `SlideNode` list.
+
+    Element arrays are ordered slide by slide, text elements before images, matching
+    `slide.text_elements + slide.image_elements`; `z` is the shape's z-order on its
+    slide. `slide` holds each element's position in the slide arrays (not its
+    `SlideNode.index`). Colors are stored as codes into `colors`; -1 means no color,
+    and missing font sizes are NaN. `has_text` is False for images and for text
+    elements with nothing but whitespace, such as empty filled rectangles.
+    """
+    ids: list[str]
+    slide: np.ndarray
+    kind: np.ndarray
+    has_text: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    w: np.ndarray
+    h: np.ndarray
+    font_size: np.ndarray
+    color: np.ndarray
+    z: np.ndarray
+    slide_index: np.ndarray
+    slide_width: np.ndarray
+    slide_height: np.ndarray
+    background: np.ndarray
+    colors: list[str]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def x2(self) -> np.ndarray:
+        return self.x + self.w
+
+    @property
+    def y2(self) -> np.ndarray:
+        return self.y + self.h
+
+    @property
+    def element_slide_index(self) -> np.ndarray:
+        """`SlideNode.index` of each element."""
+        return self.slide_index[self.slide]
+
+
+def build_geometry(slides: list[SlideNode]) -> DeckGeometry:
+    color_codes: dict[str, int] = {}
+
+    def code(color: str | None) -> int:
+        if not color:
+            return -1
+        return color_codes.setdefault(color, len(color_codes))
+
+    ids, slide, kind, has_text, boxes, font_size, color, z = [], [], [], [], [], [], [], []
+    background = []
+    for pos, node in enumerate(slides):
+        background.append(code(node.background_color))
+        for e in node.text_elements:
+            ids.append(e.id)
+            slide.append(pos)
+            kind.append(KIND_TEXT)
+            has_text.append(bool(e.text.strip()))
+            boxes.append((e.bbox.x, e.bbox.y, e.bbox.width, e.bbox.height))
+            font_size.append(e.style.font_size if e.style.font_size is not None else np.nan)
+            color.append(code(e.style.color))
+            z.append(e.z_order)
+        for e in node.image_elements:
+            ids.append(e.id)
+            slide.append(pos)
+            kind.append(KIND_IMAGE)
+            has_text.append(False)
+            boxes.append((e.bbox.x, e.bbox.y, e.bbox.width, e.bbox.height))
+            font_size.append(np.nan)
+            color.append(-1)
+            z.append(e.z_order)
+
+    boxes = np.array(boxes, dtype=np.float64).reshape(-1, 4)
+    return DeckGeometry(
+        ids=ids,
+        slide=np.array(slide, dtype=np.int64),
+        kind=np.array(kind, dtype=np.int8),
+        has_text=np.array(has_text, dtype=bool),
+        x=boxes[:, 0],
+        y=boxes[:, 1],
+        w=boxes[:, 2],
+        h=boxes[:, 3],
+        font_size=np.array(font_size, dtype=np.float64),
+        color=np.array(color, dtype=np.int64),
+        z=np.array(z, dtype=np.int64),
+        slide_index=np.array([node.index for node in slides], dtype=np.int64),
+        slide_width=np.array([node.width for node in slides], dtype=np.float64),
+        slide_height=np.array([node.height for node in slides], dtype=np.float64),
+        background=np.array(background, dtype=np.int64),
+        colors=list(color_codes),
+    )
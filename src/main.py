@@ -1,31 +1,261 @@
-from src.parsers.xml_parser import parse_presentation
-from src.detectors.hierarchy import detect_hierarchy_violations
-from src.detectors.margin import detect_margin_violations
-from src.detectors.contrast import detect_contrast_violations
-from src.detectors.aspect_ratio import detect_aspect_ratio_violations
-from src.detectors.alignment import detect_alignment_violations
-from src.reporter import generate_report, report_to_json
-
-
-def analyze(pptx_path: str) -> str:
-    slides = parse_presentation(pptx_path)
-    
+import importlib
+import json
+from typing import IO, Callable, Iterator
+from src.cache import ResultCache, slide_key
+from src.context import DeckContext
+from src.geometry import DeckGeometry, build_geometry
+from src.metrics import NULL_METRICS, AnalysisMetrics, MetricsHook
+from src.detectors.registry import accumulate, cache_stamps, deck_accumulators, iter_deck_findings, iter_slide_findings
+from src.models import ErrorReport, LayoutError, SlideNode
+from src.records import SlideRecord, to_slide_node
+from src.reporter import finding_record, generate_report, iter_findings, report_to_dict, report_to_json, write_ndjson
+
+
+# Parser modules are imported on first use: python-pptx is slow to import and the
+# lxml parser does not need it
+PARSERS = {
+    "pptx": ("src.parsers.xml_parser", "iter_slides"),
+    "lxml": ("src.parsers.lxml_parser", "iter_slides_lxml"),
+}
+
+
+def slide_iterator(parser: str) -> Callable[[DeckContext], Iterator[SlideRecord]]:
+    """The named parser's function yielding a deck's slides one at a time."""
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser {parser!r}, expected one of {sorted(PARSERS)}")
+    module, name = PARSERS[parser]
+    return getattr(importlib.import_module(module), name)
+
+DEFAULT_CONFIG = {
+    "margin_pct": 0.05,
+    "min_ratio": 4.5,
+    "tolerance": 0.05,
+    "threshold": 5.0,
+    "min_overlap": 0.05,
+    # Names of the detectors to run, None for all (see src.detectors.registry)
+    "detectors": None,
+    "detector_workers": 1,
+    # Check text styles against a corpus baseline (see src.style_index)
+    "style_index": None,
+    # Pixel-level contrast against rendered slides (see src.render)
+    "render": False,
+    "render_scale": 0.5,
+    "render_backend": "pil",
+    "render_cache": None,
+}
+
+
+def _build_geometry(slides: list[SlideNode], metrics) -> DeckGeometry:
+    with metrics.stage("geometry") as stage:
+        geometry = build_geometry(slides)
+        stage.elements += len(geometry)
+    return geometry
+
+
+def iter_slide_detectors(slides: list[SlideNode], deck: DeckContext, config: dict, geometry=None, metrics=NULL_METRICS) -> Iterator[list[LayoutError]]:
+    """Findings of each detector whose results for a slide depend on that slide alone."""
+    geometry = geometry if geometry is not None else _build_geometry(slides, metrics)
+    return iter_slide_findings(slides, deck, config, geometry, metrics)
+
+
+def deck_detector_errors(geometry: DeckGeometry, config: dict, metrics=NULL_METRICS) -> list[LayoutError]:
+    """Findings of the detectors that need the whole deck, e.g. hierarchy."""
+    accumulators = deck_accumulators(config)
+    accumulate(accumulators, geometry)
     errors = []
-    errors.extend(detect_hierarchy_violations(slides))
-    errors.extend(detect_margin_violations(slides))
-    errors.extend(detect_contrast_violations(slides))
-    errors.extend(detect_aspect_ratio_violations(slides, pptx_path))
-    errors.extend(detect_alignment_violations(slides))
+    for batch in iter_deck_findings(accumulators, config, len(geometry), metrics):
+        errors.extend(batch)
+    return errors
+
+
+def run_slide_detectors(slides: list[SlideNode], deck: DeckContext, config: dict, geometry=None, metrics=NULL_METRICS) -> list[LayoutError]:
+    errors = []
+    for batch in iter_slide_detectors(slides, deck, config, geometry, metrics):
+        errors.extend(batch)
+    return errors
+
+
+def _cached_slide(entry: dict, idx: int) -> tuple[SlideNode, list[LayoutError]]:
+    """A cache entry's slide and findings, moved to position `idx` if cached at another."""
+    slide = SlideNode.model_validate(entry["slide"])
+    errors = [LayoutError.model_validate(e) for e in entry["errors"]]
+    old = slide.index
+    if old != idx:
+        slide.index = idx
+        for element in slide.text_elements + slide.image_elements:
+            element.slide_index = idx
+        for error in errors:
+            error.slide_index = idx
+            # Overcrowding findings name their slide
+            if error.message.startswith(f"Slide {old} "):
+                error.message = f"Slide {idx} " + error.message[len(f"Slide {old} "):]
+    return slide, errors
+
+
+def _analyze_cached(deck: DeckContext, cache: ResultCache, config: dict, metrics=NULL_METRICS) -> tuple[list[SlideNode | SlideRecord], list[LayoutError]]:
+    """Reuse cached slides and findings; parse and check only slides whose parts changed."""
+    from src.parsers.lxml_parser import parse_slide_record
+
+    with metrics.stage("cache.keys"):
+        key_config = {**config, "parser": "lxml", "stamps": cache_stamps(config)}
+        keys = [slide_key(deck, idx, key_config) for idx in range(len(deck.slide_parts))]
+    slides: list[SlideNode | SlideRecord] = []
+    findings: dict[int, list[LayoutError]] = {}
+    stale = []
+    for idx, key in enumerate(keys):
+        with metrics.stage("cache.get"):
+            entry = cache.get(key)
+        if entry is None:
+            with metrics.stage("parse"):
+                slides.append(parse_slide_record(deck, idx))
+            stale.append(idx)
+        else:
+            with metrics.stage("cache.load"):
+                slide, findings[idx] = _cached_slide(entry, idx)
+                slides.append(slide)
+
+    if stale:
+        fresh = [slides[idx] for idx in stale]
+        for idx in stale:
+            findings[idx] = []
+        for error in run_slide_detectors(fresh, deck, config, metrics=metrics):
+            findings[error.slide_index].append(error)
+        with metrics.stage("cache.put"):
+            for idx in stale:
+                cache.put(keys[idx], {
+                    "slide": to_slide_node(slides[idx]).model_dump(mode="json"),
+                    "errors": [e.model_dump(mode="json") for e in findings[idx]],
+                })
 
-    report = generate_report(slides, errors)
-    return report_to_json(report)
+    # Deck-wide: recomputed from every slide, cached or not
+    errors = deck_detector_errors(_build_geometry(slides, metrics), config, metrics)
+    for idx in range(len(slides)):
+        errors.extend(findings[idx])
+    return slides, errors
+
+
+def analyze_report(
+    pptx_path: str,
+    parser: str = "pptx",
+    cache: ResultCache | None = None,
+    config: dict | None = None,
+    metrics: AnalysisMetrics | None = None,
+) -> tuple[list[SlideNode], ErrorReport]:
+    """Parse and check a deck. With a `cache`, only changed slides are re-parsed (lxml parser).
+
+    Pass an `AnalysisMetrics` to have each stage and detector timed into it.
+    """
+    slides, report = _analyze(pptx_path, parser, cache, config, metrics)
+    return [to_slide_node(slide) for slide in slides], report
+
+
+def _analyze(
+    pptx_path: str,
+    parser: str = "pptx",
+    cache: ResultCache | None = None,
+    config: dict | None = None,
+    metrics: AnalysisMetrics | None = None,
+) -> tuple[list[SlideNode | SlideRecord], ErrorReport]:
+    iter_slides = slide_iterator(parser)
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    metrics = metrics if metrics is not None else NULL_METRICS
+
+    with metrics.stage("open"):
+        deck = DeckContext(pptx_path)
+    with deck:
+        if cache is not None:
+            slides, errors = _analyze_cached(deck, cache, config, metrics)
+        else:
+            with metrics.stage("parse") as stage:
+                slides = list(iter_slides(deck))
+                stage.elements += sum(len(s.text_elements) + len(s.image_elements) for s in slides)
+            geometry = _build_geometry(slides, metrics)
+            errors = deck_detector_errors(geometry, config, metrics)
+            errors.extend(run_slide_detectors(slides, deck, config, geometry, metrics))
+
+    with metrics.stage("report") as stage:
+        report = generate_report(slides, errors)
+        stage.findings += len(errors)
+    return slides, report
+
+
+def analyze(
+    pptx_path: str,
+    parser: str = "pptx",
+    cache: ResultCache | None = None,
+    metrics: AnalysisMetrics | bool = False,
+    include_metrics: bool = False,
+    on_metrics: MetricsHook | None = None,
+    config: dict | None = None,
+) -> str:
+    """JSON report for a deck.
+
+    `metrics=True` (or an `AnalysisMetrics`, e.g. with `trace_memory=True`) collects
+    stage timings; `on_metrics` is then called with the collector and
+    `include_metrics` adds them to the report under "_metrics". `config` overrides
+    `DEFAULT_CONFIG` entries, e.g. `{"render": True}`.
+    """
+    if isinstance(metrics, AnalysisMetrics):
+        collector = metrics
+    elif metrics or include_metrics or on_metrics is not None:
+        collector = AnalysisMetrics()
+    else:
+        _, report = _analyze(pptx_path, parser, cache, config)
+        return report_to_json(report)
+
+    _, report = _analyze(pptx_path, parser, cache, config, collector)
+    with collector.stage("json"):
+        data = report_to_dict(report)
+    if include_metrics:
+        data["_metrics"] = collector.to_dict()
+    if on_metrics is not None:
+        on_metrics(collector)
+    return json.dumps(data, indent=2)
+
+
+def analyze_stream(pptx_path: str, parser: str = "pptx", config: dict | None = None) -> Iterator[dict]:
+    """Yield one finding record at a time, parsing and checking slides lazily.
+
+    Each slide goes through the per-slide detectors as soon as it is parsed and is
+    then dropped, along with its memoized XML; hierarchy findings need the whole
+    deck, so they are accumulated slide by slide and come last. With
+    the lxml parser, memory is bounded by the largest slide rather than the deck
+    (python-pptx loads the whole package regardless).
+    """
+    iter_slides = slide_iterator(parser)
+    config = {**DEFAULT_CONFIG, **(config or {})}
+
+    with DeckContext(pptx_path) as deck:
+        accumulators = deck_accumulators(config)
+        for slide in iter_slides(deck):
+            slides = [slide]
+            geometry = build_geometry(slides)
+            accumulate(accumulators, geometry)
+            for slide_index, error in iter_findings(iter_slide_detectors(slides, deck, config, geometry), slides):
+                yield finding_record(error, slide_index, pptx_path)
+            deck.release(deck.slide_parts[slide.index])
+
+        # Deck-scope findings always carry their slide_index
+        for slide_index, error in iter_findings(iter_deck_findings(accumulators, config), []):
+            yield finding_record(error, slide_index, pptx_path)
+
+
+def stream_ndjson(pptx_path: str, out: IO[str], parser: str = "pptx", config: dict | None = None) -> int:
+    """Write a deck's findings to `out` as NDJSON; returns the number of findings."""
+    return write_ndjson(analyze_stream(pptx_path, parser, config), out)
 
 
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) < 2:
-        print("Usage: python main.py <pptx_path>")
+    args = sys.argv[1:]
+    flags = {flag for flag in ("--ndjson", "--render") if flag in args}
+    args = [arg for arg in args if arg not in flags]
+    if not args:
+        print("Usage: python main.py <pptx_path> [pptx|lxml] [--ndjson] [--render]")
         sys.exit(1)
-    
-    result = analyze(sys.argv[1])
-    print(result)
+
+    config = {"render": True} if "--render" in flags else None
+    if "--ndjson" in flags:
+        stream_ndjson(args[0], sys.stdout, *args[1:2], config=config)
+    else:
+        print(analyze(args[0], *args[1:2], config=config))
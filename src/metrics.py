@@ -0,0 +1,100 @@
+"""Per-stage timing, call counts, element counts and memory for `analyze()`."""
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterator, Optional
+
+
+@dataclass
+class StageMetrics:
+    seconds: float = 0.0
+    calls: int = 0
+    elements: int = 0
+    findings: int = 0
+    peak_bytes: Optional[int] = None
+
+
+class AnalysisMetrics:
+    """Collects `StageMetrics` by stage name.
+
+    Stages are named like "parse" or "detector.margin"; repeated stages accumulate.
+    `analyze()` does not nest stages, so their times add up to the total.
+    With `trace_memory`, each stage also records the peak memory allocated above
+    what was live when it started (via tracemalloc, which slows Python down).
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: dict[str, StageMetrics] = {}
+        # (baseline, peak so far) per open stage, for nested stages under tracemalloc
+        self._open: list[list[int]] = []
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        metrics = self.stages.setdefault(name, StageMetrics())
+        if self.trace_memory:
+            self._enter_memory()
+        start = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            metrics.seconds += time.perf_counter() - start
+            metrics.calls += 1
+            if self.trace_memory:
+                metrics.peak_bytes = max(metrics.peak_bytes or 0, self._exit_memory())
+
+    def record(self, name: str, seconds: float, elements: int = 0, findings: int = 0) -> None:
+        """Add a stage timed elsewhere, e.g. in a worker thread."""
+        metrics = self.stages.setdefault(name, StageMetrics())
+        metrics.seconds += seconds
+        metrics.calls += 1
+        metrics.elements += elements
+        metrics.findings += findings
+
+    def _enter_memory(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if self._open:
+            # reset_peak() below would lose the enclosing stage's peak
+            self._open[-1][1] = max(self._open[-1][1], peak)
+        self._open.append([current, current])
+        tracemalloc.reset_peak()
+
+    def _exit_memory(self) -> int:
+        baseline, peak = self._open.pop()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        if self._open:
+            self._open[-1][1] = max(self._open[-1][1], peak)
+        elif self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return peak - baseline
+
+    def to_dict(self) -> dict:
+        return {
+            "total_seconds": sum(m.seconds for m in self.stages.values()),
+            "stages": {name: asdict(m) for name, m in self.stages.items()},
+        }
+
+
+class _NullMetrics:
+    """Stand-in used when metrics are disabled: `stage()` does no timing at all."""
+
+    def __init__(self):
+        # nullcontext is reusable, so a disabled stage costs one method call
+        self._context = nullcontext(StageMetrics())
+
+    def stage(self, name: str) -> nullcontext:
+        return self._context
+
+    def record(self, name: str, seconds: float, elements: int = 0, findings: int = 0) -> None:
+        pass
+
+
+NULL_METRICS = _NullMetrics()
+
+MetricsHook = Callable[[AnalysisMetrics], None]
@@ -34,10 +34,14 @@ class BoundingBox(BaseModel):
 
 
 class TextStyle(BaseModel):
+    # Dominant size by character count; every distinct run size is in font_sizes
     font_size: Optional[float] = None
+    font_sizes: list[float] = []
     font_name: Optional[str] = None
     bold: bool = False
     color: Optional[str] = None
+    # Solid fill of the shape itself, painted behind the text
+    fill_color: Optional[str] = None
 
 
 class TextElement(BaseModel):
@@ -46,6 +50,7 @@ class TextElement(BaseModel):
     text: str
     style: TextStyle
     bbox: BoundingBox
+    z_order: int = 0
 
 
 class ImageElement(BaseModel):
@@ -56,6 +61,7 @@ class ImageElement(BaseModel):
     rendered_height: float
     native_width: Optional[float] = None
     native_height: Optional[float] = None
+    z_order: int = 0
 
 
 class SlideNode(BaseModel):
@@ -72,6 +78,7 @@ class LayoutError(BaseModel):
     severity: Severity
     elements: list[str]
     message: str
+    slide_index: Optional[int] = None
 
 
 class SlideReport(BaseModel):
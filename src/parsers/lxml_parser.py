@@ -0,0 +1,268 @@
+"""Slide parser that reads slide XML directly with lxml.
+
+Produces the same `SlideNode` list as `xml_parser.parse_presentation` without
+building the python-pptx shape/text-frame/run/font proxies for every element.
+"""
+from typing import Iterable, Iterator, Optional
+from lxml import etree
+from src.context import (
+    A, P, PARAGRAPHS, PLACEHOLDER, SHAPES, TAG_FLD, TAG_R, TAG_T, DeckContext, RT_SLIDE_LAYOUT, RT_SLIDE_MASTER,
+    emu_to_px, xpath,
+)
+from src.models import SlideNode
+from src.parsers.styles import MASTER_PLACEHOLDER_TYPE, SlideStyles, StyleResolver
+from src.parsers.transform import IDENTITY, Transform
+from src.records import Box, ImageRecord, SlideRecord, TextRecord, to_slide_node
+
+
+_TAG_SP = P + 'sp'
+_TAG_PIC = P + 'pic'
+_TAG_GRP_SP = P + 'grpSp'
+_TAG_GRAPHIC_FRAME = P + 'graphicFrame'
+_TAG_BR = A + 'br'
+# Shape elements python-pptx exposes through `slide.shapes`, in z-order
+_SHAPE_TAGS = frozenset(P + tag for tag in ('sp', 'grpSp', 'graphicFrame', 'cxnSp', 'pic', 'contentPart'))
+
+_SP_TREE = xpath('./p:cSld/p:spTree')
+_SHAPE_ID = xpath('./*[1]/p:cNvPr/@id')
+_VIDEO_FILE = xpath('./p:nvPicPr/p:nvPr/a:videoFile')
+_XFRM = xpath('./p:spPr/a:xfrm | ./p:xfrm | ./p:grpSpPr/a:xfrm')
+_OFF = xpath('./a:off')
+_EXT = xpath('./a:ext')
+_GROUP_XFRM = xpath('./p:grpSpPr/a:xfrm')
+_CH_OFF = xpath('./a:chOff')
+_CH_EXT = xpath('./a:chExt')
+_TABLE = xpath('./a:graphic/a:graphicData/a:tbl')
+_GRID_COLS = xpath('./a:tblGrid/a:gridCol/@w')
+_ROWS = xpath('./a:tr')
+_CELLS = xpath('./a:tc')
+_MERGE_TRUE = frozenset({'1', 'true'})
+
+
+def _xfrm(shape: etree._Element) -> tuple[Optional[etree._Element], Optional[etree._Element]]:
+    xfrm = _XFRM(shape)
+    if not xfrm:
+        return None, None
+    off, ext = _OFF(xfrm[0]), _EXT(xfrm[0])
+    return (off[0] if off else None), (ext[0] if ext else None)
+
+
+class _PlaceholderIndex:
+    """Placeholder positions of each layout and master, resolved once per deck."""
+
+    def __init__(self, deck: DeckContext):
+        self._deck = deck
+        self._layouts: dict[str, dict[int, tuple]] = {}
+        self._masters: dict[str, dict[str, tuple]] = {}
+
+    def _master(self, part_name: Optional[str]) -> dict[str, tuple]:
+        if part_name is None:
+            return {}
+        if part_name not in self._masters:
+            by_type = {}
+            for shape in SHAPES(self._deck.xml(part_name)):
+                ph = PLACEHOLDER(shape)
+                if ph:
+                    by_type.setdefault(ph[0].get('type', 'obj'), _xfrm(shape))
+            self._masters[part_name] = by_type
+        return self._masters[part_name]
+
+    def _layout(self, part_name: str) -> dict[int, tuple]:
+        if part_name not in self._layouts:
+            master = self._master(self._deck.related(part_name, RT_SLIDE_MASTER))
+            by_idx = {}
+            for shape in SHAPES(self._deck.xml(part_name)):
+                ph = PLACEHOLDER(shape)
+                if not ph:
+                    continue
+                idx = int(ph[0].get('idx', '0'))
+                if idx in by_idx:
+                    continue
+                off, ext = _xfrm(shape)
+                if shape.tag == _TAG_SP and (off is None or ext is None):
+                    base = MASTER_PLACEHOLDER_TYPE.get(ph[0].get('type', 'obj'))
+                    base_off, base_ext = master.get(base, (None, None))
+                    off, ext = off if off is not None else base_off, ext if ext is not None else base_ext
+                by_idx[idx] = (off, ext)
+            self._layouts[part_name] = by_idx
+        return self._layouts[part_name]
+
+    def resolve(self, slide_part: str, ph: etree._Element) -> tuple:
+        layout = self._deck.related(slide_part, RT_SLIDE_LAYOUT)
+        if layout is None:
+            return None, None
+        return self._layout(layout).get(int(ph.get('idx', '0')), (None, None))
+
+
+def _point(element: Optional[etree._Element], x: str, y: str) -> tuple[int, int]:
+    return (int(element.get(x, 0)), int(element.get(y, 0))) if element is not None else (0, 0)
+
+
+def _bbox(shape: etree._Element, slide_part: str, placeholders: _PlaceholderIndex, transform: Transform = IDENTITY) -> Box:
+    off, ext = _xfrm(shape)
+    if off is None or ext is None:
+        ph = PLACEHOLDER(shape)
+        if ph:
+            base_off, base_ext = placeholders.resolve(slide_part, ph[0])
+            off = off if off is not None else base_off
+            ext = ext if ext is not None else base_ext
+    return transform.box(*_point(off, 'x', 'y'), *_point(ext, 'cx', 'cy'))
+
+
+def _group_transform(group: etree._Element, transform: Transform) -> Transform:
+    xfrm = _GROUP_XFRM(group)
+    if not xfrm:
+        return transform
+    off, ext = _OFF(xfrm[0]), _EXT(xfrm[0])
+    ch_off, ch_ext = _CH_OFF(xfrm[0]), _CH_EXT(xfrm[0])
+    off = _point(off[0] if off else None, 'x', 'y')
+    ext = _point(ext[0] if ext else None, 'cx', 'cy')
+    return transform.child(
+        off, ext,
+        _point(ch_off[0], 'x', 'y') if ch_off else off,
+        _point(ch_ext[0], 'cx', 'cy') if ch_ext else ext,
+    )
+
+
+def _iter_shapes(sp_tree: etree._Element) -> Iterator[tuple[etree._Element, Transform]]:
+    """Every shape in z-order, descending into groups, with the transform that places it.
+
+    Each element is visited once; an explicit stack keeps deep nesting off the
+    Python call stack.
+    """
+    stack = [(iter(sp_tree), IDENTITY)]
+    while stack:
+        children, transform = stack[-1]
+        for shape in children:
+            if shape.tag not in _SHAPE_TAGS:
+                continue
+            yield shape, transform
+            if shape.tag == _TAG_GRP_SP:
+                stack.append((iter(shape), _group_transform(shape, transform)))
+                break
+        else:
+            stack.pop()
+
+
+def _table_cells(frame: etree._Element, tbl: etree._Element) -> Iterator[tuple[int, int, etree._Element, tuple[int, int, int, int]]]:
+    """(row, column, a:tc, (x, y, cx, cy)) of each merge-origin cell, in EMU before the group transform."""
+    off, _ = _xfrm(frame)
+    x0, y0 = _point(off, 'x', 'y')
+    col_x = [x0]
+    for width in _GRID_COLS(tbl):
+        col_x.append(col_x[-1] + int(width))
+    y = y0
+    rows = _ROWS(tbl)
+    row_y = []
+    for tr in rows:
+        row_y.append(y)
+        y += int(tr.get('h', 0))
+    row_y.append(y)
+
+    for r, tr in enumerate(rows):
+        for c, tc in enumerate(_CELLS(tr)):
+            if tc.get('hMerge') in _MERGE_TRUE or tc.get('vMerge') in _MERGE_TRUE or c >= len(col_x) - 1:
+                continue
+            c2 = min(c + int(tc.get('gridSpan', 1)), len(col_x) - 1)
+            r2 = min(r + int(tc.get('rowSpan', 1)), len(rows))
+            yield r, c, tc, (col_x[c], row_y[r], col_x[c2] - col_x[c], row_y[r2] - row_y[r])
+
+
+def _paragraph_text(p: etree._Element) -> str:
+    parts = []
+    for child in p:
+        if child.tag == TAG_R or child.tag == TAG_FLD:
+            t = child.find(TAG_T)
+            if t is not None and t.text:
+                parts.append(t.text)
+        elif child.tag == _TAG_BR:
+            parts.append('\v')
+    return ''.join(parts)
+
+
+def parse_slide(deck: DeckContext, idx: int, placeholders: Optional[_PlaceholderIndex] = None, styles: Optional[StyleResolver] = None) -> SlideNode:
+    return to_slide_node(parse_slide_record(deck, idx, placeholders, styles))
+
+
+def parse_slide_record(deck: DeckContext, idx: int, placeholders: Optional[_PlaceholderIndex] = None, styles: Optional[StyleResolver] = None) -> SlideRecord:
+    part_name = deck.slide_parts[idx]
+    if placeholders is None:
+        placeholders = _PlaceholderIndex(deck)
+    if styles is None:
+        styles = StyleResolver(deck)
+    slide_styles = styles.slide(part_name)
+    slide_w, slide_h = deck.slide_size
+    root = deck.xml(part_name)
+
+    node = SlideRecord(index=idx, width=emu_to_px(slide_w), height=emu_to_px(slide_h))
+    node.background_color = styles.background(part_name)
+
+    z_order = -1
+    for shape, transform in _iter_shapes(_SP_TREE(root)[0]):
+        z_order += 1
+        tag = shape.tag
+        if tag == _TAG_GRAPHIC_FRAME:
+            tbl = _TABLE(shape)
+            if tbl:
+                _append_cells(node, slide_styles, shape, tbl[0], transform, z_order)
+            continue
+        if tag != _TAG_SP and tag != _TAG_PIC:
+            continue
+        shape_id = _SHAPE_ID(shape)
+        shape_id = str(int(shape_id[0])) if shape_id else '0'
+        bbox = _bbox(shape, part_name, placeholders, transform)
+
+        if tag == _TAG_SP:
+            node.text_elements.append(TextRecord(
+                id=shape_id,
+                slide_index=idx,
+                text='\n'.join(_paragraph_text(p) for p in PARAGRAPHS(shape)),
+                style=slide_styles.text_style(shape),
+                bbox=bbox,
+                z_order=z_order
+            ))
+        elif not _VIDEO_FILE(shape):
+            node.image_elements.append(ImageRecord(
+                id=shape_id,
+                slide_index=idx,
+                bbox=bbox,
+                rendered_width=bbox.width,
+                rendered_height=bbox.height,
+                z_order=z_order
+            ))
+
+    return node
+
+
+def _append_cells(node: SlideRecord, slide_styles: SlideStyles, frame: etree._Element, tbl: etree._Element, transform: Transform, z_order: int) -> None:
+    """Table cells with text as text elements, with ids `<frame id>.<row>.<column>`."""
+    frame_id = _SHAPE_ID(frame)
+    frame_id = str(int(frame_id[0])) if frame_id else '0'
+    for r, c, tc, (x, y, cx, cy) in _table_cells(frame, tbl):
+        text = '\n'.join(_paragraph_text(p) for p in PARAGRAPHS(tc))
+        if not text.strip():
+            continue
+        node.text_elements.append(TextRecord(
+            id=f'{frame_id}.{r}.{c}',
+            slide_index=node.index,
+            text=text,
+            style=slide_styles.text_style(tc),
+            bbox=transform.box(x, y, cx, cy),
+            z_order=z_order
+        ))
+
+
+def parse_presentation_lxml(source: str | DeckContext) -> list[SlideNode]:
+    if not isinstance(source, DeckContext):
+        with DeckContext(source) as deck:
+            return parse_presentation_lxml(deck)
+
+    return [to_slide_node(slide) for slide in iter_slides_lxml(source)]
+
+
+def iter_slides_lxml(deck: DeckContext, indices: Optional[Iterable[int]] = None) -> Iterator[SlideRecord]:
+    """Parse slides (all, or `indices`) one at a time, sharing layout/master placeholder and style resolution."""
+    placeholders = _PlaceholderIndex(deck)
+    styles = StyleResolver(deck)
+    for idx in indices if indices is not None else range(len(deck.slide_parts)):
+        yield parse_slide_record(deck, idx, placeholders, styles)
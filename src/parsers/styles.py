@@ -0,0 +1,407 @@
+"""Text style and background resolution through the slide inheritance chain.
+
+A run's effective properties come from, highest priority first: the run's own
+`a:rPr`, its paragraph's `a:pPr/a:defRPr`, the shape's `a:lstStyle`, its
+`p:style/a:fontRef`, the matching layout placeholder, the matching master
+placeholder, then the master's `p:txStyles` (placeholders) or the presentation's
+`p:defaultTextStyle` (other shapes). Shape fills come from `p:spPr`, or from the
+theme fill style that `p:style/a:fillRef` points to. Theme fonts (`+mj-lt`/`+mn-lt`) and scheme colors are resolved against
+the theme of the slide's own master, through its `p:clrMap`.
+
+Everything that depends only on a layout, master or theme is computed once per
+part and shared by all slides using it; per shape only its own list style and
+runs are read. Both parsers use this on lxml elements (python-pptx shapes expose
+theirs as `shape._element`).
+"""
+from collections import Counter
+from typing import Optional
+from lxml import etree
+from src.context import (
+    A, DEFAULT_TEXT_STYLE, PARAGRAPHS, PLACEHOLDER, SHAPES, TAG_FLD, TAG_R, TAG_T, DeckContext, PRESENTATION_PART,
+    RT_SLIDE_LAYOUT, RT_SLIDE_MASTER, RT_THEME, xpath,
+)
+from src.records import Style
+
+
+_TAG_RPR = A + 'rPr'
+_TAG_PPR = A + 'pPr'
+_TAG_DEF_RPR = A + 'defRPr'
+_TAG_LATIN = A + 'latin'
+_TAG_SOLID_FILL = A + 'solidFill'
+_TAG_GRAD_FILL = A + 'gradFill'
+_TAG_PATT_FILL = A + 'pattFill'
+_TAG_SRGB = A + 'srgbClr'
+_TAG_SCHEME = A + 'schemeClr'
+_TAG_SYS = A + 'sysClr'
+# Fill choices of a shape's spPr (or a table cell's tcPr); the first present wins
+_FILL_TAGS = frozenset(A + tag for tag in ('noFill', 'solidFill', 'gradFill', 'blipFill', 'pattFill', 'grpFill'))
+
+LEVELS = 9
+_LEVEL_TAGS = [A + f'lvl{n}pPr' for n in range(1, LEVELS + 1)]
+
+# Shapes hold text in p:txBody, table cells (a:tc) in a:txBody
+_LST_STYLE = xpath('./p:txBody/a:lstStyle | ./a:txBody/a:lstStyle')
+_BG = xpath('./p:cSld/p:bg')
+_BG_PR_COLOR = xpath('./p:bgPr/a:solidFill/* | ./p:bgPr/a:pattFill/a:fgClr/*')
+_BG_REF = xpath('./p:bgRef')
+_CLR_MAP = xpath('./p:clrMap')
+_CLR_MAP_OVR = xpath('./p:clrMapOvr/a:overrideClrMapping')
+_TX_STYLES = {
+    'title': xpath('./p:txStyles/p:titleStyle'),
+    'body': xpath('./p:txStyles/p:bodyStyle'),
+    'other': xpath('./p:txStyles/p:otherStyle'),
+}
+_COLOR_SCHEME = xpath('./a:themeElements/a:clrScheme/*')
+_SRGB_VAL = xpath('.//a:srgbClr/@val')
+_SYS_LAST_CLR = xpath('.//a:sysClr/@lastClr')
+_MAJOR_LATIN = xpath('./a:themeElements/a:fontScheme/a:majorFont/a:latin/@typeface')
+_MINOR_LATIN = xpath('./a:themeElements/a:fontScheme/a:minorFont/a:latin/@typeface')
+_BG_FILL_STYLES = xpath('./a:themeElements/a:fmtScheme/a:bgFillStyleLst/*')
+_FILL_STYLES = xpath('./a:themeElements/a:fmtScheme/a:fillStyleLst/*')
+_SHAPE_PROPERTIES = xpath('./p:spPr | ./a:tcPr')
+_FILL_REF = xpath('./p:style/a:fillRef')
+_FONT_REF = xpath('./p:style/a:fontRef')
+
+_BOOL_TRUE = frozenset({'1', 'true', 'on'})
+
+# Master text style each placeholder type takes its defaults from
+_PLACEHOLDER_TX_STYLE = {'title': 'title', 'ctrTitle': 'title', 'dt': 'other', 'ftr': 'other', 'sldNum': 'other', 'hdr': 'other'}
+# Layout placeholder type -> master placeholder type it inherits from
+MASTER_PLACEHOLDER_TYPE = {
+    'body': 'body', 'chart': 'body', 'clipArt': 'body', 'ctrTitle': 'title',
+    'dgm': 'body', 'dt': 'dt', 'ftr': 'ftr', 'media': 'body', 'obj': 'body',
+    'pic': 'body', 'sldNum': 'sldNum', 'subTitle': 'body', 'tbl': 'body',
+    'title': 'title',
+}
+_DEFAULT_CLR_MAP = {'bg1': 'lt1', 'tx1': 'dk1', 'bg2': 'lt2', 'tx2': 'dk2'}
+
+# Per-level property dicts: 'size' (pt), 'bold', 'font' (typeface), 'color' (element)
+Levels = tuple[dict, ...]
+_EMPTY_LEVELS: Levels = tuple({} for _ in range(LEVELS))
+
+
+def _rpr_props(rpr: Optional[etree._Element]) -> dict:
+    props = {}
+    if rpr is None:
+        return props
+    size = rpr.get('sz')
+    if size and int(size):
+        props['size'] = int(size) / 100
+    bold = rpr.get('b')
+    if bold is not None:
+        props['bold'] = bold in _BOOL_TRUE
+    latin = rpr.find(_TAG_LATIN)
+    if latin is not None and latin.get('typeface'):
+        props['font'] = latin.get('typeface')
+    fill = rpr.find(_TAG_SOLID_FILL)
+    if fill is not None and len(fill):
+        props['color'] = fill[0]
+    return props
+
+
+def _levels(lst_style: Optional[etree._Element]) -> Levels:
+    """Run properties per paragraph level from a list style (or txStyles entry)."""
+    if lst_style is None:
+        return _EMPTY_LEVELS
+    levels = []
+    for tag in _LEVEL_TAGS:
+        ppr = lst_style.find(tag)
+        levels.append(_rpr_props(ppr.find(_TAG_DEF_RPR)) if ppr is not None else {})
+    return tuple(levels)
+
+
+def _merge(base: Levels, over: Levels) -> Levels:
+    if over is _EMPTY_LEVELS:
+        return base
+    return tuple({**b, **o} if o else b for b, o in zip(base, over))
+
+
+class _ColorScheme:
+    """Theme colors and fonts of one master, with its color map applied."""
+
+    def __init__(self, theme_colors: dict[str, str], clr_map: dict[str, str], fonts: dict[str, str], bg_fills: list, fills: list):
+        self.theme_colors = theme_colors
+        self.clr_map = clr_map
+        self.fonts = fonts
+        self.bg_fills = bg_fills
+        self.fills = fills
+
+    def with_override(self, override: Optional[etree._Element]) -> "_ColorScheme":
+        if override is None:
+            return self
+        return _ColorScheme(self.theme_colors, {**self.clr_map, **dict(override.attrib)}, self.fonts, self.bg_fills, self.fills)
+
+    def color(self, element: Optional[etree._Element], placeholder: Optional[etree._Element] = None) -> Optional[str]:
+        """Hex value of a color element. Color transforms (lumMod, ...) are not applied."""
+        if element is None:
+            return None
+        tag = element.tag
+        if tag == _TAG_SRGB:
+            return f"#{element.get('val', '').lower()}"
+        if tag == _TAG_SYS:
+            last = element.get('lastClr')
+            return f"#{last.lower()}" if last else None
+        if tag == _TAG_SCHEME:
+            name = element.get('val')
+            if name == 'phClr':
+                return self.color(placeholder) if placeholder is not None else None
+            name = self.clr_map.get(name, name)
+            value = self.theme_colors.get(name)
+            return f"#{value.lower()}" if value else None
+        return None
+
+    def font(self, typeface: Optional[str]) -> Optional[str]:
+        if typeface and typeface.startswith('+'):
+            return self.fonts.get(typeface[:3], typeface)
+        return typeface
+
+
+class StyleResolver:
+    """Resolves text styles and backgrounds for one deck, memoizing per layout, master and theme."""
+
+    def __init__(self, deck: DeckContext):
+        self._deck = deck
+        self._schemes: dict[Optional[str], _ColorScheme] = {}
+        self._master_styles: dict[Optional[str], tuple[dict[str, Levels], dict[str, Levels]]] = {}
+        self._layout_styles: dict[str, tuple[dict[int, Levels], dict[str, Levels]]] = {}
+        self._backgrounds: dict[str, Optional[str]] = {}
+        self._default_levels: Optional[Levels] = None
+
+    # Per-part resolution, memoized
+
+    def _scheme(self, master: Optional[str]) -> _ColorScheme:
+        if master not in self._schemes:
+            theme_colors, fonts, bg_fills, fills = {}, {}, [], []
+            clr_map = dict(_DEFAULT_CLR_MAP)
+            if master is not None:
+                clr = _CLR_MAP(self._deck.xml(master))
+                if clr:
+                    clr_map = dict(clr[0].attrib)
+                theme = self._deck.related(master, RT_THEME)
+                if theme and self._deck.has_part(theme):
+                    root = self._deck.xml(theme)
+                    for element in _COLOR_SCHEME(root):
+                        colors = _SRGB_VAL(element) or _SYS_LAST_CLR(element)
+                        if colors:
+                            theme_colors[etree.QName(element).localname] = colors[0]
+                    major, minor = _MAJOR_LATIN(root), _MINOR_LATIN(root)
+                    if major:
+                        fonts['+mj'] = major[0]
+                    if minor:
+                        fonts['+mn'] = minor[0]
+                    bg_fills = _BG_FILL_STYLES(root)
+                    fills = _FILL_STYLES(root)
+            self._schemes[master] = _ColorScheme(theme_colors, clr_map, fonts, bg_fills, fills)
+        return self._schemes[master]
+
+    def _default_text_levels(self) -> Levels:
+        if self._default_levels is None:
+            default = DEFAULT_TEXT_STYLE(self._deck.xml(PRESENTATION_PART))
+            self._default_levels = _levels(default[0] if default else None)
+        return self._default_levels
+
+    def _master(self, master: Optional[str]) -> tuple[dict[str, Levels], dict[str, Levels]]:
+        """(txStyles by kind, placeholder levels by type) of a master."""
+        if master not in self._master_styles:
+            tx_styles, by_type = {}, {}
+            if master is not None:
+                root = self._deck.xml(master)
+                for kind, query in _TX_STYLES.items():
+                    found = query(root)
+                    tx_styles[kind] = _levels(found[0] if found else None)
+                for shape in SHAPES(root):
+                    ph = PLACEHOLDER(shape)
+                    if not ph:
+                        continue
+                    ph_type = ph[0].get('type', 'obj')
+                    if ph_type in by_type:
+                        continue
+                    base = tx_styles.get(_PLACEHOLDER_TX_STYLE.get(ph_type, 'body'), _EMPTY_LEVELS)
+                    lst = _LST_STYLE(shape)
+                    by_type[ph_type] = _merge(base, _levels(lst[0] if lst else None))
+            self._master_styles[master] = (tx_styles, by_type)
+        return self._master_styles[master]
+
+    def _master_placeholder(self, master: Optional[str], ph_type: str) -> Levels:
+        tx_styles, by_type = self._master(master)
+        base_type = MASTER_PLACEHOLDER_TYPE.get(ph_type, 'body')
+        if base_type in by_type:
+            return by_type[base_type]
+        return tx_styles.get(_PLACEHOLDER_TX_STYLE.get(ph_type, 'body'), _EMPTY_LEVELS)
+
+    def _layout(self, layout: str) -> tuple[dict[int, Levels], dict[str, Levels]]:
+        """Placeholder levels of a layout by idx and by type, merged over its master."""
+        if layout not in self._layout_styles:
+            master = self._deck.related(layout, RT_SLIDE_MASTER)
+            by_idx, by_type = {}, {}
+            for shape in SHAPES(self._deck.xml(layout)):
+                ph = PLACEHOLDER(shape)
+                if not ph:
+                    continue
+                ph_type = ph[0].get('type', 'obj')
+                lst = _LST_STYLE(shape)
+                levels = _merge(self._master_placeholder(master, ph_type), _levels(lst[0] if lst else None))
+                by_idx.setdefault(int(ph[0].get('idx', '0')), levels)
+                by_type.setdefault(ph_type, levels)
+            self._layout_styles[layout] = (by_idx, by_type)
+        return self._layout_styles[layout]
+
+    def _slide_context(self, slide_part: str) -> tuple[Optional[str], Optional[str], _ColorScheme]:
+        layout = self._deck.related(slide_part, RT_SLIDE_LAYOUT)
+        master = self._deck.related(layout, RT_SLIDE_MASTER) if layout else None
+        scheme = self._scheme(master)
+        override = _CLR_MAP_OVR(self._deck.xml(slide_part))
+        return layout, master, scheme.with_override(override[0] if override else None)
+
+    def _shape_levels(self, layout: Optional[str], master: Optional[str], shape: etree._Element) -> Levels:
+        ph = PLACEHOLDER(shape)
+        if not ph:
+            base = self._default_text_levels()
+        else:
+            ph_type = ph[0].get('type', 'obj')
+            base = None
+            if layout is not None:
+                by_idx, by_type = self._layout(layout)
+                base = by_idx.get(int(ph[0].get('idx', '0'))) or by_type.get(ph_type)
+            if base is None:
+                base = self._master_placeholder(master, ph_type)
+        font_ref = _FONT_REF(shape)
+        if font_ref:
+            # The shape style's font and color sit between the shape's list style and its inherited defaults
+            ref = {}
+            if font_ref[0].get('idx') in ('major', 'minor'):
+                ref['font'] = '+mj' if font_ref[0].get('idx') == 'major' else '+mn'
+            if len(font_ref[0]):
+                ref['color'] = font_ref[0][0]
+            if ref:
+                base = tuple({**level, **ref} for level in base)
+        lst = _LST_STYLE(shape)
+        return _merge(base, _levels(lst[0] if lst else None))
+
+    # Public API
+
+    def slide(self, slide_part: str) -> "SlideStyles":
+        return SlideStyles(self, slide_part)
+
+    def background(self, slide_part: str) -> Optional[str]:
+        """Background color of a slide, inherited from its layout and master when unset."""
+        layout, master, scheme = self._slide_context(slide_part)
+        bg = _BG(self._deck.xml(slide_part))
+        if bg:
+            return self._bg_color(scheme, bg[0])
+        if layout is None:
+            return None
+        if scheme is not self._scheme(master):
+            # The slide overrides the color map, so the shared answer does not apply
+            return self._inherited_background(layout, master, scheme)
+        if layout not in self._backgrounds:
+            self._backgrounds[layout] = self._inherited_background(layout, master, scheme)
+        return self._backgrounds[layout]
+
+    def _inherited_background(self, layout: str, master: Optional[str], scheme: _ColorScheme) -> Optional[str]:
+        for part in (layout, master):
+            if part is None:
+                continue
+            bg = _BG(self._deck.xml(part))
+            if bg:
+                return self._bg_color(scheme, bg[0])
+        return None
+
+    def _bg_color(self, scheme: _ColorScheme, bg: etree._Element) -> Optional[str]:
+        color = _BG_PR_COLOR(bg)
+        if color:
+            return scheme.color(color[0])
+        ref = _BG_REF(bg)
+        return self._bg_ref_color(scheme, ref[0]) if ref else None
+
+    @staticmethod
+    def _bg_ref_color(scheme: _ColorScheme, ref: etree._Element) -> Optional[str]:
+        # idx 1001+ indexes the theme's background fill styles; phClr there is the ref's color
+        index = int(ref.get('idx', '0')) - 1001
+        placeholder = ref[0] if len(ref) else None
+        if not 0 <= index < len(scheme.bg_fills):
+            return None
+        fill = scheme.bg_fills[index]
+        if fill.tag != _TAG_SOLID_FILL or not len(fill):
+            return None
+        return scheme.color(fill[0], placeholder)
+
+
+class SlideStyles:
+    """Style resolution bound to one slide."""
+
+    def __init__(self, resolver: StyleResolver, slide_part: str):
+        self._resolver = resolver
+        self._layout, self._master, self._scheme = resolver._slide_context(slide_part)
+
+    def text_style(self, shape: etree._Element) -> Style:
+        """Character-weighted summary of every run's effective style in a text shape.
+
+        `font_size`, `font_name`, `bold` and `color` are the values covering the
+        most characters; `font_sizes` lists every distinct size present.
+        `fill_color` is the shape's own solid fill, if any.
+        """
+        style = Style(fill_color=self.fill(shape))
+        paragraphs = PARAGRAPHS(shape)
+        if not paragraphs:
+            return style
+        levels = self._resolver._shape_levels(self._layout, self._master, shape)
+
+        sizes, fonts, bolds, colors = Counter(), Counter(), Counter(), Counter()
+        for p in paragraphs:
+            ppr = p.find(_TAG_PPR)
+            if ppr is None:
+                paragraph_props = levels[0]
+            else:
+                level = levels[min(int(ppr.get('lvl', '0')), LEVELS - 1)]
+                own = _rpr_props(ppr.find(_TAG_DEF_RPR))
+                paragraph_props = {**level, **own} if own else level
+            for run in p:
+                if run.tag != TAG_R and run.tag != TAG_FLD:
+                    continue
+                rpr = run.find(_TAG_RPR)
+                props = {**paragraph_props, **_rpr_props(rpr)} if rpr is not None else paragraph_props
+                t = run.find(TAG_T)
+                weight = len(t.text) if t is not None and t.text else 1
+                if 'size' in props:
+                    sizes[props['size']] += weight
+                if 'font' in props:
+                    fonts[self._scheme.font(props['font'])] += weight
+                bolds[props.get('bold', False)] += weight
+                if 'color' in props:
+                    color = self._scheme.color(props['color'])
+                    if color is not None:
+                        colors[color] += weight
+
+        if sizes:
+            style.font_size = sizes.most_common(1)[0][0]
+            style.font_sizes = sorted(sizes)
+        if fonts:
+            style.font_name = fonts.most_common(1)[0][0]
+        if bolds:
+            style.bold = bolds.most_common(1)[0][0]
+        if colors:
+            style.color = colors.most_common(1)[0][0]
+        return style
+
+    def fill(self, shape: etree._Element) -> Optional[str]:
+        """Solid fill color of a shape or table cell; None for no, gradient or picture fills."""
+        props = _SHAPE_PROPERTIES(shape)
+        if props:
+            for child in props[0]:
+                if child.tag in _FILL_TAGS:
+                    return self._scheme.color(child[0]) if child.tag == _TAG_SOLID_FILL and len(child) else None
+        # No explicit fill: the shape style's reference into the theme's fill styles.
+        # Gradient and pattern styles are approximated by the reference's own color.
+        ref = _FILL_REF(shape)
+        if not ref or not len(ref[0]):
+            return None
+        index = int(ref[0].get('idx', '0')) - 1
+        if not 0 <= index < len(self._scheme.fills):
+            return None
+        fill = self._scheme.fills[index]
+        if fill.tag == _TAG_SOLID_FILL and len(fill):
+            return self._scheme.color(fill[0], ref[0][0])
+        if fill.tag in (_TAG_GRAD_FILL, _TAG_PATT_FILL):
+            return self._scheme.color(ref[0][0])
+        return None
@@ -0,0 +1,42 @@
+"""Group shape coordinate transforms.
+
+Children of a `p:grpSp` are positioned in the group's child space: the group's
+`a:chOff`/`a:chExt` rectangle is mapped onto its `a:off`/`a:ext` rectangle on the
+parent. Nested groups compose, so each level costs one `child()` call and every
+shape inside is placed with a single `box()`. Rotation and flips are ignored, as
+they are for top-level shapes.
+"""
+from dataclasses import dataclass
+from src.context import emu_to_px
+from src.records import Box
+
+
+@dataclass(frozen=True, slots=True)
+class Transform:
+    """Affine map from a shape's own coordinates (EMU) to slide coordinates."""
+    scale_x: float = 1.0
+    scale_y: float = 1.0
+    dx: float = 0.0
+    dy: float = 0.0
+
+    def child(self, off: tuple[int, int], ext: tuple[int, int], ch_off: tuple[int, int], ch_ext: tuple[int, int]) -> "Transform":
+        """Transform for the children of a group with the given `a:xfrm` values."""
+        sx = ext[0] / ch_ext[0] if ch_ext[0] else 1.0
+        sy = ext[1] / ch_ext[1] if ch_ext[1] else 1.0
+        return Transform(
+            self.scale_x * sx,
+            self.scale_y * sy,
+            self.dx + self.scale_x * (off[0] - ch_off[0] * sx),
+            self.dy + self.scale_y * (off[1] - ch_off[1] * sy),
+        )
+
+    def box(self, x: int, y: int, cx: int, cy: int) -> Box:
+        return Box(
+            emu_to_px(self.dx + x * self.scale_x),
+            emu_to_px(self.dy + y * self.scale_y),
+            emu_to_px(cx * self.scale_x),
+            emu_to_px(cy * self.scale_y),
+        )
+
+
+IDENTITY = Transform()
@@ -1,177 +1,115 @@
-from pptx import Presentation
-from pptx.util import Emu
-from pptx.dml.color import RGBColor
-from pptx.enum.dml import MSO_THEME_COLOR
-from pptx.opc.constants import RELATIONSHIP_TYPE as RT
-from pptx.oxml import parse_xml
-from lxml import etree
-from src.models import SlideNode, TextElement, ImageElement, TextStyle, BoundingBox
-
-
-def emu_to_px(emu: int) -> float:
-    return emu / 914400 * 96
-
-
-def rgb_to_hex(rgb: RGBColor) -> str:
-    return f"#{rgb.red:02x}{rgb.green:02x}{rgb.blue:02x}"
-
-
-def get_theme_colors(presentation: Presentation) -> dict[str, str]:
-    """Extract theme colors from the presentation's slide master.
-    
-    Source: https://stackoverflow.com/a/78501738
-    License: CC BY-SA 4.0
-    
-    Returns a dict mapping theme color names to hex values (without #).
-    Example: {'dk1': '000000', 'lt1': 'FFFFFF', 'accent1': '4472C4', ...}
-    """
-    try:
-        theme_part = presentation.slide_master.part.part_related_by(RT.THEME)
-        theme = parse_xml(theme_part.blob)
-        color_elements = theme.xpath('a:themeElements/a:clrScheme/*')
-        result = {}
-        for element in color_elements:
-            namespaces = {'a': 'http://schemas.openxmlformats.org/drawingml/2006/main'}
-            root = etree.fromstring(etree.tostring(element))
-            theme_name = element.tag.replace('{http://schemas.openxmlformats.org/drawingml/2006/main}', '')
-            colors = root.xpath('//a:srgbClr/@val', namespaces=namespaces)
-            if colors:
-                result[theme_name] = colors[0]
-            else:
-                # Handle system colors (like sysClr for dk1/lt1)
-                sys_colors = root.xpath('//a:sysClr/@lastClr', namespaces=namespaces)
-                if sys_colors:
-                    result[theme_name] = sys_colors[0]
-        return result
-    except Exception:
-        return {}
-
-
-# Mapping from MSO_THEME_COLOR enum to theme color scheme names
-THEME_COLOR_MAP = {
-    MSO_THEME_COLOR.DARK_1: 'dk1',
-    MSO_THEME_COLOR.LIGHT_1: 'lt1',
-    MSO_THEME_COLOR.DARK_2: 'dk2',
-    MSO_THEME_COLOR.LIGHT_2: 'lt2',
-    MSO_THEME_COLOR.ACCENT_1: 'accent1',
-    MSO_THEME_COLOR.ACCENT_2: 'accent2',
-    MSO_THEME_COLOR.ACCENT_3: 'accent3',
-    MSO_THEME_COLOR.ACCENT_4: 'accent4',
-    MSO_THEME_COLOR.ACCENT_5: 'accent5',
-    MSO_THEME_COLOR.ACCENT_6: 'accent6',
-    MSO_THEME_COLOR.HYPERLINK: 'hlink',
-    MSO_THEME_COLOR.FOLLOWED_HYPERLINK: 'folHlink',
-}
-
-
-def safe_get_color_hex(color_format, theme_colors: dict[str, str] | None = None) -> str | None:
-    """Safely extract hex color from a ColorFormat object.
-    
-    Handles RGB colors, scheme colors, and theme colors.
-    Returns None if color cannot be extracted.
-    """
-    if color_format is None:
-        return None
-    
-    try:
-        from pptx.enum.dml import MSO_COLOR_TYPE
-        
-        if color_format.type == MSO_COLOR_TYPE.RGB:
-            return rgb_to_hex(color_format.rgb)
-        
-        elif color_format.type == MSO_COLOR_TYPE.SCHEME:
-            # Try to resolve using theme colors if available
-            if theme_colors and hasattr(color_format, 'theme_color') and color_format.theme_color:
-                theme_key = THEME_COLOR_MAP.get(color_format.theme_color)
-                if theme_key and theme_key in theme_colors:
-                    return f"#{theme_colors[theme_key].lower()}"
-            # Fallback to trying rgb directly
-            try:
-                return rgb_to_hex(color_format.rgb)
-            except AttributeError:
-                return None
-        
-        elif color_format.type == MSO_COLOR_TYPE.THEME:
-            if theme_colors and hasattr(color_format, 'theme_color') and color_format.theme_color:
-                theme_key = THEME_COLOR_MAP.get(color_format.theme_color)
-                if theme_key and theme_key in theme_colors:
-                    return f"#{theme_colors[theme_key].lower()}"
-            try:
-                return rgb_to_hex(color_format.rgb)
-            except AttributeError:
-                return None
-                
-    except Exception:
-        pass
-    
-    # Fallback: try direct rgb access
-    try:
-        return rgb_to_hex(color_format.rgb)
-    except (AttributeError, TypeError):
-        return None
-
-
-def parse_presentation(path: str) -> list[SlideNode]:
-    prs = Presentation(path)
+from typing import Iterator
+from pptx.shapes.group import GroupShape
+from src.context import DeckContext, emu_to_px
+from src.models import SlideNode
+from src.parsers.styles import SlideStyles, StyleResolver
+from src.parsers.transform import IDENTITY, Transform
+from src.records import ImageRecord, SlideRecord, TextRecord, to_slide_node
+
+
+def parse_presentation(source: str | DeckContext) -> list[SlideNode]:
+    if not isinstance(source, DeckContext):
+        with DeckContext(source) as deck:
+            return parse_presentation(deck)
+    return [to_slide_node(slide) for slide in iter_slides(source)]
+
+
+def _group_transform(group: GroupShape, transform: Transform) -> Transform:
+    xfrm = group._element.grpSpPr.xfrm
+    if xfrm is None:
+        return transform
+    off, ext = (group.left or 0, group.top or 0), (group.width or 0, group.height or 0)
+    ch_off = (xfrm.chOff.x, xfrm.chOff.y) if xfrm.chOff is not None else off
+    ch_ext = (xfrm.chExt.cx, xfrm.chExt.cy) if xfrm.chExt is not None else ext
+    return transform.child(off, ext, ch_off, ch_ext)
+
+
+def _iter_shapes(shapes) -> Iterator[tuple[object, Transform]]:
+    """Every shape in z-order, descending into groups, with the transform that places it."""
+    stack = [(iter(shapes), IDENTITY)]
+    while stack:
+        children, transform = stack[-1]
+        for shape in children:
+            yield shape, transform
+            if isinstance(shape, GroupShape):
+                stack.append((iter(shape.shapes), _group_transform(shape, transform)))
+                break
+        else:
+            stack.pop()
+
+
+def _append_cells(node: SlideRecord, slide_styles: SlideStyles, frame, transform: Transform, z_order: int) -> None:
+    """Table cells with text as text elements, with ids `<frame id>.<row>.<column>`."""
+    table = frame.table
+    col_x = [frame.left or 0]
+    for column in table.columns:
+        col_x.append(col_x[-1] + column.width)
+    row_y = [frame.top or 0]
+    for row in table.rows:
+        row_y.append(row_y[-1] + row.height)
+
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            if cell.is_spanned or c >= len(col_x) - 1:
+                continue
+            text = cell.text_frame.text
+            if not text.strip():
+                continue
+            c2 = min(c + cell.span_width, len(col_x) - 1)
+            r2 = min(r + cell.span_height, len(row_y) - 1)
+            node.text_elements.append(TextRecord(
+                id=f"{frame.shape_id}.{r}.{c}",
+                slide_index=node.index,
+                text=text,
+                style=slide_styles.text_style(cell._tc),
+                bbox=transform.box(col_x[c], row_y[r], col_x[c2] - col_x[c], row_y[r2] - row_y[r]),
+                z_order=z_order
+            ))
+
+
+def iter_slides(deck: DeckContext) -> Iterator[SlideRecord]:
+    """Parse slides one at a time. python-pptx still loads the whole package up front."""
+    prs = deck.presentation
     slide_width = emu_to_px(prs.slide_width)
     slide_height = emu_to_px(prs.slide_height)
-    slides = []
     
-    # Extract theme colors once for the entire presentation
-    theme_colors = get_theme_colors(prs)
+    # Styles and backgrounds are resolved through layouts/masters/themes once per deck
+    styles = StyleResolver(deck)
 
     for idx, slide in enumerate(prs.slides):
-        node = SlideNode(index=idx, width=slide_width, height=slide_height)
-        
-        bg_color = None
-        if slide.background.fill.type is not None:
-            bg_color = safe_get_color_hex(slide.background.fill.fore_color, theme_colors)
-        node.background_color = bg_color
-
-        for shape in slide.shapes:
+        node = SlideRecord(index=idx, width=slide_width, height=slide_height)
+        slide_part = deck.slide_parts[idx]
+        slide_styles = styles.slide(slide_part)
+        node.background_color = styles.background(slide_part)
+
+        # Grouped shapes are flattened into slide coordinates; z-order follows paint order
+        for z_order, (shape, transform) in enumerate(_iter_shapes(slide.shapes)):
+            if shape.has_table:
+                _append_cells(node, slide_styles, shape, transform, z_order)
+                continue
+            if isinstance(shape, GroupShape):
+                continue
             shape_id = str(shape.shape_id)
-            bbox = BoundingBox(
-                x=emu_to_px(shape.left),
-                y=emu_to_px(shape.top),
-                width=emu_to_px(shape.width),
-                height=emu_to_px(shape.height)
-            )
+            bbox = transform.box(shape.left, shape.top, shape.width, shape.height)
 
             if shape.has_text_frame:
-                text = shape.text_frame.text
-                style = TextStyle()
-                
-                for para in shape.text_frame.paragraphs:
-                    for run in para.runs:
-                        if run.font.size:
-                            style.font_size = run.font.size.pt
-                        if run.font.name:
-                            style.font_name = run.font.name
-                        if run.font.bold:
-                            style.bold = run.font.bold
-                        if run.font.color:
-                            style.color = safe_get_color_hex(run.font.color, theme_colors)
-                        break
-                    break
-
-                node.text_elements.append(TextElement(
+                node.text_elements.append(TextRecord(
                     id=shape_id,
                     slide_index=idx,
-                    text=text,
-                    style=style,
-                    bbox=bbox
+                    text=shape.text_frame.text,
+                    style=slide_styles.text_style(shape._element),
+                    bbox=bbox,
+                    z_order=z_order
                 ))
 
             if hasattr(shape, "image"):
-                node.image_elements.append(ImageElement(
+                node.image_elements.append(ImageRecord(
                     id=shape_id,
                     slide_index=idx,
                     bbox=bbox,
                     rendered_width=bbox.width,
-                    rendered_height=bbox.height
+                    rendered_height=bbox.height,
+                    z_order=z_order
                 ))
 
-        slides.append(node)
-
-    return slides
-
+        yield node
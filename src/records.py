@@ -0,0 +1,75 @@
+"""Slotted records used between the parsers and the detectors.
+
+They mirror the pydantic schemas in `src.models` attribute for attribute, so the
+geometry builder, detectors and reporter accept either, but skip validation and
+the per-instance `__dict__`. Parsers build these; `to_slide_node` converts to the
+public schema where slides leave the pipeline (API return values, the cache).
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+from src.models import SlideNode
+
+
+@dataclass(slots=True)
+class Box:
+    x: float
+    y: float
+    width: float
+    height: float
+    # Precomputed rather than derived on every access like BoundingBox.x2/y2
+    x2: float = field(init=False)
+    y2: float = field(init=False)
+
+    def __post_init__(self):
+        self.x2 = self.x + self.width
+        self.y2 = self.y + self.height
+
+
+@dataclass(slots=True)
+class Style:
+    font_size: Optional[float] = None
+    font_name: Optional[str] = None
+    bold: bool = False
+    color: Optional[str] = None
+    fill_color: Optional[str] = None
+    # Last, so positional construction from before it was added keeps working
+    font_sizes: list[float] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class TextRecord:
+    id: str
+    slide_index: int
+    text: str
+    style: Style
+    bbox: Box
+    z_order: int = 0
+
+
+@dataclass(slots=True)
+class ImageRecord:
+    id: str
+    slide_index: int
+    bbox: Box
+    rendered_width: float
+    rendered_height: float
+    native_width: Optional[float] = None
+    native_height: Optional[float] = None
+    z_order: int = 0
+
+
+@dataclass(slots=True)
+class SlideRecord:
+    index: int
+    width: float
+    height: float
+    text_elements: list[TextRecord] = field(default_factory=list)
+    image_elements: list[ImageRecord] = field(default_factory=list)
+    background_color: Optional[str] = None
+
+
+def to_slide_node(slide: SlideRecord | SlideNode) -> SlideNode:
+    """Public `SlideNode` for a record (returned as is if it already is one)."""
+    if isinstance(slide, SlideNode):
+        return slide
+    return SlideNode.model_validate(slide, from_attributes=True)
@@ -0,0 +1,329 @@
+"""Slide bitmaps for pixel-level checks and VLM validation.
+
+    python -m src.render deck.pptx --cache .render-cache --workers 4 --crops crops/
+
+Two backends, both at `scale` bitmap pixels per slide pixel:
+
+- "pil": a built-in compositor painting the slide background, solid shape fills
+  and pictures in z-order. Shapes are drawn as their bounding rectangles and text
+  is not drawn, so the pixels under a text box are exactly what it sits on.
+- "soffice": headless LibreOffice converts the deck to PDF, rasterized with
+  `pdftoppm`. Text is drawn; the contrast sampler discounts glyph pixels.
+  LibreOffice leaves hidden slides out of the PDF, so `slide_bitmaps` composites
+  those with "pil" (cached under the "pil" key).
+
+Bitmaps are cached as PNGs in a `BitmapCache`, keyed like the result cache by a
+hash of the slide and everything it inherits from, so an edited deck only
+re-renders changed slides. `render_deck` renders the missing ones in a bounded
+process pool; `slide_bitmaps` is the in-process path the detectors use.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from io import BytesIO
+from typing import Optional, Sequence
+import numpy as np
+from PIL import Image, ImageDraw, UnidentifiedImageError
+from src.cache import BitmapCache, slide_key
+from src.context import DeckContext
+from src.detectors.aspect_ratio import picture_media
+from src.models import SlideNode
+from src.records import SlideRecord
+
+DEFAULT_SCALE = 0.5
+BACKENDS = ("pil", "soffice")
+_WHITE = (255, 255, 255)
+
+
+def soffice_available() -> bool:
+    return shutil.which("soffice") is not None and shutil.which("pdftoppm") is not None
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    if backend == "auto":
+        return "soffice" if soffice_available() else "pil"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown render backend {backend!r}, expected one of {BACKENDS} or 'auto'")
+    return backend
+
+
+def render_key(deck: DeckContext, idx: int, backend: str, scale: float) -> str:
+    return slide_key(deck, idx, {"render": backend, "scale": scale})
+
+
+def _rgb(hex_color: Optional[str]) -> Optional[tuple[int, int, int]]:
+    if not hex_color or len(hex_color) != 7:
+        return None
+    return int(hex_color[1:3], 16), int(hex_color[3:5], 16), int(hex_color[5:7], 16)
+
+
+def pixel_box(bbox, scale: float) -> tuple[int, int, int, int]:
+    """(left, top, right, bottom) of a bounding box in bitmap pixels, right/bottom exclusive."""
+    return round(bbox.x * scale), round(bbox.y * scale), round((bbox.x + bbox.width) * scale), round((bbox.y + bbox.height) * scale)
+
+
+def _picture(deck: DeckContext, target: str, src_rect, size: tuple[int, int], media: dict) -> Optional[Image.Image]:
+    if target not in media:
+        try:
+            media[target] = Image.open(BytesIO(deck.blob(target))).convert("RGBA")
+        except (UnidentifiedImageError, OSError, KeyError):
+            # Vector formats (EMF/WMF) and missing parts are left unpainted
+            media[target] = None
+    image = media[target]
+    if image is None:
+        return None
+    if src_rect is not None:
+        width, height = image.size
+        left, top = max(int(src_rect.get('l', 0)), 0), max(int(src_rect.get('t', 0)), 0)
+        right, bottom = max(int(src_rect.get('r', 0)), 0), max(int(src_rect.get('b', 0)), 0)
+        box = (width * left // 100000, height * top // 100000, width - width * right // 100000, height - height * bottom // 100000)
+        if box[0] < box[2] and box[1] < box[3]:
+            image = image.crop(box)
+    return image.resize(size, Image.BILINEAR)
+
+
+def composite_slide(deck: DeckContext, slide: SlideRecord | SlideNode, scale: float = DEFAULT_SCALE, media: Optional[dict] = None) -> Image.Image:
+    """Paint a parsed slide's background, shape fills and pictures in z-order.
+
+    `media` memoizes decoded pictures by part name; pass the same dict for every
+    slide of a deck.
+    """
+    media = media if media is not None else {}
+    canvas = Image.new("RGB", (max(round(slide.width * scale), 1), max(round(slide.height * scale), 1)), _rgb(slide.background_color) or _WHITE)
+    draw = ImageDraw.Draw(canvas)
+    pictures = {shape_id: (target, src_rect) for shape_id, target, src_rect in picture_media(deck, slide.index)}
+
+    layers = [(e.z_order, False, e) for e in slide.text_elements if e.style.fill_color]
+    layers.extend((e.z_order, True, e) for e in slide.image_elements if e.id in pictures)
+    layers.sort(key=lambda layer: layer[0])
+    for _, is_picture, element in layers:
+        left, top, right, bottom = pixel_box(element.bbox, scale)
+        if right <= left or bottom <= top:
+            continue
+        if is_picture:
+            target, src_rect = pictures[element.id]
+            image = _picture(deck, target, src_rect, (right - left, bottom - top), media)
+            if image is not None:
+                canvas.paste(image, (left, top), image)
+        else:
+            fill = _rgb(element.style.fill_color)
+            if fill is not None:
+                draw.rectangle((left, top, right - 1, bottom - 1), fill=fill)
+    return canvas
+
+
+def hidden_slides(deck: DeckContext) -> list[bool]:
+    """Whether each slide is hidden (`<p:sld show="0">`)."""
+    return [deck.xml(part).get("show") in ("0", "false") for part in deck.slide_parts]
+
+
+def page_slides(hidden: Sequence[bool], pages: int) -> list[int]:
+    """Slide index of each page of a deck's PDF export.
+
+    LibreOffice leaves hidden slides out by default; a PDF with a page for every
+    slide maps one to one.
+    """
+    if pages == len(hidden):
+        return list(range(pages))
+    visible = [idx for idx, is_hidden in enumerate(hidden) if not is_hidden]
+    if pages == len(visible):
+        return visible
+    raise RuntimeError(f"PDF has {pages} pages for {len(hidden)} slides ({len(visible)} not hidden); cannot match pages to slides")
+
+
+def render_soffice(pptx_path: str, scale: float = DEFAULT_SCALE) -> list[Image.Image]:
+    """Every slide of a deck rendered by LibreOffice (slide pixels are 1/96 inch)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        # A private profile lets several conversions run at once
+        subprocess.run(
+            ["soffice", f"-env:UserInstallation=file://{tmp}/profile", "--headless",
+             "--convert-to", "pdf", "--outdir", tmp, os.path.abspath(pptx_path)],
+            check=True, capture_output=True, timeout=600,
+        )
+        pdf = os.path.join(tmp, os.path.splitext(os.path.basename(pptx_path))[0] + ".pdf")
+        subprocess.run(
+            ["pdftoppm", "-r", str(round(96 * scale)), "-png", pdf, os.path.join(tmp, "slide")],
+            check=True, capture_output=True, timeout=600,
+        )
+        # pdftoppm zero-pads page numbers to the page count's width
+        pages = sorted(
+            (name for name in os.listdir(tmp) if name.startswith("slide-") and name.endswith(".png")),
+            key=lambda name: int(name[len("slide-"):-len(".png")]),
+        )
+        images = []
+        for name in pages:
+            with Image.open(os.path.join(tmp, name)) as page:
+                images.append(page.convert("RGB"))
+        return images
+
+
+def _png(image: Image.Image) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _render_chunk(pptx_path: str, indices: list[int], backend: str, scale: float) -> list[tuple[int, bytes]]:
+    """Worker: PNG bytes for some slides of a deck (all of them for soffice)."""
+    if backend == "soffice":
+        with DeckContext(pptx_path) as deck:
+            hidden = hidden_slides(deck)
+        images = render_soffice(pptx_path, scale)
+        return [(idx, _png(image)) for idx, image in zip(page_slides(hidden, len(images)), images) if idx in indices]
+
+    from src.parsers.lxml_parser import iter_slides_lxml
+
+    with DeckContext(pptx_path) as deck:
+        media = {}
+        return [(slide.index, _png(composite_slide(deck, slide, scale, media))) for slide in iter_slides_lxml(deck, indices)]
+
+
+def render_deck(
+    pptx_path: str,
+    cache: BitmapCache | str,
+    scale: float = DEFAULT_SCALE,
+    workers: Optional[int] = None,
+    backend: str = "auto",
+    slide_indices: Optional[Sequence[int]] = None,
+) -> dict[int, str]:
+    """Render a deck's slides into `cache`, returning each slide's PNG path.
+
+    Only slides missing from the cache are rendered, in at most `workers` processes
+    with no more than two chunks queued per worker. With soffice, hidden slides
+    are skipped (see `slide_bitmaps`).
+    """
+    backend = resolve_backend(backend)
+    cache = cache if isinstance(cache, BitmapCache) else BitmapCache(cache)
+    with DeckContext(pptx_path) as deck:
+        indices = list(slide_indices) if slide_indices is not None else list(range(len(deck.slide_parts)))
+        if backend == "soffice":
+            hidden = hidden_slides(deck)
+            indices = [idx for idx in indices if not hidden[idx]]
+        keys = {idx: render_key(deck, idx, backend, scale) for idx in indices}
+
+    paths = {}
+    missing = []
+    for idx in indices:
+        path = cache.get(keys[idx])
+        if path is None:
+            missing.append(idx)
+        else:
+            paths[idx] = path
+    if not missing:
+        return paths
+
+    workers = workers or os.cpu_count() or 1
+    if backend == "soffice":
+        chunks = [missing]
+    else:
+        size = max(len(missing) // (workers * 4), 1)
+        chunks = [missing[i:i + size] for i in range(0, len(missing), size)]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        pending = set()
+        chunks_left = iter(chunks)
+        while True:
+            for chunk in chunks_left:
+                pending.add(pool.submit(_render_chunk, pptx_path, chunk, backend, scale))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for idx, png in future.result():
+                    paths[idx] = cache.put(keys[idx], png)
+    return paths
+
+
+def slide_bitmaps(
+    deck: DeckContext,
+    slides: Sequence[SlideRecord | SlideNode],
+    scale: float = DEFAULT_SCALE,
+    cache: Optional[BitmapCache] = None,
+    backend: str = "pil",
+) -> dict[int, np.ndarray]:
+    """RGB arrays (height x width x 3, uint8) of already-parsed slides, by slide index.
+
+    Composited in-process, or taken from `cache` when `render_deck` or an earlier
+    run rendered them. The soffice backend needs a cache: on the first miss it
+    renders every uncached slide of the deck there in one conversion. Hidden
+    slides, which LibreOffice does not export, are composited instead.
+    """
+    backend = resolve_backend(backend)
+    if backend == "soffice" and cache is None:
+        raise ValueError("The soffice backend renders through a BitmapCache; pass cache=")
+    hidden = hidden_slides(deck) if backend == "soffice" else None
+    bitmaps = {}
+    media = {}
+    for slide in slides:
+        slide_backend = "pil" if hidden and hidden[slide.index] else backend
+        key = render_key(deck, slide.index, slide_backend, scale) if cache is not None else None
+        path = cache.get(key) if cache is not None else None
+        if path is None and slide_backend == "soffice":
+            path = render_deck(deck.path, cache, scale, backend=backend).get(slide.index)
+            if path is None:
+                # A composite must not be cached as LibreOffice's rendering
+                raise RuntimeError(f"LibreOffice rendered no page for slide {slide.index} of {deck.path}")
+        if path is not None:
+            with Image.open(path) as image:
+                bitmaps[slide.index] = np.asarray(image.convert("RGB"))
+            continue
+        image = composite_slide(deck, slide, scale, media)
+        if cache is not None:
+            cache.put(key, _png(image))
+        bitmaps[slide.index] = np.asarray(image)
+    return bitmaps
+
+
+def element_crops(image: Image.Image, slide: SlideRecord | SlideNode, pad: int = 0) -> dict[str, Image.Image]:
+    """Per-element crops of a rendered slide, e.g. for `validate_text_legibility`."""
+    scale = image.width / slide.width
+    crops = {}
+    for element in [*slide.text_elements, *slide.image_elements]:
+        left, top, right, bottom = pixel_box(element.bbox, scale)
+        left, top = max(left - pad, 0), max(top - pad, 0)
+        right, bottom = min(right + pad, image.width), min(bottom + pad, image.height)
+        if right > left and bottom > top:
+            crops[element.id] = image.crop((left, top, right, bottom))
+    return crops
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Render slides to cached PNG bitmaps.")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--cache", default=".render-cache", help="bitmap cache directory")
+    parser.add_argument("--scale", type=float, default=DEFAULT_SCALE, help="bitmap pixels per slide pixel")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--backend", choices=["auto", *BACKENDS], default="auto")
+    parser.add_argument("--crops", default=None, help="also write per-element crops under this directory")
+    args = parser.parse_args(argv)
+
+    cache = BitmapCache(args.cache)
+    for path in args.paths:
+        rendered = render_deck(path, cache, args.scale, args.workers, args.backend)
+        for idx in sorted(rendered):
+            print(f"{path}\t{idx}\t{rendered[idx]}")
+        if args.crops is None:
+            continue
+        from src.main import slide_iterator
+
+        out_dir = os.path.join(args.crops, os.path.splitext(os.path.basename(path))[0])
+        os.makedirs(out_dir, exist_ok=True)
+        with DeckContext(path) as deck:
+            for slide in slide_iterator("lxml")(deck):
+                if slide.index not in rendered:
+                    # Hidden, with the soffice backend
+                    continue
+                with Image.open(rendered[slide.index]) as image:
+                    for element_id, crop in element_crops(image, slide).items():
+                        crop.save(os.path.join(out_dir, f"slide{slide.index}-{element_id}.png"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
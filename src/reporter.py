@@ -1,39 +1,60 @@
 import json
+from typing import IO, Iterable, Iterator, Optional
 from src.models import SlideNode, LayoutError, ErrorReport, SlideReport
 
 
+def error_key(error: LayoutError) -> tuple:
+    return (error.type, error.severity, tuple(error.elements), error.message, error.slide_index)
+
+
+def slides_by_element(slides: list[SlideNode]) -> dict[str, list[int]]:
+    # Element ids are only unique within a slide, so one id may map to several slides
+    index: dict[str, list[int]] = {}
+    for slide in slides:
+        for e in slide.text_elements:
+            index.setdefault(e.id, []).append(slide.index)
+        for e in slide.image_elements:
+            index.setdefault(e.id, []).append(slide.index)
+    return index
+
+
+def error_targets(error: LayoutError, element_index: dict[str, list[int]], all_slides: list[int]) -> list[int]:
+    """Slides an error is reported on: its own slide_index, else the slides of its elements."""
+    if error.slide_index is not None:
+        return [error.slide_index]
+    if error.elements:
+        targets = []
+        for elem_id in error.elements:
+            targets.extend(element_index.get(elem_id, ()))
+        return targets
+    return all_slides
+
+
 def generate_report(slides: list[SlideNode], errors: list[LayoutError]) -> ErrorReport:
     report = ErrorReport()
 
-    errors_by_slide = {}
+    element_index = slides_by_element(slides)
+    all_slides = [slide.index for slide in slides]
+
+    errors_by_slide: dict[int, list[LayoutError]] = {}
+    seen: dict[int, set[tuple]] = {}
     for error in errors:
-        for elem_id in error.elements:
-            for slide in slides:
-                for e in slide.text_elements + slide.image_elements:
-                    if e.id == elem_id:
-                        slide_key = f"slide_{slide.index}"
-                        if slide_key not in errors_by_slide:
-                            errors_by_slide[slide_key] = []
-                        if error not in errors_by_slide[slide_key]:
-                            errors_by_slide[slide_key].append(error)
-                        break
-
-        if not error.elements:
-            for slide in slides:
-                slide_key = f"slide_{slide.index}"
-                if slide_key not in errors_by_slide:
-                    errors_by_slide[slide_key] = []
-                if error not in errors_by_slide[slide_key]:
-                    errors_by_slide[slide_key].append(error)
-
-    for slide_key, slide_errors in errors_by_slide.items():
-        idx = int(slide_key.split("_")[1])
-        report.slides[slide_key] = SlideReport(slide_index=idx, errors=slide_errors)
+        targets = error_targets(error, element_index, all_slides)
+        key = error_key(error)
+        for idx in targets:
+            slide_seen = seen.setdefault(idx, set())
+            if key in slide_seen:
+                continue
+            slide_seen.add(key)
+            errors_by_slide.setdefault(idx, []).append(error)
+
+    for idx, slide_errors in errors_by_slide.items():
+        report.slides[f"slide_{idx}"] = SlideReport(slide_index=idx, errors=slide_errors)
 
     return report
 
 
-def report_to_json(report: ErrorReport) -> str:
+def report_to_dict(report: ErrorReport) -> dict:
     data = {}
     for key, slide_report in report.slides.items():
         data[key] = {
@@ -47,4 +68,49 @@ def report_to_json(report: ErrorReport) -> str:
                 for e in slide_report.errors
             ]
         }
-    return json.dumps(data, indent=2)
+    return data
+
+
+def report_to_json(report: ErrorReport) -> str:
+    return json.dumps(report_to_dict(report), indent=2)
+
+
+def iter_findings(batches: Iterable[list[LayoutError]], slides: list[SlideNode]) -> Iterator[tuple[int, LayoutError]]:
+    """(slide index, error) pairs in the order detectors produce them.
+
+    Duplicates are dropped within each batch; that matches `generate_report` as long
+    as each batch comes from one detector, since detectors report distinct types.
+    """
+    element_index = None
+    all_slides = [slide.index for slide in slides]
+    for batch in batches:
+        seen: set[tuple] = set()
+        for error in batch:
+            if error.slide_index is None and element_index is None:
+                element_index = slides_by_element(slides)
+            for idx in error_targets(error, element_index, all_slides):
+                key = (idx, error_key(error))
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield idx, error
+
+
+def finding_record(error: LayoutError, slide_index: int, deck: Optional[str] = None) -> dict:
+    return {
+        "deck": deck,
+        "slide_index": slide_index,
+        "type": error.type.value,
+        "severity": error.severity.value,
+        "elements": error.elements,
+        "message": error.message,
+    }
+
+
+def write_ndjson(records: Iterable[dict], out: IO[str]) -> int:
+    """Write one JSON line per record as it arrives; returns the number written."""
+    count = 0
+    for record in records:
+        out.write(json.dumps(record) + "\n")
+        count += 1
+    return count
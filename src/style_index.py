@@ -0,0 +1,293 @@
+"""Style baseline of a corpus of approved decks, for checking new decks against it.
+
+    python -m src.style_index add .style-index approved/ --template acme
+    python -m src.style_index show .style-index
+
+Text styles are counted per template: font size, font name, color and bold at
+each size. A slide's template is its theme part's digest, so decks built from
+the same template share a baseline without naming it, or a name given when
+adding and checking. Counts live in one `styles.npy` record array sorted by
+(template, feature, value) that loads memory-mapped, plus a small `index.json`
+with template keys, the font name/color vocabulary and the decks already
+counted. Adding decks merges only their counts into the array, so the corpus is
+never rescanned, and adding a deck twice changes nothing.
+
+`check_slides` flags text whose style is rare in its template's baseline;
+unlike `detect_hierarchy_violations` it needs no minimum number of elements in
+the deck itself. Enable it in `analyze()` with `config={"style_index": path}`.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Optional
+import numpy as np
+from src.cache import slide_digest
+from src.context import DeckContext, RT_SLIDE_LAYOUT, RT_SLIDE_MASTER, RT_THEME
+from src.models import ErrorType, LayoutError, Severity, SlideNode
+from src.records import SlideRecord
+
+INDEX_VERSION = 1
+
+SIZE, BOLD, NAME, COLOR = range(4)
+STYLE_DTYPE = np.dtype([("template", "<i4"), ("feature", "i1"), ("value", "<f8"), ("count", "<i8")])
+
+_ARRAY_FILE = "styles.npy"
+_META_FILE = "index.json"
+
+
+def template_key(deck: DeckContext, idx: int) -> str:
+    """Digest of the theme slide `idx` inherits, or "" without one."""
+    layout = deck.related(deck.slide_parts[idx], RT_SLIDE_LAYOUT)
+    master = deck.related(layout, RT_SLIDE_MASTER) if layout else None
+    theme = deck.related(master, RT_THEME) if master else None
+    return deck.part_digest(theme)[:16] if theme else ""
+
+
+def deck_digest(deck: DeckContext) -> str:
+    h = hashlib.sha256()
+    for idx in range(len(deck.slide_parts)):
+        h.update(slide_digest(deck, idx).encode())
+    return h.hexdigest()
+
+
+class _Baseline:
+    """One template's counts as dicts, built from its slice of the array."""
+
+    __slots__ = ("total", "sizes", "bold", "names", "colors", "common_sizes")
+
+    def __init__(self, rows: np.ndarray, vocab: list[str], min_share: float):
+        counts = {feature: {} for feature in (SIZE, BOLD, NAME, COLOR)}
+        for feature, value, count in zip(rows["feature"].tolist(), rows["value"].tolist(), rows["count"].tolist()):
+            counts[feature][value] = count
+        self.sizes, self.bold = counts[SIZE], counts[BOLD]
+        self.names = {vocab[int(code)]: count for code, count in counts[NAME].items()}
+        self.colors = {vocab[int(code)]: count for code, count in counts[COLOR].items()}
+        self.total = sum(self.sizes.values())
+        self.common_sizes = np.array(sorted(s for s, count in self.sizes.items() if count >= min_share * self.total))
+
+
+class StyleIndex:
+    """Per-template style counts of approved decks, stored in `directory`."""
+
+    def __init__(self, directory: str, mmap: bool = True):
+        self.directory = directory
+        meta_path = os.path.join(directory, _META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != INDEX_VERSION:
+                raise ValueError(f"Style index {directory!r} has version {meta.get('version')}, expected {INDEX_VERSION}")
+            self.rows = np.load(os.path.join(directory, _ARRAY_FILE), mmap_mode="r" if mmap else None)
+        else:
+            meta = {"version": INDEX_VERSION, "generation": 0, "templates": [], "vocab": [], "decks": {}}
+            self.rows = np.zeros(0, dtype=STYLE_DTYPE)
+        self.generation: int = meta["generation"]
+        self.templates: list[str] = meta["templates"]
+        self.vocab: list[str] = meta["vocab"]
+        self.decks: dict[str, str] = meta["decks"]
+        self._template_ids = {key: i for i, key in enumerate(self.templates)}
+        self._vocab_ids = {value: i for i, value in enumerate(self.vocab)}
+        self._baselines: dict[tuple[str, float], Optional[_Baseline]] = {}
+
+    def _code(self, value: str) -> int:
+        return self._vocab_ids.setdefault(value, len(self._vocab_ids))
+
+    def _template(self, key: str) -> int:
+        return self._template_ids.setdefault(key, len(self._template_ids))
+
+    def add_decks(self, paths: Iterable[str], template: Optional[str] = None, parser: str = "lxml") -> int:
+        """Count the styles of decks not yet in the index; returns how many were added."""
+        from src.main import slide_iterator
+
+        iter_slides = slide_iterator(parser)
+        counts: Counter = Counter()
+        added = 0
+        for path in paths:
+            with DeckContext(path) as deck:
+                digest = deck_digest(deck)
+                if digest in self.decks:
+                    continue
+                for slide in iter_slides(deck):
+                    tid = self._template(template or template_key(deck, slide.index))
+                    for e in slide.text_elements:
+                        style = e.style
+                        if style.font_size:
+                            counts[tid, SIZE, style.font_size] += 1
+                            if style.bold:
+                                counts[tid, BOLD, style.font_size] += 1
+                        if style.font_name:
+                            counts[tid, NAME, self._code(style.font_name)] += 1
+                        if style.color:
+                            counts[tid, COLOR, self._code(style.color)] += 1
+            self.decks[digest] = os.path.basename(path)
+            added += 1
+        if counts:
+            new = np.array([(*key, count) for key, count in counts.items()], dtype=STYLE_DTYPE)
+            self._merge(new)
+        if added:
+            self._save()
+        return added
+
+    def _merge(self, new: np.ndarray) -> None:
+        rows = np.concatenate([np.asarray(self.rows), new])
+        rows = rows[np.lexsort((rows["value"], rows["feature"], rows["template"]))]
+        changed = np.zeros(len(rows) - 1, dtype=bool)
+        for name in ("template", "feature", "value"):
+            changed |= rows[name][1:] != rows[name][:-1]
+        starts = np.flatnonzero(np.concatenate(([True], changed)))
+        merged = rows[starts]
+        merged["count"] = np.add.reduceat(rows["count"], starts)
+        self.rows = merged
+        self._baselines.clear()
+
+    def _save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.generation += 1
+        self.templates = list(self._template_ids)
+        self.vocab = list(self._vocab_ids)
+        # Array first: a reader never sees metadata naming templates the array lacks
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".npy")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, self.rows)
+        os.replace(tmp, os.path.join(self.directory, _ARRAY_FILE))
+        meta = {"version": INDEX_VERSION, "generation": self.generation, "templates": self.templates, "vocab": self.vocab, "decks": self.decks}
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.directory, _META_FILE))
+
+    def baseline(self, template: str, min_share: float = 0.01) -> Optional[_Baseline]:
+        key = (template, min_share)
+        if key not in self._baselines:
+            tid = self._template_ids.get(template)
+            if tid is None:
+                self._baselines[key] = None
+            else:
+                column = self.rows["template"]
+                lo, hi = np.searchsorted(column, tid, side="left"), np.searchsorted(column, tid, side="right")
+                self._baselines[key] = _Baseline(self.rows[lo:hi], self.vocab, min_share)
+        return self._baselines[key]
+
+    def summary(self) -> dict:
+        result = {}
+        for key in self.templates:
+            base = self.baseline(key)
+            result[key] = {
+                "text_elements": base.total,
+                "sizes": {str(size): count for size, count in sorted(base.sizes.items())},
+                "fonts": dict(Counter(base.names).most_common()),
+                "colors": dict(Counter(base.colors).most_common()),
+            }
+        return {"decks": len(self.decks), "templates": result}
+
+
+@lru_cache(maxsize=8)
+def _open_index(directory: str, mtime: float) -> StyleIndex:
+    return StyleIndex(directory)
+
+
+def open_index(directory: str) -> StyleIndex:
+    """A loaded index, reused until `directory` is updated."""
+    try:
+        mtime = os.path.getmtime(os.path.join(directory, _META_FILE))
+    except OSError:
+        raise ValueError(f"No style index in {directory!r}; build one with `python -m src.style_index add`") from None
+    return _open_index(directory, mtime)
+
+
+def check_slides(
+    slides: list[SlideNode | SlideRecord],
+    deck: DeckContext,
+    index: StyleIndex,
+    min_share: float = 0.01,
+    template: Optional[str] = None,
+) -> list[LayoutError]:
+    """Text styles rare in the baseline of the slide's template.
+
+    A size used by under `min_share` of the template's text is flagged when within
+    2pt of a common one; fonts and colors under `min_share` are flagged, and so is
+    bold (or regular) text at a common size the template almost never sets that way.
+    Slides of templates the index has not seen are skipped.
+    """
+    errors = []
+    for slide in slides:
+        base = index.baseline(template or template_key(deck, slide.index), min_share)
+        if base is None or base.total == 0:
+            continue
+        floor = min_share * base.total
+        for e in slide.text_elements:
+            style = e.style
+            size = style.font_size
+            if size and len(base.common_sizes) and base.sizes.get(size, 0) < floor:
+                closest = base.common_sizes[np.abs(base.common_sizes - size).argmin()]
+                if abs(size - closest) <= 2:
+                    errors.append(LayoutError(
+                        type=ErrorType.HIERARCHY,
+                        severity=Severity.WARNING,
+                        elements=[e.id],
+                        slide_index=slide.index,
+                        message=f"Font size {float(size)}pt is close but not matching {float(closest)}pt used across the template"
+                    ))
+            elif size and base.sizes.get(size, 0) >= floor:
+                bold_share = base.bold.get(size, 0) / base.sizes[size]
+                if (style.bold and bold_share < min_share) or (not style.bold and bold_share > 1 - min_share):
+                    errors.append(LayoutError(
+                        type=ErrorType.HIERARCHY,
+                        severity=Severity.INFO,
+                        elements=[e.id],
+                        slide_index=slide.index,
+                        message=f"{'Bold' if style.bold else 'Regular'} text at {float(size)}pt, which the template sets {'regular' if style.bold else 'bold'}"
+                    ))
+            if style.font_name and base.names.get(style.font_name, 0) < floor:
+                errors.append(LayoutError(
+                    type=ErrorType.HIERARCHY,
+                    severity=Severity.INFO,
+                    elements=[e.id],
+                    slide_index=slide.index,
+                    message=f"Font {style.font_name} is not used across the template"
+                ))
+            if style.color and base.colors.get(style.color, 0) < floor:
+                errors.append(LayoutError(
+                    type=ErrorType.HIERARCHY,
+                    severity=Severity.INFO,
+                    elements=[e.id],
+                    slide_index=slide.index,
+                    message=f"Text color {style.color} is not in the template's palette"
+                ))
+    return errors
+
+
+def main(argv: list[str] | None = None) -> int:
+    from src.batch import collect_paths
+
+    parser = argparse.ArgumentParser(description="Build and inspect a style baseline of approved decks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="count the styles of decks not yet in the index")
+    add.add_argument("index")
+    add.add_argument("inputs", nargs="+", help="directories, glob patterns or .pptx files")
+    add.add_argument("--template", default=None, help="template name (default: each slide's theme digest)")
+    add.add_argument("--parser", choices=["pptx", "lxml"], default="lxml")
+    show = commands.add_parser("show", help="print the per-template counts")
+    show.add_argument("index")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        print(json.dumps(StyleIndex(args.index).summary(), indent=2))
+        return 0
+    paths = collect_paths(args.inputs)
+    if not paths:
+        print("No .pptx files found", file=sys.stderr)
+        return 1
+    index = StyleIndex(args.index, mmap=False)
+    added = index.add_decks(paths, args.template, args.parser)
+    print(f"Added {added} of {len(paths)} decks; {len(index.decks)} decks in {len(index.templates)} templates", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Finding counts over a grid of detector thresholds, from one parse per deck.
+
+    python -m src.sweep templates/ --grid threshold=2,5,10 --grid min_ratio=3,4.5,7
+    python -m src.sweep deck.pptx --grid margin_pct=0.02,0.05 --findings
+
+Each thresholded detector measures once (contrast ratios, aspect-ratio deltas,
+sorted edges, overlap areas, ...) and is then judged at every grid value, which
+costs one vectorized comparison per value. Each grid parameter varies alone with
+the others at their config values; parameters of different detectors do not
+interact, so a combination's count is the sum of its parameters' counts.
+"""
+import argparse
+import json
+import sys
+from typing import Sequence
+from src.context import DeckContext
+from src.detectors.registry import DETECTORS, Detector, detector_input, detector_params, enabled_detectors, readers
+from src.geometry import build_geometry
+from src.main import DEFAULT_CONFIG, slide_iterator
+from src.reporter import finding_record, iter_findings
+
+
+def sweep_owners(grid: dict[str, Sequence[float]], config: dict) -> dict[str, Detector]:
+    """The enabled detector taking each grid parameter."""
+    owners = {}
+    for detector in enabled_detectors(config, "slide"):
+        if detector.measure is not None and detector.count is not None:
+            owners.update((param, detector) for param in detector.params if param in grid)
+    if unknown := set(grid) - set(owners):
+        sweepable = sorted(p for d in DETECTORS.values() if d.measure and d.count for p in d.params)
+        raise ValueError(f"Cannot sweep {sorted(unknown)}, expected some of {sweepable} (of enabled detectors)")
+    return owners
+
+
+def sweep_deck(
+    pptx_path: str,
+    grid: dict[str, Sequence[float]],
+    parser: str = "pptx",
+    config: dict | None = None,
+    findings: bool = False,
+) -> dict:
+    """{"deck", "counts": {param: {value: count}}} and, with `findings`, finding records per value too."""
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    owners = sweep_owners(grid, config)
+    with DeckContext(pptx_path) as deck:
+        slides = list(slide_iterator(parser)(deck))
+        geometry = build_geometry(slides)
+        detectors = readers(list({d.name: d for d in owners.values()}.values()), geometry)
+        inputs = detector_input(detectors, slides, deck, config, geometry)
+        measurements = {detector.name: detector.measure(inputs) for detector in detectors}
+
+    result = {"deck": pptx_path, "counts": {}}
+    if findings:
+        result["findings"] = {}
+    for param, values in grid.items():
+        detector = owners[param]
+        measured = measurements.get(detector.name)
+        counts = result["counts"][param] = {}
+        if findings:
+            records = result["findings"][param] = {}
+        for value in values:
+            params = {**detector_params(detector, config), param: value}
+            if measured is None:
+                # No elements of the kinds it reads
+                counts[value] = 0
+                if findings:
+                    records[value] = []
+                continue
+            counts[value] = detector.count(inputs, measured, **params)
+            if findings:
+                errors = detector.judge(inputs, measured, **params)
+                records[value] = [finding_record(e, idx, pptx_path) for idx, e in iter_findings([errors], slides)]
+    return result
+
+
+def parse_grid(specs: list[str]) -> dict[str, list[float]]:
+    """`["threshold=2,5,10", ...]` -> `{"threshold": [2.0, 5.0, 10.0], ...}`."""
+    grid = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        if not sep or not values:
+            raise ValueError(f"Expected NAME=V1,V2,... in {spec!r}")
+        grid.setdefault(name.strip(), []).extend(float(v) for v in values.split(","))
+    return grid
+
+
+def main(argv: list[str] | None = None) -> int:
+    from src.batch import collect_paths
+
+    parser = argparse.ArgumentParser(description="Count findings over a grid of detector thresholds.")
+    parser.add_argument("inputs", nargs="+", help="directories, glob patterns or .pptx files")
+    parser.add_argument("--grid", action="append", required=True, help="NAME=V1,V2,... e.g. threshold=2,5,10 (repeatable)")
+    parser.add_argument("--parser", choices=["pptx", "lxml"], default="pptx")
+    parser.add_argument("--findings", action="store_true", help="include the findings at every grid value")
+    args = parser.parse_args(argv)
+
+    try:
+        grid = parse_grid(args.grid)
+        sweep_owners(grid, DEFAULT_CONFIG)
+    except ValueError as exc:
+        parser.error(str(exc))
+    paths = collect_paths(args.inputs)
+    if not paths:
+        print("No .pptx files found", file=sys.stderr)
+        return 1
+
+    decks = [sweep_deck(path, grid, args.parser, findings=args.findings) for path in paths]
+    total = {param: {value: sum(d["counts"][param][value] for d in decks) for value in values} for param, values in grid.items()}
+    print(json.dumps({"total": total, "decks": decks}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""Concurrent, rate-limited and cached VLM legibility checks.
+
+    validator = VLMValidator(concurrency=8, requests_per_second=4)
+    verdicts = await validator.validate_many([(img, "title"), (img2, "")])
+    await validator.aclose()
+
+One pooled async client is shared by every request. Images are cropped and
+downscaled before encoding, and verdicts are cached by image content so
+re-validating an unchanged slide does not hit the endpoint. Pass `client=` to
+point the validator at any chat-completions compatible server (e.g. a local stub).
+"""
+import asyncio
+import base64
+import hashlib
+import os
+import random
+import time
+from io import BytesIO
+from typing import Iterable, Optional
+from PIL import Image
+from src.validators.vlm_validator import LEGIBILITY_PROMPT
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def prepare_image(img: Image.Image, crop: Optional[tuple[int, int, int, int]] = None, max_side: int = 1024) -> Image.Image:
+    """Crop to `crop` (left, top, right, bottom) and shrink so the longest side is <= max_side."""
+    if crop is not None:
+        img = img.crop(crop)
+    if max(img.size) > max_side:
+        img = img.copy()
+        img.thumbnail((max_side, max_side))
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    return img
+
+
+def image_digest(img: Image.Image, prompt: str) -> str:
+    h = hashlib.sha256()
+    h.update(f"{img.mode}:{img.size}:{prompt}".encode())
+    h.update(img.tobytes())
+    return h.hexdigest()
+
+
+def get_async_client():
+    """Async Azure OpenAI client using AZURE_OPENAI_API_KEY, or Entra ID when unset."""
+    from openai import AsyncAzureOpenAI
+
+    options = dict(
+        api_version="2024-02-01",
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        # Retries are handled by VLMValidator so they respect the shared rate limit
+        max_retries=0,
+    )
+    if os.getenv("AZURE_OPENAI_API_KEY"):
+        return AsyncAzureOpenAI(api_key=os.getenv("AZURE_OPENAI_API_KEY"), **options)
+
+    from azure.identity.aio import DefaultAzureCredential, get_bearer_token_provider
+    token_provider = get_bearer_token_provider(
+        DefaultAzureCredential(),
+        "https://cognitiveservices.azure.com/.default"
+    )
+    return AsyncAzureOpenAI(azure_ad_token_provider=token_provider, **options)
+
+
+class VLMValidator:
+    def __init__(
+        self,
+        client=None,
+        deployment: Optional[str] = None,
+        concurrency: int = 4,
+        requests_per_second: float = 2.0,
+        max_retries: int = 5,
+        max_side: int = 1024,
+        cache=None,
+    ):
+        self._client = client
+        self.deployment = deployment or os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
+        self.max_retries = max_retries
+        self.max_side = max_side
+        self.cache = cache
+        self.requests = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(requests_per_second)
+        self._verdicts: dict[str, bool] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_async_client()
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+
+    async def validate(self, img: Image.Image, description: str = "", crop: Optional[tuple[int, int, int, int]] = None) -> bool:
+        img = prepare_image(img, crop, self.max_side)
+        prompt = LEGIBILITY_PROMPT if not description else f"{LEGIBILITY_PROMPT}\nContext: {description}"
+        key = image_digest(img, f"{self.deployment}:{prompt}")
+
+        if key in self._verdicts:
+            return self._verdicts[key]
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self._verdicts[key] = entry["legible"]
+                return entry["legible"]
+        if key in self._pending:
+            return await self._pending[key]
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            verdict = await self._request(img, prompt)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an unobserved failure doesn't warn at shutdown
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+        future.set_result(verdict)
+        self._verdicts[key] = verdict
+        if self.cache is not None:
+            self.cache.put(key, {"legible": verdict})
+        return verdict
+
+    async def validate_many(self, items: Iterable[tuple[Image.Image, str]]) -> list[bool]:
+        return await asyncio.gather(*(self.validate(img, description) for img, description in items))
+
+    async def _request(self, img: Image.Image, prompt: str) -> bool:
+        from openai import APIConnectionError, InternalServerError, RateLimitError
+
+        buffer = BytesIO()
+        img.save(buffer, format="PNG", compress_level=1)
+        b64 = base64.b64encode(buffer.getvalue()).decode()
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{b64}"}},
+                ]
+            }
+        ]
+
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            try:
+                async with self._semaphore:
+                    self.requests += 1
+                    response = await self.client.chat.completions.create(
+                        model=self.deployment,
+                        messages=messages,
+                        max_tokens=10
+                    )
+                # No content (e.g. a content-filtered reply) is not a YES
+                answer = (response.choices[0].message.content or "").strip().upper()
+                return "YES" in answer
+            except (RateLimitError, InternalServerError, APIConnectionError) as exc:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(exc, attempt))
+
+    @staticmethod
+    def _backoff(exc: Exception, attempt: int) -> float:
+        response = getattr(exc, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random() / 2)
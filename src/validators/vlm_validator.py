@@ -1,12 +1,24 @@
 import os
 import base64
+from functools import lru_cache
 from io import BytesIO
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
-from openai import AzureOpenAI
+from typing import TYPE_CHECKING
 from PIL import Image
 
+if TYPE_CHECKING:
+    from openai import AzureOpenAI
+
+
+LEGIBILITY_PROMPT = "Is the text in this image legible and readable? Answer only YES or NO."
+
+
+@lru_cache(maxsize=1)
+def get_client() -> "AzureOpenAI":
+    """Shared client; the credential and connection pool are reused across calls."""
+    # Imported here so the prompt and helpers load without the optional [vlm] extra
+    from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+    from openai import AzureOpenAI
 
-def get_client() -> AzureOpenAI:
     token_provider = get_bearer_token_provider(
         DefaultAzureCredential(),
         "https://cognitiveservices.azure.com/.default"
@@ -36,7 +48,7 @@ def validate_text_legibility(img: Image.Image, description: str = "") -> bool:
                 "content": [
                     {
                         "type": "text",
-                        "text": "Is the text in this image legible and readable? Answer only YES or NO."
+                        "text": LEGIBILITY_PROMPT
                     },
                     {
                         "type": "image_url",
@@ -48,5 +60,5 @@ def validate_text_legibility(img: Image.Image, description: str = "") -> bool:
         max_tokens=10
     )
 
-    answer = response.choices[0].message.content.strip().upper()
+    answer = (response.choices[0].message.content or "").strip().upper()
     return "YES" in answer
@@ -0,0 +1,77 @@
+"""Sort-based alignment groups against the original nearest-neighbour scan."""
+import random
+import re
+import numpy as np
+import pytest
+from src.detectors.alignment import detect_alignment_violations, near_aligned_groups
+from src.models import BoundingBox, SlideNode, TextElement, TextStyle
+
+
+def baseline_pairs(values: list[float], threshold: float) -> set[tuple[int, int]]:
+    """(i, nearest) pairs the original scan reported for one edge of one slide."""
+    array = np.array(values, dtype=float)
+    pairs = set()
+    for i, value in enumerate(values):
+        diffs = np.abs(array - value)
+        diffs[i] = np.inf
+        if 0 < diffs.min() <= threshold:
+            pairs.add((i, int(diffs.argmin())))
+    return pairs
+
+
+def duplicated(values: list[float]) -> set[int]:
+    """Values the scan skipped for having an exact twin, which a group may still hold."""
+    return {i for i, value in enumerate(values) if values.count(value) > 1}
+
+
+def slide_of(lefts: list[float]) -> SlideNode:
+    elements = [
+        TextElement(id=str(i), slide_index=0, text="", style=TextStyle(),
+                    bbox=BoundingBox(x=x, y=100 * i, width=50 + 70 * i, height=20))
+        for i, x in enumerate(lefts)
+    ]
+    return SlideNode(index=0, width=960, height=720, text_elements=elements)
+
+
+@pytest.mark.parametrize("values", [
+    [10, 12, 200, 203, 204, 500, 500, 800],
+    [0, 5, 300, 301.5, 302, 302, 640],
+    [7, 90, 180, 270],
+])
+def test_groups_match_baseline_pairs(values):
+    groups = [set(g.tolist()) for g in near_aligned_groups(np.array(values, dtype=float), 5.0)]
+    pairs = baseline_pairs(values, 5.0)
+    flagged = {i for pair in pairs for i in pair}
+    assert flagged <= set().union(*groups) <= flagged | duplicated(values)
+    for i, j in pairs:
+        assert any(i in g and j in g for g in groups)
+
+
+def test_chained_steps_do_not_merge():
+    lefts = [100 + 4 * i for i in range(10)]
+    errors = [e for e in detect_alignment_violations([slide_of(lefts)], 5.0) if " on left " in e.message]
+    assert errors
+    for error in errors:
+        assert float(re.search(r"off by ([\d.]+)px", error.message).group(1)) <= 5.0
+        spread = max(lefts[int(i)] for i in error.elements) - min(lefts[int(i)] for i in error.elements)
+        assert 0 < spread <= 5.0
+    # Every element near another one is still reported
+    assert set().union(*(e.elements for e in errors)) == {str(i) for i in range(10)}
+
+
+def test_groups_stay_on_their_slide():
+    values = np.array([10.0, 12.0, 11.0, 13.0])
+    slide = np.array([0, 1, 0, 1])
+    assert [g.tolist() for g in near_aligned_groups(values, 5.0, slide)] == [[0, 2], [1, 3]]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_groups_are_tight_and_were_flagged(seed):
+    rng = random.Random(seed)
+    grid = [rng.randrange(0, 900, 40) for _ in range(6)]
+    values = [rng.choice(grid) + rng.choice([0, 0, rng.uniform(-4, 4)]) for _ in range(12)]
+    flagged = {i for pair in baseline_pairs(values, 5.0) for i in pair}
+    for group in near_aligned_groups(np.array(values), 5.0):
+        group_values = [values[i] for i in group]
+        assert 0 < max(group_values) - min(group_values) <= 5.0
+        assert set(group.tolist()) <= flagged | duplicated(values)
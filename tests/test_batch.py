@@ -0,0 +1,39 @@
+"""Batch failures stay with the deck that caused them."""
+import io
+import json
+import os
+import time
+from src import batch
+
+
+def fake_analyze(path: str, parser: str = "pptx") -> dict:
+    if "crash" in path:
+        os._exit(1)
+    if "hang" in path:
+        time.sleep(60)
+    return {"deck": path, "ok": True, "slides": 1, "report": {}}
+
+
+def run(monkeypatch, paths: list[str], **kwargs) -> dict[str, dict]:
+    monkeypatch.setattr(batch, "analyze_deck", fake_analyze)
+    out = io.StringIO()
+    summary = batch.run_batch(paths, out, workers=2, **kwargs)
+    records = {r["deck"]: r for r in map(json.loads, out.getvalue().splitlines())}
+    assert summary["decks"] == len(records) == len(paths)
+    return records
+
+
+def test_dead_worker_fails_only_its_deck(monkeypatch):
+    paths = [f"deck{i}.pptx" for i in range(7)] + ["crash.pptx"]
+    records = run(monkeypatch, paths)
+    assert [p for p, r in records.items() if not r["ok"]] == ["crash.pptx"]
+    assert records["crash.pptx"]["error"].startswith("BrokenProcessPool")
+
+
+def test_timeout_fails_only_its_deck(monkeypatch):
+    paths = ["hang.pptx"] + [f"deck{i}.pptx" for i in range(5)]
+    start = time.monotonic()
+    records = run(monkeypatch, paths, timeout=1.0)
+    assert time.monotonic() - start < 30
+    assert [p for p, r in records.items() if not r["ok"]] == ["hang.pptx"]
+    assert records["hang.pptx"]["error"].startswith("TimeoutError")
@@ -0,0 +1,83 @@
+"""Cached results survive slides moving to other positions."""
+import os
+import pytest
+from pptx import Presentation
+from benchmarks.deckgen import generate_deck
+from src.cache import ResultCache
+from src.main import analyze
+
+
+def insert_blank_first(path: str, out: str) -> str:
+    prs = Presentation(path)
+    prs.slides.add_slide(prs.slide_layouts[6])
+    slide_ids = prs.slides._sldIdLst
+    slide_ids.insert(0, slide_ids[-1])
+    prs.save(out)
+    return out
+
+
+def drop_slide(path: str, out: str, position: int) -> str:
+    prs = Presentation(path)
+    slide_ids = prs.slides._sldIdLst
+    prs.part.drop_rel(slide_ids[position].rId)
+    slide_ids.remove(slide_ids[position])
+    prs.save(out)
+    return out
+
+
+@pytest.mark.parametrize("edit, hits, misses", [
+    (insert_blank_first, 6, 1),
+    (lambda path, out: drop_slide(path, out, 1), 5, 0),
+])
+def test_moved_slides_hit_the_cache(tmp_path, edit, hits, misses):
+    original = generate_deck(str(tmp_path / "deck.pptx"), slides=6, seed=1)
+    assert "overcrowded" in analyze(original, "lxml")
+    cache = ResultCache(str(tmp_path / "cache"))
+    analyze(original, "lxml", cache=cache)
+
+    edited = edit(original, str(tmp_path / "edited.pptx"))
+    cache.hits = cache.misses = 0
+    cached = analyze(edited, "lxml", cache=cache)
+    assert (cache.hits, cache.misses) == (hits, misses)
+    assert cached == analyze(edited, "lxml")
+
+
+def test_refuses_directory_that_is_not_a_cache(tmp_path):
+    (tmp_path / "notes.txt").write_text("keep me")
+    with pytest.raises(ValueError):
+        ResultCache(str(tmp_path))
+    assert (tmp_path / "notes.txt").read_text() == "keep me"
+
+
+def test_clear_removes_only_cache_entries(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("ab" + "0" * 62, {"x": 1})
+    (tmp_path / "ab" / "mine.txt").write_text("keep me")
+    (tmp_path / "notes.txt").write_text("keep me")
+    (tmp_path / "VERSION").write_text("old")
+
+    cache = ResultCache(str(tmp_path))
+    assert cache.get("ab" + "0" * 62) is None
+    assert (tmp_path / "ab" / "mine.txt").exists() and (tmp_path / "notes.txt").exists()
+
+
+def test_evicts_least_recently_used_down_to_low_water(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=100)
+    entry = {"v": "x" * 12}  # 20 bytes on disk
+    for key in ("aa1", "bb2", "cc3", "dd4", "ee5"):
+        cache.put(key, entry)
+    assert cache.get("aa1") == entry
+    cache.put("ff6", entry)
+    # Over 100 bytes: evicted oldest-first to 90, skipping the entry just read
+    assert cache.get("bb2") is None and cache.get("cc3") is None
+    assert all(cache.get(key) == entry for key in ("aa1", "dd4", "ee5", "ff6"))
+
+
+def test_removes_stale_interrupted_writes(tmp_path):
+    ResultCache(str(tmp_path)).put("aa1", {})
+    stale, fresh = tmp_path / "aa" / "stale.tmp", tmp_path / "aa" / "fresh.tmp"
+    stale.write_bytes(b"partial")
+    fresh.write_bytes(b"partial")
+    os.utime(stale, (0, 0))
+    ResultCache(str(tmp_path)).put("aa2", {})
+    assert not stale.exists() and fresh.exists()
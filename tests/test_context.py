@@ -0,0 +1,28 @@
+"""DeckContext reads each zip member at most once per analysis."""
+import zipfile
+from collections import Counter
+import pytest
+from benchmarks.deckgen import generate_deck
+from src.main import analyze
+
+
+@pytest.mark.parametrize("parser", ["pptx", "lxml"])
+def test_members_read_once(monkeypatch, tmp_path, parser):
+    path = generate_deck(str(tmp_path / "deck.pptx"), slides=4, seed=5)
+    reads, opened = Counter(), []
+    zip_open, zip_init = zipfile.ZipFile.open, zipfile.ZipFile.__init__
+
+    def counting_open(self, name, *args, **kwargs):
+        reads[getattr(name, "filename", name)] += 1
+        return zip_open(self, name, *args, **kwargs)
+
+    def counting_init(self, file, *args, **kwargs):
+        opened.append(file)
+        zip_init(self, file, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, "open", counting_open)
+    monkeypatch.setattr(zipfile.ZipFile, "__init__", counting_init)
+    analyze(path, parser)
+    assert [name for name, count in reads.items() if count > 1] == []
+    # python-pptx reads through the context's open file rather than the path
+    assert [file for file in opened if isinstance(file, str)] == [path]
@@ -0,0 +1,41 @@
+"""The daemon client only talks to sockets of the current user."""
+import os
+import socket
+import stat
+import pytest
+from src import daemon
+
+
+def test_default_socket_is_in_a_private_directory(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(daemon.tempfile, "gettempdir", lambda: str(tmp_path))
+    directory = os.path.dirname(daemon.default_socket_path())
+    assert directory != str(tmp_path)
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+
+def test_shared_socket_directory_is_refused(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(daemon.tempfile, "gettempdir", lambda: str(tmp_path))
+    os.makedirs(tmp_path / f"layout-error-{os.getuid()}", mode=0o777)
+    os.chmod(tmp_path / f"layout-error-{os.getuid()}", 0o777)
+    with pytest.raises(PermissionError):
+        daemon.default_socket_path()
+
+
+def test_foreign_socket_is_refused(monkeypatch, tmp_path):
+    path = str(tmp_path / "s.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    try:
+        uid = os.getuid()
+        monkeypatch.setattr(daemon.os, "getuid", lambda: uid + 1)
+        with pytest.raises(PermissionError):
+            daemon.request({"command": "shutdown"}, path)
+    finally:
+        server.close()
+
+
+def test_missing_socket_means_no_server(tmp_path):
+    assert daemon.request({"command": "shutdown"}, str(tmp_path / "none.sock")) is None
@@ -0,0 +1,13 @@
+"""Margin findings name the margin they were checked against."""
+import pytest
+from src.detectors.margin import detect_margin_violations
+from src.models import BoundingBox, SlideNode, TextElement, TextStyle
+
+
+@pytest.mark.parametrize("margin_pct, label", [(0.05, "5%"), (0.025, "2.5%"), (0.1, "10%")])
+def test_message_reports_the_configured_margin(margin_pct, label):
+    edge = TextElement(id="1", slide_index=0, text="Footnote", style=TextStyle(),
+                       bbox=BoundingBox(x=5, y=600, width=200, height=40), z_order=0)
+    slide = SlideNode(index=0, width=960, height=720, text_elements=[edge], image_elements=[])
+    [error] = detect_margin_violations([slide], margin_pct)
+    assert error.message == f"Element outside safe zone ({label} margin)"
@@ -0,0 +1,54 @@
+"""Overlap severity depends on whether the covered shape actually holds text."""
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.util import Inches
+from src.detectors.overlap import detect_overlap_violations
+from src.main import analyze
+from src.models import BoundingBox, ImageElement, Severity, SlideNode, TextElement, TextStyle
+import json
+
+
+def text(id: str, content: str, z: int, fill: str | None = None) -> TextElement:
+    return TextElement(id=id, slide_index=0, text=content, style=TextStyle(fill_color=fill),
+                       bbox=BoundingBox(x=100, y=100, width=300, height=200), z_order=z)
+
+
+def image(id: str, z: int) -> ImageElement:
+    return ImageElement(id=id, slide_index=0, bbox=BoundingBox(x=150, y=120, width=300, height=200),
+                        rendered_width=300, rendered_height=200, z_order=z)
+
+
+def severities(*elements) -> list[tuple[list[str], Severity]]:
+    slide = SlideNode(index=0, width=960, height=720,
+                      text_elements=[e for e in elements if isinstance(e, TextElement)],
+                      image_elements=[e for e in elements if isinstance(e, ImageElement)])
+    return [(e.elements, e.severity) for e in detect_overlap_violations([slide])]
+
+
+def test_text_on_empty_shape_is_a_warning():
+    assert severities(text("card", "", 0, fill="#1f4e79"), text("title", "Quarterly results", 1)) == [(["card", "title"], Severity.WARNING)]
+
+
+def test_text_under_filled_shape_is_critical():
+    assert severities(text("title", "Quarterly results", 0), text("cover", " ", 1, fill="#1f4e79")) == [(["title", "cover"], Severity.CRITICAL)]
+
+
+def test_image_over_image_is_info():
+    assert severities(image("a", 0), image("b", 1)) == [(["a", "b"], Severity.INFO)]
+
+
+def test_text_box_on_card_in_a_deck(tmp_path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    card = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(1), Inches(1), Inches(4), Inches(3))
+    card.fill.solid()
+    card.fill.fore_color.rgb = RGBColor(0x1f, 0x4e, 0x79)
+    box = slide.shapes.add_textbox(Inches(1.5), Inches(1.5), Inches(3), Inches(1))
+    box.text_frame.text = "White on blue"
+    box.text_frame.paragraphs[0].runs[0].font.color.rgb = RGBColor(0xff, 0xff, 0xff)
+    path = str(tmp_path / "card.pptx")
+    prs.save(path)
+    for parser in ("pptx", "lxml"):
+        errors = json.loads(analyze(path, parser))["slide_0"]["errors"]
+        assert [e["severity"] for e in errors if e["type"] == "OVERLAP"] == ["WARNING"]
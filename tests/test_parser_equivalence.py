@@ -0,0 +1,13 @@
+"""The lxml parser against the python-pptx one, on generated decks."""
+import pytest
+from benchmarks.deckgen import generate_deck, generate_grouped_deck
+from src.parsers.lxml_parser import parse_presentation_lxml
+from src.parsers.xml_parser import parse_presentation
+
+
+@pytest.mark.parametrize("generate", [generate_deck, generate_grouped_deck])
+def test_parsers_agree(tmp_path, generate):
+    path = generate(str(tmp_path / "deck.pptx"), slides=5, seed=3)
+    expected = parse_presentation(path)
+    assert expected and any(s.text_elements for s in expected)
+    assert parse_presentation_lxml(path) == expected
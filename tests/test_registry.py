@@ -0,0 +1,44 @@
+"""Detector engine: selection, ordering and concurrent deck detectors."""
+import threading
+import pytest
+from src.detectors import registry
+from src.detectors.registry import Detector, deck_accumulators, iter_deck_findings, register_detector
+from src.geometry import build_geometry
+from src.models import ErrorType, LayoutError, Severity
+
+
+@pytest.fixture(autouse=True)
+def private_registry(monkeypatch):
+    monkeypatch.setattr(registry, "DETECTORS", dict(registry.DETECTORS))
+
+
+def waiting_detector(name: str, barrier: threading.Barrier) -> Detector:
+    def finish(state, **params):
+        # Only returns if the other detector's finish runs at the same time
+        barrier.wait(timeout=5)
+        return [LayoutError(type=ErrorType.HIERARCHY, severity=Severity.INFO, elements=[], message=name)]
+
+    return Detector(name=name, scope="deck", start=list, add=lambda state, geometry: None, finish=finish)
+
+
+def test_deck_detectors_finish_concurrently():
+    barrier = threading.Barrier(2)
+    for name in ("first", "second"):
+        register_detector(waiting_detector(name, barrier))
+    config = {"detectors": ["first", "second"], "detector_workers": 2}
+    findings = list(iter_deck_findings(deck_accumulators(config), config))
+    assert [[e.message for e in errors] for errors in findings] == [["first"], ["second"]]
+
+
+def test_deck_findings_follow_registration_order():
+    register_detector(waiting_detector("only", threading.Barrier(1)))
+    config = {"detectors": ["only", "hierarchy"]}
+    accumulators = deck_accumulators(config)
+    registry.accumulate(accumulators, build_geometry([]))
+    # hierarchy was registered first and finds nothing in an empty deck
+    assert [len(errors) for errors in iter_deck_findings(accumulators, config)] == [0, 1]
+
+
+def test_unknown_detector_is_rejected():
+    with pytest.raises(ValueError):
+        registry.enabled_detectors({"detectors": ["nope"]}, "slide")
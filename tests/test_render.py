@@ -0,0 +1,61 @@
+"""Matching LibreOffice's PDF pages to slides when some slides are hidden."""
+import numpy as np
+import pytest
+from PIL import Image
+from pptx import Presentation
+from benchmarks.deckgen import generate_deck
+from src import render
+from src.cache import BitmapCache
+from src.context import DeckContext
+from src.parsers.lxml_parser import iter_slides_lxml
+
+
+def test_page_slides_skips_hidden_slides():
+    hidden = [False, True, False, False, True]
+    assert render.page_slides(hidden, 5) == [0, 1, 2, 3, 4]
+    assert render.page_slides(hidden, 3) == [0, 2, 3]
+    with pytest.raises(RuntimeError):
+        render.page_slides(hidden, 4)
+
+
+def fake_soffice(pptx_path: str, scale: float) -> list[Image.Image]:
+    """One page per visible slide, page n filled with gray level 40 * (n + 1)."""
+    with DeckContext(pptx_path) as deck:
+        pages = render.hidden_slides(deck).count(False)
+    return [Image.new("RGB", (32, 24), (40 * (n + 1),) * 3) for n in range(pages)]
+
+
+@pytest.fixture
+def deck_with_hidden_slide(tmp_path):
+    path = generate_deck(str(tmp_path / "deck.pptx"), slides=4, seed=2)
+    prs = Presentation(path)
+    prs.slides[1]._element.set("show", "0")
+    prs.save(path)
+    return path
+
+
+def test_soffice_pages_land_on_their_slides(monkeypatch, tmp_path, deck_with_hidden_slide):
+    monkeypatch.setattr(render, "render_soffice", fake_soffice)
+    cache = BitmapCache(str(tmp_path / "bitmaps"))
+    paths = render.render_deck(deck_with_hidden_slide, cache, backend="soffice", workers=1)
+    assert sorted(paths) == [0, 2, 3]
+    levels = {idx: Image.open(path).getpixel((0, 0))[0] for idx, path in paths.items()}
+    assert levels == {0: 40, 2: 80, 3: 120}
+
+    with DeckContext(deck_with_hidden_slide) as deck:
+        slides = list(iter_slides_lxml(deck))
+        bitmaps = render.slide_bitmaps(deck, slides, cache=cache, backend="soffice")
+        assert sorted(bitmaps) == [0, 1, 2, 3]
+        assert bitmaps[2][0, 0, 0] == 80
+        # The hidden slide is composited and cached under the pil key only
+        assert cache.get(render.render_key(deck, 1, "soffice", render.DEFAULT_SCALE)) is None
+        assert cache.get(render.render_key(deck, 1, "pil", render.DEFAULT_SCALE)) is not None
+        assert np.array_equal(bitmaps[1], np.asarray(render.composite_slide(deck, slides[1])))
+
+
+def test_missing_soffice_page_raises(monkeypatch, tmp_path, deck_with_hidden_slide):
+    monkeypatch.setattr(render, "render_soffice", lambda path, scale: fake_soffice(path, scale)[:-1])
+    with DeckContext(deck_with_hidden_slide) as deck:
+        slides = list(iter_slides_lxml(deck))
+        with pytest.raises(RuntimeError):
+            render.slide_bitmaps(deck, slides, cache=BitmapCache(str(tmp_path / "bitmaps")), backend="soffice")
@@ -0,0 +1,124 @@
+"""StyleResolver's inheritance chain, on python-pptx decks edited part by part."""
+import pytest
+from lxml import etree
+from pptx import Presentation
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.util import Inches
+from src.context import NS, DeckContext
+from src.parsers.styles import StyleResolver
+
+
+def _child(parent: etree._Element, tag: str) -> etree._Element:
+    prefix, name = tag.split(':')
+    found = parent.find(tag, NS)
+    return found if found is not None else etree.SubElement(parent, '{%s}%s' % (NS[prefix], name))
+
+
+def set_size(shape_or_style: etree._Element, pt: int) -> None:
+    """Level-1 default size of a shape's list style, or of a txStyles/defaultTextStyle entry."""
+    lst_style = shape_or_style.find('p:txBody/a:lstStyle', NS)
+    if lst_style is None:
+        lst_style = shape_or_style
+    _child(_child(lst_style, 'a:lvl1pPr'), 'a:defRPr').set('sz', str(pt * 100))
+
+
+def set_background(part_element: etree._Element, xml: str) -> None:
+    c_sld = part_element.find('p:cSld', NS)
+    for bg in c_sld.findall('p:bg', NS):
+        c_sld.remove(bg)
+    c_sld.insert(0, etree.fromstring(f'<p:bg xmlns:p="{NS["p"]}" xmlns:a="{NS["a"]}">{xml}</p:bg>'))
+
+
+def override_color_map(slide_element: etree._Element, **mapping: str) -> None:
+    override = slide_element.find('p:clrMapOvr', NS)
+    override.clear()
+    etree.SubElement(override, '{%s}overrideClrMapping' % NS['a'], {
+        'bg1': 'lt1', 'tx1': 'dk1', 'bg2': 'lt2', 'tx2': 'dk2', **mapping,
+    })
+
+
+def resolve(tmp_path, edit=None):
+    """(title style, text box style, background) of a one-slide "Title Only" deck after `edit`."""
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "Title"
+    box = slide.shapes.add_textbox(Inches(1), Inches(3), Inches(4), Inches(1))
+    box.text_frame.text = "Body"
+    box.text_frame.paragraphs[0].runs[0].font.color.theme_color = MSO_THEME_COLOR.TEXT_1
+    if edit is not None:
+        edit(prs, slide)
+    path = str(tmp_path / "deck.pptx")
+    prs.save(path)
+
+    with DeckContext(path) as deck:
+        slide_part = deck.slide_parts[0]
+        resolver = StyleResolver(deck)
+        styles = resolver.slide(slide_part)
+        title, text_box = deck.xml(slide_part).findall('p:cSld/p:spTree/p:sp', NS)
+        return styles.text_style(title), styles.text_style(text_box), resolver.background(slide_part)
+
+
+def test_title_size_comes_from_master_tx_styles(tmp_path):
+    title, _, _ = resolve(tmp_path)
+    assert title.font_size == 44.0
+    assert title.font_name == "Calibri"
+
+
+def test_master_placeholder_overrides_tx_styles(tmp_path):
+    def edit(prs, slide):
+        set_size(prs.slide_master.placeholders[0]._element, 40)
+
+    title, _, _ = resolve(tmp_path, edit)
+    assert title.font_size == 40.0
+
+
+def test_layout_placeholder_overrides_master(tmp_path):
+    def edit(prs, slide):
+        set_size(prs.slide_master.placeholders[0]._element, 40)
+        set_size(slide.slide_layout.placeholders[0]._element, 36)
+
+    title, _, _ = resolve(tmp_path, edit)
+    assert title.font_size == 36.0
+
+
+def test_other_shapes_use_default_text_style_not_tx_styles(tmp_path):
+    def edit(prs, slide):
+        set_size(prs._element.find('p:defaultTextStyle', NS), 20)
+        set_size(prs.slide_master._element.find('p:txStyles/p:otherStyle', NS), 10)
+
+    title, text_box, _ = resolve(tmp_path, edit)
+    assert text_box.font_size == 20.0
+    assert title.font_size == 44.0
+
+
+@pytest.mark.parametrize("master_map, slide_map, color", [
+    ({}, None, "#000000"),
+    ({"tx1": "dk2"}, None, "#1f497d"),
+    ({"tx1": "dk2"}, {"tx1": "lt1"}, "#ffffff"),
+])
+def test_scheme_colors_follow_clr_map(tmp_path, master_map, slide_map, color):
+    def edit(prs, slide):
+        prs.slide_master._element.find('p:clrMap', NS).attrib.update(master_map)
+        if slide_map is not None:
+            override_color_map(slide._element, **slide_map)
+
+    title, text_box, _ = resolve(tmp_path, edit)
+    # The title's tx1 comes through txStyles, the text box's from its own run
+    assert title.color == text_box.color == color
+
+
+@pytest.mark.parametrize("edit, background", [
+    # The default master: <p:bgRef idx="1001"><a:schemeClr val="bg1"/>, a phClr solid fill
+    (None, "#ffffff"),
+    (lambda prs, slide: prs.slide_master._element.find('p:clrMap', NS).set('bg1', 'dk2'), "#1f497d"),
+    (lambda prs, slide: override_color_map(slide._element, bg1='dk1'), "#000000"),
+    (lambda prs, slide: set_background(
+        slide.slide_layout._element, '<p:bgPr><a:solidFill><a:srgbClr val="123456"/></a:solidFill><a:effectLst/></p:bgPr>',
+    ), "#123456"),
+    (lambda prs, slide: set_background(slide._element, '<p:bgRef idx="1001"><a:srgbClr val="ABCDEF"/></p:bgRef>'), "#abcdef"),
+    # The theme's second background fill style is a gradient
+    (lambda prs, slide: set_background(slide._element, '<p:bgRef idx="1002"><a:srgbClr val="ABCDEF"/></p:bgRef>'), None),
+])
+def test_backgrounds_resolve_bg_ref_through_the_theme(tmp_path, edit, background):
+    _, _, resolved = resolve(tmp_path, edit)
+    assert resolved == background
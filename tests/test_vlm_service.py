@@ -0,0 +1,108 @@
+"""VLMValidator against a local chat-completions stub."""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from PIL import Image
+from src.cache import ResultCache
+from src.validators.vlm_service import VLMValidator
+
+openai = pytest.importorskip("openai")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers from the server's `replies` queue: (status, content), then YES once it is empty."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.calls.append(time.monotonic())
+        status, content = self.server.replies.pop(0) if self.server.replies else (200, "YES")
+        if status == 200:
+            body = {
+                "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            }
+        else:
+            body = {"error": {"message": "slow down", "type": "rate_limit"}}
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.replies, server.calls = [], []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def validator(server, **kwargs) -> VLMValidator:
+    client = openai.AsyncOpenAI(base_url=f"http://127.0.0.1:{server.server_port}/v1", api_key="stub", max_retries=0)
+    return VLMValidator(client=client, deployment="stub", **kwargs)
+
+
+def image(shade: int) -> Image.Image:
+    return Image.new("RGB", (64, 32), (shade, shade, shade))
+
+
+def test_retries_rate_limited_request_and_caches_verdict(stub, tmp_path):
+    stub.replies = [(429, None)]
+    cache = ResultCache(str(tmp_path))
+
+    async def run():
+        v = validator(stub, cache=cache, requests_per_second=100)
+        first = await v.validate(image(0), "title")
+        again = await v.validate(image(0), "title")
+        await v.aclose()
+        return first, again, v.requests
+
+    assert asyncio.run(run()) == (True, True, 2)
+    assert len(stub.calls) == 2
+
+    async def rerun():
+        # A new validator finds the verdict in the shared cache
+        v = validator(stub, cache=cache)
+        verdict = await v.validate(image(0), "title")
+        await v.aclose()
+        return verdict, v.requests
+
+    assert asyncio.run(rerun()) == (True, 0)
+    assert len(stub.calls) == 2
+
+
+def test_requests_respect_rate_limit(stub):
+    async def run():
+        v = validator(stub, concurrency=8, requests_per_second=10)
+        verdicts = await v.validate_many([(image(shade), "") for shade in range(15)])
+        await v.aclose()
+        return verdicts
+
+    assert asyncio.run(run()) == [True] * 15
+    # A burst of 10, then 10 per second
+    assert stub.calls[-1] - stub.calls[0] >= 0.4
+
+
+def test_empty_content_is_not_legible(stub):
+    stub.replies = [(200, None)]
+
+    async def run():
+        v = validator(stub)
+        verdict = await v.validate(image(0))
+        await v.aclose()
+        return verdict
+
+    assert asyncio.run(run()) is False